@@ -1,21 +1,99 @@
 # app.py
 import os
+import hmac
+import math
+import time
+import hashlib
 from flask import (Flask, render_template, request, redirect,
-                   url_for, session, flash, jsonify)
-from flask_bcrypt import Bcrypt
+                   url_for, session, flash, jsonify, Response, stream_with_context,
+                   make_response)
 from dotenv import load_dotenv
+from markupsafe import Markup
 from functools import wraps
 from datetime import datetime
 
 # Import database utility
-from utils.db import execute_query # Make sure utils/db.py and execute_query exist
+from utils.db import execute_query, transaction, TransactionError, pool_stats # Make sure utils/db.py and execute_query exist
+from utils.db import begin_request, wrote_to_primary, get_replica_router, replica_stats
+from utils import changes, metrics, scheduler, stats
+from utils.cache import LRUCache
+from utils.catalog import get_laundry_items
+from utils.export import generate_export, EXPORT_FORMATS
+from utils.hashing import get_hasher, HasherOverloadedError
+from utils.orders import (ORDER_STATUSES, my_orders_query, order_version_query, parse_order_filters,
+                          admin_orders_query, filters_to_args,
+                          parse_order_ids, update_orders_status)
+from utils.pagination import decode_cursor, paginate_rows
+from utils.search import search_orders
+from utils.api import CUSTOMER_ORDER_FIELDS, ADMIN_ORDER_FIELDS, parse_fields, serialize_orders
+from utils.ratelimit import RateLimiter
 
 load_dotenv()
 
 app = Flask(__name__)
 # Make sure FLASK_SECRET_KEY is set in your .env file!
 app.config['SECRET_KEY'] = os.getenv('FLASK_SECRET_KEY', 'change-this-in-production-very-secret')
-bcrypt = Bcrypt(app)
+# bcrypt runs on a bounded worker pool (see utils/hashing.py, BCRYPT_LOG_ROUNDS / HASH_* in .env)
+hasher = get_hasher()
+
+# Per-request query counts/timings, slow query log and N+1 detection (see utils/metrics.py)
+metrics.init_app(app)
+metrics.register_collector(lambda: {f'lms_db_pool_{k}': v for k, v in pool_stats().items()})
+metrics.register_collector(lambda: {f'lms_bcrypt_{k}': v for k, v in hasher.stats().items()})
+# Optional token so a Prometheus scraper can read /admin/metrics without an admin session
+METRICS_TOKEN = os.getenv('METRICS_TOKEN')
+
+# Rendered my_orders pages per user, reused while the version of the user's orders in
+# CacheVersions is unchanged (bumped by triggers, so also by changes made in other
+# processes). The TTL bounds how long a page is reused before it is rendered again.
+my_orders_cache = LRUCache(max_entries=int(os.getenv('MY_ORDERS_CACHE_SIZE', 10000)),
+                           ttl=float(os.getenv('MY_ORDERS_CACHE_TTL', 15)))
+metrics.register_collector(lambda: {f'lms_my_orders_cache_{k}': v for k, v in my_orders_cache.stats().items()})
+
+# Number of orders per admin dashboard page (can be overridden with ?per_page=, up to the maximum)
+ADMIN_PAGE_SIZE = int(os.getenv('ADMIN_PAGE_SIZE', 50))
+ADMIN_MAX_PAGE_SIZE = int(os.getenv('ADMIN_MAX_PAGE_SIZE', 200))
+# Days of daily revenue shown on the admin dashboard
+ADMIN_STATS_DAYS = int(os.getenv('ADMIN_STATS_DAYS', 7))
+
+# Rendered admin dashboard rows (templates/_order_row.html) keyed by the values they display,
+# so only rows whose order changed since they were last shown are rendered again
+order_row_cache = LRUCache(max_entries=int(os.getenv('ORDER_ROW_CACHE_SIZE', 5000)))
+metrics.register_collector(lambda: {f'lms_order_row_cache_{k}': v for k, v in order_row_cache.stats().items()})
+
+# Token bucket limits on /login and /register POSTs, checked before any database or bcrypt
+# work (see utils/ratelimit.py). Bursts up to the burst size, then the per-minute rate.
+RATE_LIMIT_ENABLED = os.getenv('RATE_LIMIT_ENABLED', '1') == '1'
+auth_ip_limiter = RateLimiter('auth_ip', capacity=int(os.getenv('RATE_LIMIT_IP_BURST', 20)),
+                              per_minute=float(os.getenv('RATE_LIMIT_IP_PER_MINUTE', 10)))
+auth_email_limiter = RateLimiter('auth_email', capacity=int(os.getenv('RATE_LIMIT_EMAIL_BURST', 5)),
+                                 per_minute=float(os.getenv('RATE_LIMIT_EMAIL_PER_MINUTE', 2)))
+for _limiter in (auth_ip_limiter, auth_email_limiter):
+    metrics.register_collector(lambda l=_limiter: {f'lms_rate_limit_{l.name}_{k}': v for k, v in l.stats().items()})
+
+# Read replicas (DB_REPLICA_HOSTS, see utils/db.py): after a user's own write, that session's
+# reads stay on the primary for this many seconds, so replication lag is never visible to them
+READ_YOUR_WRITES_SECONDS = float(os.getenv('DB_READ_YOUR_WRITES_SECONDS', 5))
+
+def _replica_metrics():
+    values = {}
+    for i, replica in enumerate(replica_stats()):
+        values[f'lms_db_replica{i}_healthy'] = int(replica['healthy'])
+        values[f'lms_db_replica{i}_in_use'] = replica['in_use']
+        if replica['lag'] is not None:
+            values[f'lms_db_replica{i}_lag_seconds'] = replica['lag']
+    return values
+metrics.register_collector(_replica_metrics)
+
+@app.before_request
+def _route_database_reads():
+    begin_request(read_from_primary=session.get('db_primary_until', 0) > time.time())
+
+@app.after_request
+def _pin_reads_after_write(response):
+    if wrote_to_primary() and get_replica_router() is not None:
+        session['db_primary_until'] = time.time() + READ_YOUR_WRITES_SECONDS
+    return response
 
 # --- Helper Decorators ---
 def login_required(f):
@@ -41,6 +119,68 @@ def admin_required(f):
         return f(*args, **kwargs)
     return decorated_function
 
+# JSON API routes answer with status codes instead of redirects to the login page
+def api_login_required(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if 'user_id' not in session:
+            return jsonify({'error': 'Authentication required.'}), 401
+        return f(*args, **kwargs)
+    return decorated_function
+
+def api_admin_required(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if 'user_id' not in session:
+            return jsonify({'error': 'Authentication required.'}), 401
+        if session.get('role') != 'admin':
+            return jsonify({'error': 'Admin access required.'}), 403
+        return f(*args, **kwargs)
+    return decorated_function
+
+# --- Helpers ---
+def _rehash_password(user_id, old_hash, password):
+    """Stores a new hash at the configured cost once it has been computed in the background."""
+    def store(new_hash):
+        # Only replace the hash we checked, in case the password changed meanwhile
+        sql = "UPDATE Users SET password_hash = %s WHERE user_id = %s AND password_hash = %s"
+        execute_query(sql, (new_hash, user_id, old_hash), is_commit=True)
+    hasher.rehash_in_background(password, store)
+
+def _auth_retry_after(email):
+    """Counts a login/register attempt; returns 0 if it may proceed, else seconds to wait."""
+    if not RATE_LIMIT_ENABLED:
+        return 0
+    retry_after = auth_ip_limiter.hit(request.remote_addr or 'unknown')
+    if not retry_after and email:
+        retry_after = auth_email_limiter.hit(email.strip().lower())
+    return retry_after
+
+def _too_many_attempts(template, retry_after):
+    """The 429 response for a rate limited login/register attempt."""
+    flash('Too many attempts. Please wait a moment and try again.', 'warning')
+    response = make_response(render_template(template), 429)
+    response.headers['Retry-After'] = str(math.ceil(retry_after))
+    return response
+
+def order_row_key(order):
+    """Cache key of a rendered dashboard row: every value the row template displays."""
+    return (order['order_id'], order['order_status'], order['due_date'], order['total_amount'],
+            order['order_date'], order['user_id'], order['first_name'], order['last_name'], order['email'])
+
+def _render_order_rows(orders):
+    """Returns the dashboard rows as HTML, rendering only those not found in order_row_cache."""
+    template = app.jinja_env.get_template('_order_row.html')
+    rows = []
+    for order in orders:
+        key = order_row_key(order)
+        html = order_row_cache.get(key)
+        if html is None:
+            html = Markup(template.render(order=order))
+            order_row_cache.set(key, html)
+        rows.append(html)
+    return rows
+
 # --- Routes ---
 
 @app.route('/')
@@ -62,6 +202,10 @@ def register():
         address = request.form.get('address')
         role = 'customer' # Default role for self-registration
 
+        retry_after = _auth_retry_after(email)
+        if retry_after:
+            return _too_many_attempts('register.html', retry_after)
+
         # --- Validation ---
         if not all([username, password, confirm_password, first_name, last_name, email, phone, address]):
             flash('All fields are required.', 'danger')
@@ -79,7 +223,10 @@ def register():
 
         # --- Hash Password ---
         try:
-            hashed_password = bcrypt.generate_password_hash(password).decode('utf-8')
+            hashed_password = hasher.hash(password)
+        except HasherOverloadedError:
+            flash('The server is busy right now. Please try again in a moment.', 'warning')
+            return render_template('register.html'), 503
         except Exception as e:
             flash('Error processing registration. Please try again.', 'danger')
             print(f"Password Hashing Error: {e}")
@@ -113,6 +260,11 @@ def login():
         email = request.form.get('email')
         password = request.form.get('password')
 
+        # Before the user lookup and the bcrypt check, so rejected attempts cost almost nothing
+        retry_after = _auth_retry_after(email)
+        if retry_after:
+            return _too_many_attempts('login.html', retry_after)
+
         if not email or not password:
             flash('Email and Password are required.', 'warning')
             return redirect(url_for('login'))
@@ -123,7 +275,17 @@ def login():
         user = execute_query(sql, (email,), fetch_one=True)
 
         # Check if user exists and password hash matches
-        if user and bcrypt.check_password_hash(user['password_hash'], password):
+        try:
+            password_ok = bool(user) and hasher.check(user['password_hash'], password)
+        except HasherOverloadedError:
+            flash('The server is busy right now. Please try again in a moment.', 'warning')
+            return render_template('login.html'), 503
+
+        if password_ok:
+            # Upgrade hashes created with a different cost factor, off the request path
+            if hasher.needs_rehash(user['password_hash']):
+                _rehash_password(user['user_id'], user['password_hash'], password)
+
             # Store user info in session
             session.clear() # Clear old session data first
             session['logged_in'] = True
@@ -162,10 +324,10 @@ def logout():
 @login_required # Ensure user is logged in
 def place_order():
     """Handles placing a new laundry order."""
-    # Fetch laundry items for the form dropdown/list
-    items_sql = "SELECT laundry_item_id, name, base_price FROM LaundryItems ORDER BY name"
-    laundry_items = execute_query(items_sql)
-    if laundry_items is None: # Check if query failed
+    # Laundry items for the form come from the in-process catalog cache. The same
+    # snapshot is used below to price the order, so totals match what was shown.
+    laundry_items = get_laundry_items()
+    if laundry_items is None: # Check if loading failed
         flash('Could not load laundry items. Please try again later.', 'danger')
         laundry_items = [] # Provide empty list to template
 
@@ -204,44 +366,42 @@ def place_order():
             return render_template('place_order.html', laundry_items=laundry_items)
 
         # --- Create Order and OrderItems in Database ---
-        # 1. Create Order record
+        # Both are written in one transaction: either the order and all of its
+        # items are stored, or nothing is (no orphan orders on partial failure).
         order_sql = """
             INSERT INTO Orders (user_id, total_amount, order_status, special_instructions)
             VALUES (%s, %s, %s, %s)
         """
         order_params = (user_id, total_order_amount, 'Pending', special_instructions)
-        new_order_id = execute_query(order_sql, order_params, is_commit=True)
-
-        if not new_order_id:
-             flash('Failed to create order record. Please try again.', 'danger')
-             return render_template('place_order.html', laundry_items=laundry_items)
-
-        # 2. Create OrderItems records
         item_insert_sql = """
             INSERT INTO OrderItems (order_id, laundry_item_id, quantity, price_per_unit, total_price)
             VALUES (%s, %s, %s, %s, %s)
         """
-        all_items_inserted = True
-        for item_data in order_items_data:
-            item_params = (
-                new_order_id,
-                item_data['laundry_item_id'],
-                item_data['quantity'],
-                item_data['price_per_unit'],
-                item_data['total_price']
-            )
-            item_result = execute_query(item_insert_sql, item_params, is_commit=True)
-            if not item_result:
-                 all_items_inserted = False
-                 # Log error: Failed to insert item_data['laundry_item_id'] for order new_order_id
-                 # More advanced: Could attempt to delete the parent Order record here (rollback logic)
-
-        if all_items_inserted:
-            flash(f'Order #{new_order_id} placed successfully!', 'success')
-            return redirect(url_for('my_orders')) # Redirect to order history
-        else:
-             flash('Order placed, but failed to add some items. Please contact support regarding order #{new_order_id}.', 'warning')
-             return redirect(url_for('my_orders')) # Redirect anyway
+        try:
+            with transaction() as tx:
+                # 1. Create Order record
+                new_order_id = tx.execute(order_sql, order_params)
+                # 2. Create all OrderItems records with one multi-row INSERT
+                tx.executemany(item_insert_sql, [
+                    (
+                        new_order_id,
+                        item_data['laundry_item_id'],
+                        item_data['quantity'],
+                        item_data['price_per_unit'],
+                        item_data['total_price']
+                    )
+                    for item_data in order_items_data
+                ])
+                # 3. Update the dashboard summary tables in the same transaction
+                stats.record_order_created(tx, new_order_id)
+                # 4. Log the change for the live admin dashboard (utils/changes.py)
+                changes.record_changes(tx, [new_order_id], 'created')
+        except TransactionError:
+            flash('Failed to place order. Please try again.', 'danger')
+            return render_template('place_order.html', laundry_items=laundry_items)
+
+        flash(f'Order #{new_order_id} placed successfully!', 'success')
+        return redirect(url_for('my_orders')) # Redirect to order history
 
     # --- Handle GET Request ---
     # Pass laundry items to the template
@@ -251,41 +411,148 @@ def place_order():
 @app.route('/my_orders')
 @login_required # Ensure user is logged in
 def my_orders():
-    """Displays the logged-in user's order history."""
+    """
+    Displays the logged-in user's order history.
+
+    The rendered page is cached per user and served with an ETag. While the user's
+    orders are unchanged, refreshes are answered from the cache (or with 304 Not
+    Modified if the browser already has the page) after a single primary key lookup
+    of the orders' version.
+    """
     user_id = session['user_id']
+    # Pages with pending flash messages are one-off renderings and are never cached
+    cacheable = not session.get('_flashes')
+    # Read before the orders, from the same server (utils/db.py pins a request's reads): a
+    # change in between leaves the cached page newer than its version, never older
+    row = execute_query(*order_version_query(user_id), fetch_one=True) if cacheable else None
+    version = row['version'] if row else 0
+
+    # Archived orders are only read on request (?include_archived=1), cached as a separate page
+    include_archived = request.args.get('include_archived') == '1'
+    cache_key = (user_id, include_archived)
+    cached = my_orders_cache.get(cache_key) if cacheable else None
+    if cached and cached[0] == version:
+        _, etag, body = cached
+        return _conditional_page(body, etag)
+
     # Fetch orders for the current user
-    sql = """
-        SELECT o.order_id, o.order_date, o.total_amount, o.order_status, o.due_date
-        FROM Orders o
-        WHERE o.user_id = %s
-        ORDER BY o.order_date DESC
-    """
-    orders = execute_query(sql, (user_id,))
+    orders = execute_query(*my_orders_query(user_id, include_archived))
     if orders is None:
         flash('Could not retrieve order history.', 'danger')
         orders = []
+        cacheable = False
+
+    body = render_template('my_orders.html', orders=orders, include_archived=include_archived)
+    if not cacheable:
+        return body
+    # A content hash: identical pages get identical ETags, even from another worker process
+    etag = hashlib.sha1(body.encode('utf-8')).hexdigest()
+    my_orders_cache.set(cache_key, (version, etag, body))
+    return _conditional_page(body, etag)
 
-    return render_template('my_orders.html', orders=orders)
+
+def _conditional_page(body, etag):
+    """Returns 304 if the client's If-None-Match already has this ETag, else the page."""
+    if etag in request.if_none_match:
+        response = make_response('', 304)
+    else:
+        response = make_response(body)
+    response.set_etag(etag)
+    # Browsers must revalidate every time, but may reuse their copy on 304
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
 
 
 @app.route('/admin')
 @admin_required # Ensure only admins access this
 def admin_dashboard():
-    """Displays all orders for the admin."""
-    # Fetch all orders with user details
-    sql = """
-        SELECT o.order_id, o.order_date, o.total_amount, o.order_status, o.due_date,
-               u.user_id, u.first_name, u.last_name, u.email
-        FROM Orders o
-        JOIN Users u ON o.user_id = u.user_id
-        ORDER BY o.order_date DESC
-    """
-    all_orders = execute_query(sql)
-    if all_orders is None:
+    """Displays one page of orders for the admin, newest first, with optional filters."""
+    filters, filter_errors = parse_order_filters(request.args)
+    for error in filter_errors:
+        flash(error, 'warning')
+
+    page_size = request.args.get('per_page', ADMIN_PAGE_SIZE, type=int)
+    page_size = min(max(page_size, 1), ADMIN_MAX_PAGE_SIZE)
+
+    # Filters and the keyset cursor are pushed down into SQL (see utils/orders.py)
+    after = request.args.get('after')
+    cursor_values = decode_cursor(after)
+    if after and cursor_values is None:
+        flash('Invalid page cursor, showing the first page.', 'warning')
+        after = None
+    sql, params = admin_orders_query(filters, cursor_values, page_size)
+    # Read before the orders: the live updates start from here, so nothing is missed in between
+    last_change_id = changes.latest_change_id()
+    page_orders = execute_query(sql, params)
+    if page_orders is None:
         flash('Error fetching orders from the database.', 'danger')
-        all_orders = [] # Pass empty list to template on error
+        page_orders = [] # Pass empty list to template on error
+
+    page_orders, next_cursor = paginate_rows(page_orders, page_size)
+
+    # Precomputed summary rows (utils/stats.py), cheap regardless of the number of orders
+    dashboard_stats = stats.get_dashboard_stats(days=ADMIN_STATS_DAYS)
 
-    return render_template('admin_dashboard.html', orders=all_orders)
+    return render_template('admin_dashboard.html', orders=page_orders, order_rows=_render_order_rows(page_orders),
+                           stats=dashboard_stats, filters=filters_to_args(filters), statuses=ORDER_STATUSES,
+                           per_page=page_size, next_cursor=next_cursor, is_first_page=not after,
+                           last_change_id=last_change_id)
+
+
+@app.route('/admin/changes/stream')
+@admin_required # Ensure only admins access this
+def order_changes_stream():
+    """
+    Streams order changes after the client's Last-Event-ID (or ?after=) as server-sent events.
+
+    Each poll is one primary key range read of OrderChanges; while nothing changes the
+    stream only sends keep-alive comments. The stream ends after CHANGES_STREAM_SECONDS
+    and the browser reconnects from its last event ID.
+    """
+    last_id = changes.parse_last_event_id(request.headers.get('Last-Event-ID') or request.args.get('after'))
+    if last_id is None:
+        last_id = changes.latest_change_id()
+    return Response(
+        stream_with_context(_order_change_events(changes.ChangeCursor(last_id))),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+
+def _order_change_events(cursor):
+    metrics.untrack_request() # Minutes of identical polls are neither one slow request nor N+1
+    yield changes.STREAM_PREAMBLE
+    started = last_sent = time.monotonic()
+    while time.monotonic() - started < changes.CHANGES_STREAM_SECONDS:
+        rows = execute_query(*cursor.query())
+        if rows: # None (query failed) is retried on the next poll
+            orders = cursor.advance(rows)
+            existing = [order for order in orders if order['order_status'] is not None]
+            rendered = dict(zip([order['order_id'] for order in existing], _render_order_rows(existing)))
+            yield changes.format_events(orders, rendered, cursor.last_id)
+            last_sent = time.monotonic()
+        elif time.monotonic() - last_sent >= changes.CHANGES_HEARTBEAT_SECONDS:
+            # Also how a closed connection is noticed: the write fails and the generator is closed
+            yield changes.HEARTBEAT
+            last_sent = time.monotonic()
+        time.sleep(changes.CHANGES_POLL_SECONDS)
+
+
+@app.route('/admin/search')
+@admin_required # Ensure only admins access this
+def admin_search():
+    """
+    Searches orders by order ID, customer name, email, phone or special instructions.
+
+    Results are ranked (see utils/search.py) and paginated with ?page=.
+    """
+    query = request.args.get('q', '').strip()
+    page = max(request.args.get('page', 1, type=int), 1)
+    results = search_orders(query, page)
+    if results is None:
+        flash('Search failed. Please try again.', 'danger')
+        results = {'orders': [], 'total': 0, 'truncated': False, 'page': page, 'pages': 0}
+    return render_template('admin_search.html', query=query, results=results, statuses=ORDER_STATUSES,
+                           order_rows=_render_order_rows(results['orders']))
 
 
 @app.route('/admin/update_status/<int:order_id>', methods=['POST'])
@@ -295,53 +562,223 @@ def update_order_status(order_id):
     new_status = request.form.get('order_status')
     due_date_str = request.form.get('due_date')
 
-    valid_statuses = ['Pending', 'Received', 'Processing', 'Ready', 'Completed', 'Cancelled']
-
     # Validate Status
-    if not new_status or new_status not in valid_statuses:
+    if not new_status or new_status not in ORDER_STATUSES:
          flash('Invalid status selected.', 'warning')
          return redirect(url_for('admin_dashboard'))
 
-    # Prepare parameters and fields for update
-    update_params_list = []
-    update_fields = []
-
-    update_fields.append("order_status = %s")
-    update_params_list.append(new_status)
-
     # Process due_date only if a non-empty string is provided
     due_date_obj = None
     if due_date_str:
         try:
             due_date_obj = datetime.strptime(due_date_str, '%Y-%m-%d').date()
-            update_fields.append("due_date = %s")
-            update_params_list.append(due_date_obj)
         except ValueError:
             flash(f'Invalid date format "{due_date_str}". Use YYYY-MM-DD.', 'warning')
             # Continue without updating date if format is wrong
 
-    # Add order_id to params for WHERE clause (must be last)
-    update_params_list.append(order_id)
+    # Same code path as the bulk update: one locked read + one UPDATE in a transaction
+    try:
+        result = update_orders_status([order_id], new_status, due_date_obj)
+    except TransactionError:
+        flash(f'Failed to update Order #{order_id}. Database error.', 'danger')
+        return redirect(url_for('admin_dashboard'))
+
+    if result['updated']:
+        flash(f'Order #{order_id} details updated successfully.', 'success')
+    elif result['unchanged']:
+        flash(f'Order #{order_id} found, but no changes made (status/date may be the same).', 'info')
+    else:
+        flash(f'Order #{order_id} not found.', 'warning')
 
-    # Construct and execute the SQL query
-    sql = f"UPDATE Orders SET {', '.join(update_fields)} WHERE order_id = %s"
-    result = execute_query(sql, tuple(update_params_list), is_commit=True)
+    return redirect(url_for('admin_dashboard'))
 
-    if result is not None: # Check for DB execution success
-        if result > 0: # Check if rows were actually affected
-            flash(f'Order #{order_id} details updated successfully.', 'success')
-        else:
-            check_order_sql = "SELECT order_id FROM Orders WHERE order_id = %s"
-            order_exists = execute_query(check_order_sql, (order_id,), fetch_one=True)
-            if order_exists:
-                flash(f'Order #{order_id} found, but no changes made (status/date may be the same).', 'info')
-            else:
-                flash(f'Order #{order_id} not found.', 'warning')
+
+@app.route('/admin/orders/bulk_status', methods=['POST'])
+@admin_required # Ensure only admins access this
+def bulk_update_order_status():
+    """
+    Updates the status (and optionally the due date) of many orders at once.
+
+    Accepts form data (order_ids may be repeated or comma separated) or a JSON body
+    {"order_ids": [...], "order_status": "...", "due_date": "YYYY-MM-DD"}.
+    JSON requests get per-order results back as JSON; form posts get a summary
+    message and are redirected to the dashboard.
+    """
+    data = request.get_json(silent=True) if request.is_json else None
+    wants_json = data is not None or request.accept_mimetypes.best == 'application/json'
+    if data is None:
+        data = request.form
+        raw_ids = request.form.getlist('order_ids')
     else:
-        flash(f'Failed to update Order #{order_id}. Database error.', 'danger')
+        raw_ids = data.get('order_ids') or []
+        if not isinstance(raw_ids, list):
+            raw_ids = [raw_ids]
+
+    def reject(message):
+        if wants_json:
+            return jsonify({'error': message}), 400
+        flash(message, 'warning')
+        return redirect(url_for('admin_dashboard'))
+
+    order_ids, invalid_ids = parse_order_ids(raw_ids)
+    if invalid_ids:
+        return reject(f'Invalid order IDs: {", ".join(invalid_ids[:10])}.')
+    if not order_ids:
+        return reject('Select at least one order.')
+
+    new_status = data.get('order_status')
+    if not new_status or new_status not in ORDER_STATUSES:
+        return reject('Invalid status selected.')
 
+    due_date_obj = None
+    due_date_str = data.get('due_date')
+    if due_date_str:
+        try:
+            due_date_obj = datetime.strptime(due_date_str, '%Y-%m-%d').date()
+        except ValueError:
+            return reject(f'Invalid date format "{due_date_str}". Use YYYY-MM-DD.')
+
+    try:
+        result = update_orders_status(order_ids, new_status, due_date_obj)
+    except ValueError as e:
+        return reject(str(e))
+    except TransactionError:
+        if wants_json:
+            return jsonify({'error': 'Database error, no orders were changed.'}), 500
+        flash('Failed to update orders. Database error, no orders were changed.', 'danger')
+        return redirect(url_for('admin_dashboard'))
+
+    if wants_json:
+        return jsonify({
+            'order_status': new_status,
+            'due_date': due_date_obj.isoformat() if due_date_obj else None,
+            'results': {str(order_id): outcome
+                        for outcome, ids in result.items() for order_id in ids},
+            'counts': {outcome: len(ids) for outcome, ids in result.items()},
+        })
+
+    flash(f"{len(result['updated'])} order(s) set to {new_status}, "
+          f"{len(result['unchanged'])} unchanged, {len(result['missing'])} not found.",
+          'success' if result['updated'] else 'info')
+    return redirect(url_for('admin_dashboard'))
+
+@app.route('/admin/auto_schedule', methods=['POST'])
+@admin_required # Ensure only admins access this
+def auto_schedule():
+    """
+    Gives every open order without a due date (every open order if the form sends
+    reschedule=1) the earliest due date the daily capacity per category allows (utils/scheduler.py).
+    """
+    reschedule = request.form.get('reschedule') == '1'
+    orders = scheduler.load_open_orders()
+    if orders is None:
+        flash('Could not load open orders. Please try again.', 'danger')
+        return redirect(url_for('admin_dashboard'))
+    try:
+        due_dates, _ = scheduler.plan_schedule(orders.values(), reschedule=reschedule)
+    except ValueError as e: # Malformed SCHEDULE_CAPACITY
+        flash(str(e), 'danger')
+        return redirect(url_for('admin_dashboard'))
+
+    try:
+        updated = scheduler.apply_schedule(orders, due_dates)
+    except TransactionError:
+        flash('Scheduling failed part way. Database error; run it again to finish.', 'danger')
+        return redirect(url_for('admin_dashboard'))
+
+    if due_dates:
+        flash(f'Scheduled {len(due_dates)} open order(s): {updated} due date(s) changed, '
+              f'latest due date {max(due_dates.values()):%Y-%m-%d}.', 'success')
+    else:
+        flash('No open orders to schedule.', 'info')
     return redirect(url_for('admin_dashboard'))
 
+@app.route('/admin/export')
+@admin_required # Ensure only admins access this
+def export_orders():
+    """
+    Streams all orders matching the filters (status, date_from, date_to, customer)
+    with their line items as CSV (?format=csv, default) or NDJSON (?format=ndjson).
+    """
+    export_format = request.args.get('format', 'csv')
+    if export_format not in EXPORT_FORMATS:
+        flash(f'Unsupported export format "{export_format}".', 'warning')
+        return redirect(url_for('admin_dashboard'))
+
+    filters, filter_errors = parse_order_filters(request.args)
+    if filter_errors:
+        for error in filter_errors:
+            flash(error, 'warning')
+        return redirect(url_for('admin_dashboard', **filters_to_args(filters)))
+
+    filename = f"orders-{datetime.now().strftime('%Y%m%d-%H%M%S')}.{export_format}"
+    return Response(
+        stream_with_context(generate_export(filters, export_format)),
+        mimetype=EXPORT_FORMATS[export_format],
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'},
+    )
+
+@app.route('/admin/metrics')
+def metrics_endpoint():
+    """Exposes query/route metrics of this process in the Prometheus text format (admins only)."""
+    auth = request.headers.get('Authorization', '')
+    token_ok = bool(METRICS_TOKEN) and hmac.compare_digest(auth, f'Bearer {METRICS_TOKEN}')
+    if not token_ok and session.get('role') != 'admin':
+        return 'Forbidden\n', 403, {'Content-Type': 'text/plain; charset=utf-8'}
+    return metrics.render_prometheus(), 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
+
+# --- JSON API ---
+def _orders_api_response(filters, allowed_fields):
+    """
+    One page of orders as JSON: {"orders": [...], "next_cursor": "..." or null}.
+
+    Query parameters: limit (page size), after (cursor from the previous page) and
+    fields (comma separated subset of `allowed_fields`; line items are only loaded
+    when "items" is requested).
+    """
+    fields, error = parse_fields(request.args.get('fields'), allowed_fields)
+    if error:
+        return jsonify({'error': error}), 400
+
+    page_size = request.args.get('limit', ADMIN_PAGE_SIZE, type=int)
+    page_size = min(max(page_size, 1), ADMIN_MAX_PAGE_SIZE)
+    after = request.args.get('after')
+    cursor_values = decode_cursor(after)
+    if after and cursor_values is None:
+        return jsonify({'error': 'Invalid cursor.'}), 400
+
+    sql, params = admin_orders_query(filters, cursor_values, page_size)
+    rows = execute_query(sql, params)
+    if rows is None:
+        return jsonify({'error': 'Could not retrieve orders.'}), 500
+    rows, next_cursor = paginate_rows(rows, page_size)
+
+    orders = serialize_orders(rows, fields)
+    if orders is None:
+        return jsonify({'error': 'Could not retrieve order items.'}), 500
+    return jsonify({'orders': orders, 'next_cursor': next_cursor})
+
+
+@app.route('/api/orders')
+@api_login_required
+def api_orders():
+    """The logged-in customer's orders with their line items, newest first (filters: status, date_from, date_to)."""
+    filters, filter_errors = parse_order_filters(request.args)
+    if filter_errors:
+        return jsonify({'error': ' '.join(filter_errors)}), 400
+    filters['customer'] = str(session['user_id']) # Always limited to the caller's own orders
+    return _orders_api_response(filters, CUSTOMER_ORDER_FIELDS)
+
+
+@app.route('/api/admin/orders')
+@api_admin_required
+def api_admin_orders():
+    """All orders with customer details and line items, filtered like the admin dashboard."""
+    filters, filter_errors = parse_order_filters(request.args)
+    if filter_errors:
+        return jsonify({'error': ' '.join(filter_errors)}), 400
+    return _orders_api_response(filters, ADMIN_ORDER_FIELDS)
+
 # --- Main Execution ---
 if __name__ == '__main__':
     debug_mode = os.getenv('FLASK_DEBUG', '0') == '1'
@@ -0,0 +1,52 @@
+import sys
+import time
+import argparse
+from dotenv import load_dotenv
+
+from utils.db import TransactionError
+from utils import archive
+
+load_dotenv() # Load .env variables
+
+# Moves Completed/Cancelled orders older than ARCHIVE_AFTER_DAYS into the archive tables
+# (see utils/archive.py). Safe to interrupt and re-run; run it e.g. nightly from cron:
+#   python archive_orders.py --days 180 --batch-size 1000 --pause 0.5
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive old finished orders in throttled batches.")
+    parser.add_argument('--days', type=int, default=archive.ARCHIVE_AFTER_DAYS,
+                        help=f"Archive orders placed more than this many days ago (default: {archive.ARCHIVE_AFTER_DAYS}).")
+    parser.add_argument('--batch-size', type=int, default=1000, help="Orders moved per transaction.")
+    parser.add_argument('--pause', type=float, default=0.5, help="Seconds to wait between batches.")
+    parser.add_argument('--max-batches', type=int, help="Stop after this many batches.")
+    parser.add_argument('--dry-run', action='store_true', help="Only count the orders that would be archived.")
+    args = parser.parse_args()
+
+    cutoff = archive.archive_cutoff(args.days)
+    eligible = archive.count_archivable(cutoff)
+    if eligible is None:
+        print("Failed to query the database. Please check your .env settings and DB status.")
+        return 2
+    print(f"{eligible:,} {'/'.join(archive.ARCHIVE_STATUSES)} orders placed before {cutoff:%Y-%m-%d %H:%M} to archive.")
+    if args.dry_run or not eligible:
+        return 0
+
+    started = time.perf_counter()
+    total = 0
+    try:
+        for status, moved in archive.archive_orders(cutoff, args.batch_size, args.pause, args.max_batches):
+            total += moved
+            if moved:
+                print(f"  {status}: {moved} archived ({total:,}/{eligible:,}, "
+                      f"{total / (time.perf_counter() - started):,.0f} orders/s)")
+    except TransactionError as e:
+        print(f"Batch failed, nothing from it was moved: {e}")
+        print(f"{total:,} orders archived before the error; re-run to continue.")
+        return 1
+    print(f"Archived {total:,} orders in {time.perf_counter() - started:.1f}s.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,236 @@
+# asgi.py
+import asyncio
+import hashlib
+import time
+from functools import wraps
+from markupsafe import Markup
+
+try:
+    from quart import (Quart, render_template, request, redirect, url_for, session, flash, make_response,
+                       stream_with_context)
+    from asgiref.wsgi import WsgiToAsgi
+    from utils.async_db import async_execute_query, close_async_pool, async_pool_stats
+except ImportError as e:
+    raise ImportError(f"The async serving mode needs extra packages ({e.name} is missing): "
+                      "pip install -r requirements-asgi.txt") from e
+
+# The Flask app keeps serving every route that is not overridden below
+from app import (app as flask_app, my_orders_cache, order_row_cache, order_row_key,
+                 ADMIN_PAGE_SIZE, ADMIN_MAX_PAGE_SIZE, ADMIN_STATS_DAYS)
+from utils import changes, metrics, stats
+from utils.catalog import get_laundry_items_async
+from utils.orders import (ORDER_STATUSES, my_orders_query, order_version_query, parse_order_filters,
+                          admin_orders_query, filters_to_args)
+from utils.pagination import decode_cursor, paginate_rows
+
+# Optional async serving mode:  uvicorn asgi:application --workers 2
+#
+# The read-heavy pages (my_orders, admin dashboard, the place_order form) run as
+# coroutines on utils/async_db.py, so a process keeps serving other requests while
+# their queries wait on MySQL. All other requests (POSTs, login, exports, metrics)
+# are passed to the unchanged Flask app in a thread pool. Both apps use the same
+# templates, secret key and session cookie, so users move between them seamlessly.
+
+async_app = Quart(__name__, template_folder=flask_app.template_folder, static_folder=None)
+async_app.config['SECRET_KEY'] = flask_app.config['SECRET_KEY']
+# Same per-request query accounting, slow query log and N+1 detection as the Flask app
+metrics.init_async_app(async_app)
+metrics.register_collector(lambda: {f'lms_async_db_pool_{k}': v for k, v in async_pool_stats().items()})
+
+# (path, method) pairs answered by async_app; HEAD is served like GET
+ASYNC_ROUTES = {('/my_orders', 'GET'), ('/admin', 'GET'), ('/place_order', 'GET'),
+                ('/admin/changes/stream', 'GET')}
+
+
+# --- Helper Decorators (async versions of the ones in app.py) ---
+def login_required(f):
+    @wraps(f)
+    async def decorated_function(*args, **kwargs):
+        if 'user_id' not in session:
+            await flash('Please log in to access this page.', 'warning')
+            return redirect(url_for('login'))
+        return await f(*args, **kwargs)
+    return decorated_function
+
+def admin_required(f):
+    @wraps(f)
+    async def decorated_function(*args, **kwargs):
+        if 'user_id' not in session:
+            await flash('Please log in to access this page.', 'warning')
+            return redirect(url_for('login'))
+        if session.get('role') != 'admin':
+            await flash('You do not have permission to access this page.', 'danger')
+            return redirect(url_for('index'))
+        return await f(*args, **kwargs)
+    return decorated_function
+
+
+# --- Routes ---
+@async_app.route('/place_order', methods=['GET'])
+@login_required
+async def place_order():
+    """Renders the order form (submissions are handled by the Flask app)."""
+    laundry_items = await get_laundry_items_async()
+    if laundry_items is None:
+        await flash('Could not load laundry items. Please try again later.', 'danger')
+        laundry_items = []
+    return await render_template('place_order.html', laundry_items=laundry_items)
+
+
+@async_app.route('/my_orders', methods=['GET'])
+@login_required
+async def my_orders():
+    """Displays the logged-in user's order history (same page cache and ETags as app.my_orders)."""
+    user_id = session['user_id']
+    cacheable = not session.get('_flashes')
+    row = await async_execute_query(*order_version_query(user_id), fetch_one=True) if cacheable else None
+    version = row['version'] if row else 0
+
+    include_archived = request.args.get('include_archived') == '1'
+    cache_key = (user_id, include_archived)
+    cached = my_orders_cache.get(cache_key) if cacheable else None
+    if cached and cached[0] == version:
+        _, etag, body = cached
+        return await _conditional_page(body, etag)
+
+    orders = await async_execute_query(*my_orders_query(user_id, include_archived))
+    if orders is None:
+        await flash('Could not retrieve order history.', 'danger')
+        orders = []
+        cacheable = False
+
+    body = await render_template('my_orders.html', orders=orders, include_archived=include_archived)
+    if not cacheable:
+        return body
+    etag = hashlib.sha1(body.encode('utf-8')).hexdigest()
+    my_orders_cache.set(cache_key, (version, etag, body))
+    return await _conditional_page(body, etag)
+
+
+async def _conditional_page(body, etag):
+    """Returns 304 if the client's If-None-Match already has this ETag, else the page."""
+    if etag in request.if_none_match:
+        response = await make_response('', 304)
+    else:
+        response = await make_response(body)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+@async_app.route('/admin', methods=['GET'])
+@admin_required
+async def admin_dashboard():
+    """Displays one page of orders for the admin; the page and the statistics are read concurrently."""
+    filters, filter_errors = parse_order_filters(request.args)
+    for error in filter_errors:
+        await flash(error, 'warning')
+
+    page_size = request.args.get('per_page', ADMIN_PAGE_SIZE, type=int)
+    page_size = min(max(page_size, 1), ADMIN_MAX_PAGE_SIZE)
+
+    after = request.args.get('after')
+    cursor_values = decode_cursor(after)
+    if after and cursor_values is None:
+        await flash('Invalid page cursor, showing the first page.', 'warning')
+        after = None
+    sql, params = admin_orders_query(filters, cursor_values, page_size)
+    # Read before the orders, so live updates start no later than the page's data
+    latest = await async_execute_query(changes.LATEST_CHANGE_SQL, fetch_one=True)
+
+    # Four independent reads on separate pooled connections, waited for together
+    page_orders, daily, by_status, turnaround = await asyncio.gather(
+        async_execute_query(sql, params),
+        async_execute_query(stats.DASHBOARD_DAILY_SQL, (ADMIN_STATS_DAYS,)),
+        async_execute_query(stats.DASHBOARD_STATUS_SQL),
+        async_execute_query(stats.DASHBOARD_TURNAROUND_SQL, fetch_one=True),
+    )
+    if page_orders is None:
+        await flash('Error fetching orders from the database.', 'danger')
+        page_orders = []
+
+    page_orders, next_cursor = paginate_rows(page_orders, page_size)
+    dashboard_stats = stats.summarize_dashboard(daily, by_status, turnaround)
+
+    order_rows = await _render_order_rows(page_orders)
+    return await render_template('admin_dashboard.html', orders=page_orders, order_rows=order_rows,
+                                 stats=dashboard_stats, filters=filters_to_args(filters), statuses=ORDER_STATUSES,
+                                 per_page=page_size, next_cursor=next_cursor, is_first_page=not after,
+                                 last_change_id=latest['change_id'] if latest else 0)
+
+
+@async_app.route('/admin/changes/stream', methods=['GET'])
+@admin_required
+async def order_changes_stream():
+    """Async version of app.order_changes_stream: an open stream is a sleeping coroutine, not a thread."""
+    last_id = changes.parse_last_event_id(request.headers.get('Last-Event-ID') or request.args.get('after'))
+    if last_id is None:
+        latest = await async_execute_query(changes.LATEST_CHANGE_SQL, fetch_one=True)
+        last_id = latest['change_id'] if latest else 0
+    cursor = changes.ChangeCursor(last_id)
+    metrics.untrack_request() # Minutes of identical polls are neither one slow request nor N+1
+
+    @stream_with_context
+    async def events():
+        yield changes.STREAM_PREAMBLE
+        started = last_sent = time.monotonic()
+        while time.monotonic() - started < changes.CHANGES_STREAM_SECONDS:
+            rows = await async_execute_query(*cursor.query())
+            if rows:
+                orders = cursor.advance(rows)
+                existing = [order for order in orders if order['order_status'] is not None]
+                rendered = dict(zip([order['order_id'] for order in existing], await _render_order_rows(existing)))
+                yield changes.format_events(orders, rendered, cursor.last_id)
+                last_sent = time.monotonic()
+            elif time.monotonic() - last_sent >= changes.CHANGES_HEARTBEAT_SECONDS:
+                yield changes.HEARTBEAT
+                last_sent = time.monotonic()
+            await asyncio.sleep(changes.CHANGES_POLL_SECONDS)
+
+    response = await make_response(events(), {'Content-Type': 'text/event-stream', 'Cache-Control': 'no-cache',
+                                              'X-Accel-Buffering': 'no'})
+    response.timeout = None # Ends on its own after CHANGES_STREAM_SECONDS
+    return response
+
+
+async def _render_order_rows(orders):
+    """Async version of app._render_order_rows, sharing the same row cache."""
+    template = async_app.jinja_env.get_template('_order_row.html')
+    rows = []
+    for order in orders:
+        key = order_row_key(order)
+        html = order_row_cache.get(key)
+        if html is None:
+            html = Markup(await template.render_async(order=order))
+            order_row_cache.set(key, html)
+        rows.append(html)
+    return rows
+
+
+# Every other Flask endpoint is registered too (without being served here) so that
+# url_for() in the shared templates can build links to it.
+async def _served_by_flask(**kwargs):
+    return 'Not Found', 404
+
+for rule in flask_app.url_map.iter_rules():
+    if rule.endpoint not in async_app.view_functions:
+        async_app.add_url_rule(rule.rule, endpoint=rule.endpoint, view_func=_served_by_flask,
+                               methods=sorted(rule.methods - {'HEAD', 'OPTIONS'}))
+
+
+@async_app.after_serving
+async def _close_pool():
+    await close_async_pool()
+
+
+# --- ASGI entry point ---
+_wsgi_application = WsgiToAsgi(flask_app)
+
+async def application(scope, receive, send):
+    """Routes the async pages to async_app and everything else to the Flask app."""
+    if scope['type'] == 'http':
+        method = 'GET' if scope['method'] == 'HEAD' else scope['method']
+        if (scope['path'], method) not in ASYNC_ROUTES:
+            return await _wsgi_application(scope, receive, send)
+    # Lifespan events (pool shutdown) and the async pages
+    return await async_app(scope, receive, send)
@@ -0,0 +1,70 @@
+# benchmarks/compare.py
+
+import sys
+import json
+import argparse
+
+# Compares a benchmark result file against a stored baseline and exits with
+# status 1 if any route got slower (or issues more queries) than allowed.
+# Usage: python -m benchmarks.compare benchmarks/baseline.json benchmarks/results.json
+
+# Metrics where a higher value is worse, and throughput where a lower value is worse
+LOWER_IS_BETTER = ['p50_ms', 'p95_ms', 'p99_ms', 'queries_per_request']
+HIGHER_IS_BETTER = ['throughput_rps']
+
+
+def change_pct(old, new):
+    if not old:
+        return 0.0 if not new else float('inf')
+    return (new - old) / old * 100.0
+
+
+def compare(baseline, current, tolerance_pct):
+    """
+    Returns (lines, regressions): a printable table and the list of regressed (route, metric) pairs.
+    """
+    lines = [f"{'route':24} {'metric':20} {'baseline':>12} {'current':>12} {'change':>9}"]
+    regressions = []
+    for route in sorted(set(baseline['routes']) | set(current['routes'])):
+        old = baseline['routes'].get(route)
+        new = current['routes'].get(route)
+        if old is None or new is None:
+            lines.append(f"{route:24} {'(only in ' + ('current' if old is None else 'baseline') + ')':20}")
+            continue
+        for metric in LOWER_IS_BETTER + HIGHER_IS_BETTER:
+            if old.get(metric) is None or new.get(metric) is None:
+                continue
+            pct = change_pct(old[metric], new[metric])
+            worse = pct > tolerance_pct if metric in LOWER_IS_BETTER else pct < -tolerance_pct
+            # Query counts are exact, any increase is a regression
+            if metric == 'queries_per_request':
+                worse = new[metric] > old[metric]
+            flag = '  <-- regression' if worse else ''
+            lines.append(f"{route:24} {metric:20} {old[metric]:>12} {new[metric]:>12} {pct:>+8.1f}%{flag}")
+            if worse:
+                regressions.append((route, metric))
+        if new.get('errors', 0) > old.get('errors', 0):
+            lines.append(f"{route:24} {'errors':20} {old.get('errors', 0):>12} {new['errors']:>12}  <-- regression")
+            regressions.append((route, 'errors'))
+    return lines, regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Diff benchmark results against a baseline.")
+    parser.add_argument('baseline')
+    parser.add_argument('current')
+    parser.add_argument('--tolerance', type=float, default=10.0,
+                        help="Allowed slowdown in percent before a timing counts as a regression (default: 10).")
+    args = parser.parse_args()
+
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    with open(args.current, encoding='utf-8') as f:
+        current = json.load(f)
+
+    lines, regressions = compare(baseline, current, args.tolerance)
+    print('\n'.join(lines))
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:g}% tolerance.")
+        sys.exit(1)
+    print("\nNo regressions.")
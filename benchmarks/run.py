@@ -0,0 +1,261 @@
+# benchmarks/run.py
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import threading
+import subprocess
+import http.cookiejar
+import urllib.error
+import urllib.parse
+import urllib.request
+from datetime import datetime
+
+from dotenv import load_dotenv
+
+load_dotenv() # Load .env variables before the app reads its settings
+# All simulated clients share one IP address, so the login rate limit would throttle them
+os.environ['RATE_LIMIT_ENABLED'] = '0'
+
+from app import app # noqa: E402
+from utils import metrics # noqa: E402
+from utils.db import execute_query # noqa: E402
+from benchmarks.seed import BENCH_ADMIN_EMAIL, BENCH_EMAIL_DOMAIN, BENCH_PASSWORD, bench_email # noqa: E402
+
+# Drives the main routes with concurrent simulated clients against the database in
+# .env (seed it first with python -m benchmarks.seed) and writes latency percentiles,
+# throughput and SQL statements per request to a JSON file.
+# Compare two result files with python -m benchmarks.compare.
+
+ROUTES = ['/login', '/place_order', '/my_orders', '/admin', '/admin/update_status']
+
+# Flask url rules the scenarios hit, used to read query counts from utils.metrics
+METRIC_ROUTES = {
+    '/login': '/login',
+    '/place_order': '/place_order',
+    '/my_orders': '/my_orders',
+    '/admin': '/admin',
+    '/admin/update_status': '/admin/update_status/<int:order_id>',
+}
+
+
+# --- Clients ---
+class TestClient:
+    """Talks to the app in-process through Flask's test client (no network involved)."""
+
+    def __init__(self):
+        self._client = app.test_client()
+
+    def get(self, path):
+        return self._client.get(path).status_code
+
+    def post(self, path, data):
+        return self._client.post(path, data=data).status_code
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class HttpClient:
+    """Talks to a real WSGI server over HTTP, keeping cookies like a browser."""
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+        self._opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()), _NoRedirect())
+
+    def _open(self, request):
+        try:
+            with self._opener.open(request, timeout=60) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as e:
+            return e.code
+
+    def get(self, path):
+        return self._open(urllib.request.Request(self.base_url + path))
+
+    def post(self, path, data):
+        body = urllib.parse.urlencode(data).encode('ascii')
+        return self._open(urllib.request.Request(self.base_url + path, data=body, method='POST'))
+
+
+def start_local_server():
+    """Serves the app with werkzeug's threaded WSGI server on a free local port."""
+    from werkzeug.serving import make_server
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f'http://127.0.0.1:{server.server_port}'
+
+
+# --- Scenarios ---
+class Context:
+    """Data shared by all simulated clients."""
+
+    def __init__(self, customer_count, item_ids, order_ids):
+        self.customer_count = customer_count
+        self.item_ids = item_ids
+        self.order_ids = order_ids
+
+
+def login(client, email):
+    return client.post('/login', {'email': email, 'password': BENCH_PASSWORD})
+
+
+def scenario_request(route, client, ctx, rng):
+    """Performs one request of the given route and returns its HTTP status."""
+    if route == '/login':
+        return login(client, bench_email(rng.randrange(ctx.customer_count)))
+    if route == '/place_order':
+        data = {f'quantity_{item_id}': rng.randint(0, 3) for item_id in ctx.item_ids}
+        data[f'quantity_{rng.choice(ctx.item_ids)}'] = rng.randint(1, 5)
+        return client.post('/place_order', data)
+    if route == '/my_orders':
+        return client.get('/my_orders')
+    if route == '/admin':
+        return client.get('/admin')
+    if route == '/admin/update_status':
+        return client.post(f'/admin/update_status/{rng.choice(ctx.order_ids)}',
+                           {'order_status': rng.choice(['Received', 'Processing', 'Ready'])})
+    raise ValueError(f'Unknown route {route}')
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(pct / 100.0 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def run_route(route, make_client, ctx, clients, requests_per_client, seed):
+    """Runs `clients` threads that each send `requests_per_client` requests of one route."""
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    admin_route = route.startswith('/admin')
+
+    def worker(n):
+        rng = random.Random(seed * 1000 + n)
+        client = make_client()
+        if route != '/login':
+            email = BENCH_ADMIN_EMAIL if admin_route else bench_email(rng.randrange(ctx.customer_count))
+            login(client, email) # Session setup is not part of the measurement
+        local = []
+        local_errors = 0
+        for _ in range(requests_per_client):
+            started = time.perf_counter()
+            status = scenario_request(route, client, ctx, rng)
+            local.append(time.perf_counter() - started)
+            if status >= 400:
+                local_errors += 1
+        with lock:
+            latencies.extend(local)
+            errors[0] += local_errors
+
+    before = metrics.snapshot().get(METRIC_ROUTES[route], {})
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+    after = metrics.snapshot().get(METRIC_ROUTES[route], {})
+
+    latencies.sort()
+    # Session setup logins are recorded under /login, so these are the measured requests only
+    measured = after.get('requests', 0) - before.get('requests', 0)
+    queries = after.get('queries', 0) - before.get('queries', 0)
+    return {
+        'requests': len(latencies),
+        'errors': errors[0],
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+        'mean_ms': round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+        'throughput_rps': round(len(latencies) / wall, 2) if wall else 0.0,
+        'queries_per_request': round(queries / measured, 2) if measured else None,
+    }
+
+
+def load_context():
+    row = execute_query("SELECT COUNT(*) AS n FROM Users WHERE email LIKE %s AND role = 'customer'",
+                        (f'%@{BENCH_EMAIL_DOMAIN}',), fetch_one=True)
+    customer_count = row['n'] if row else 0
+    item_ids = [r['laundry_item_id'] for r in execute_query("SELECT laundry_item_id FROM LaundryItems") or []]
+    order_ids = [r['order_id'] for r in execute_query(
+        "SELECT order_id FROM Orders ORDER BY order_id DESC LIMIT 5000") or []]
+    if not customer_count or not item_ids or not order_ids:
+        raise RuntimeError("No benchmark data found - run python -m benchmarks.seed first.")
+    return Context(customer_count, item_ids, order_ids)
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'],
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the app's main routes with concurrent clients.")
+    parser.add_argument('--clients', type=int, default=8, help="Concurrent simulated clients per route.")
+    parser.add_argument('--requests', type=int, default=25, help="Requests per client per route.")
+    parser.add_argument('--routes', nargs='+', choices=ROUTES, default=ROUTES)
+    parser.add_argument('--transport', choices=['test-client', 'wsgi'], default='test-client',
+                        help="In-process Flask test client, or HTTP against a local threaded WSGI server.")
+    parser.add_argument('--seed', type=int, default=1, help="Random seed for reproducible request mixes.")
+    parser.add_argument('--output', '-o', default='benchmarks/results.json')
+    args = parser.parse_args()
+
+    ctx = load_context()
+    server = None
+    if args.transport == 'wsgi':
+        server, base_url = start_local_server()
+        make_client = lambda: HttpClient(base_url)
+    else:
+        make_client = TestClient
+
+    results = {}
+    try:
+        for route in args.routes:
+            print(f"Benchmarking {route} ({args.clients} clients x {args.requests} requests)...")
+            results[route] = run_route(route, make_client, ctx, args.clients, args.requests, args.seed)
+            r = results[route]
+            print(f"  p50 {r['p50_ms']} ms, p95 {r['p95_ms']} ms, p99 {r['p99_ms']} ms, "
+                  f"{r['throughput_rps']} req/s, {r['queries_per_request']} queries/req, {r['errors']} errors")
+    finally:
+        if server:
+            server.shutdown()
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'git_revision': git_revision(),
+            'python': platform.python_version(),
+            'transport': args.transport,
+            'clients': args.clients,
+            'requests_per_client': args.requests,
+            'seed': args.seed,
+            'customers': ctx.customer_count,
+        },
+        'routes': results,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print(f"\nResults written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+# benchmarks/scheduler.py
+
+import sys
+import json
+import time
+import random
+import argparse
+from datetime import date, datetime, timedelta
+
+from utils import scheduler
+
+# Times the due date planner (utils/scheduler.py) on synthetic open orders, in memory
+# (no database needed), e.g. the size of a busy week's backlog:
+#   python -m benchmarks.scheduler --orders 50000 --repeat 5
+
+CATEGORIES = ['Wash & Fold', 'Dry Cleaning', 'Pressing']
+
+
+def synthetic_orders(count, rng, with_due_dates=0.2):
+    """Open orders shaped like generate_data.py's: 1-4 categories, a few items each."""
+    now = datetime.now()
+    start = date.today() + timedelta(days=1)
+    orders = []
+    for order_id in range(1, count + 1):
+        categories = rng.sample(CATEGORIES, rng.choice([1, 1, 2, 3]))
+        due_date = None
+        if rng.random() < with_due_dates:
+            due_date = datetime.combine(start + timedelta(days=rng.randrange(14)), datetime.min.time())
+        orders.append({
+            'order_id': order_id,
+            'user_id': rng.randrange(1, count // 10 + 2),
+            'order_date': now - timedelta(minutes=rng.randrange(60 * 24 * 14)),
+            'order_status': rng.choices(scheduler.OPEN_STATUSES, weights=[20, 30, 50])[0],
+            'due_date': due_date,
+            'total_amount': 0,
+            'work': {category: 1 + int(rng.expovariate(1 / 3)) for category in categories},
+        })
+    return orders
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the capacity-aware due date planner.")
+    parser.add_argument('--orders', type=int, default=50000, help="Open orders to schedule.")
+    parser.add_argument('--repeat', type=int, default=5, help="Runs per mode; the best and median are reported.")
+    parser.add_argument('--capacity', default=scheduler.SCHEDULE_CAPACITY, help="Items per day by category.")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', '-o', help="Also write the results as JSON to this file.")
+    args = parser.parse_args()
+
+    capacity = scheduler.parse_capacity(args.capacity)
+    orders = synthetic_orders(args.orders, random.Random(args.seed))
+    results = {}
+    for mode, reschedule in (('new_only', False), ('reschedule_all', True)):
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            due_dates, book = scheduler.plan_schedule(orders, capacity, reschedule=reschedule)
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        results[mode] = {
+            'orders_scheduled': len(due_dates),
+            'days_used': max(len(booked) for booked in book.load().values()),
+            'best_ms': round(timings[0], 2),
+            'median_ms': round(timings[len(timings) // 2], 2),
+            'orders_per_second': round(len(due_dates) / (timings[0] / 1000)) if timings[0] else None,
+        }
+        r = results[mode]
+        print(f"{mode:15} {r['orders_scheduled']:>8,} orders over {r['days_used']} days: "
+              f"best {r['best_ms']} ms, median {r['median_ms']} ms ({r['orders_per_second']:,} orders/s)")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'orders': args.orders, 'capacity': capacity, 'results': results}, f, indent=2)
+        print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
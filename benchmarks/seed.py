@@ -0,0 +1,101 @@
+# benchmarks/seed.py
+
+import random
+import argparse
+from datetime import datetime, timedelta
+from dotenv import load_dotenv
+
+from utils.db import execute_query
+from utils.hashing import get_hasher
+from utils.orders import ORDER_STATUSES
+from utils import seeding, stats
+
+load_dotenv() # Load .env variables
+
+# Seeds the database configured in .env with benchmark users and orders.
+# All benchmark accounts use the BENCH_EMAIL_DOMAIN, so they can be removed with --reset
+# without touching real data. Run from the project root: python -m benchmarks.seed
+
+BENCH_EMAIL_DOMAIN = 'bench.local'
+BENCH_PASSWORD = 'bench-password'
+BENCH_ADMIN_EMAIL = f'admin@{BENCH_EMAIL_DOMAIN}'
+
+
+def bench_email(n):
+    return f'user{n}@{BENCH_EMAIL_DOMAIN}'
+
+
+def reset():
+    """Deletes all benchmark users; their orders and items go with them (ON DELETE CASCADE)."""
+    deleted = execute_query("DELETE FROM Users WHERE email LIKE %s", (f'%@{BENCH_EMAIL_DOMAIN}',), is_commit=True)
+    print(f"Removed {deleted or 0} benchmark users.")
+    stats.rebuild()
+
+
+def seed(users=200, orders=2000, items_per_order=3, days=90, batch_size=1000, rng=None):
+    """
+    Inserts `users` customers (plus one admin) and `orders` orders with 1..2*items_per_order-1 items each.
+
+    Passwords are hashed once at the configured cost and shared by all accounts, so
+    login benchmarks measure the real bcrypt cost while seeding stays fast. Rows are
+    written with the batched explicit-ID inserts of utils/seeding.py.
+
+    Returns:
+        dict: Counts of inserted rows.
+    """
+    rng = rng or random.Random(42)
+    items = execute_query("SELECT laundry_item_id, base_price FROM LaundryItems") or []
+    if not items:
+        raise RuntimeError("LaundryItems is empty - run database_setup.sql first.")
+
+    password_hashes = seeding.shared_password_hashes(BENCH_PASSWORD, get_hasher().rounds)
+    admin_id = seeding.next_id('Users', 'user_id')
+    seeding.insert_users([(admin_id, 'bench_admin', password_hashes(1)[0], 'Bench', 'Admin', BENCH_ADMIN_EMAIL,
+                           '0000000000', '1 Bench Way', 'admin')])
+    user_ids = []
+    for start in range(0, users, batch_size):
+        ns = range(start, min(start + batch_size, users))
+        hashes = password_hashes(len(ns))
+        rows = [(admin_id + 1 + n, f'bench_user{n}', hashes[i], 'Bench', f'User{n}', bench_email(n),
+                 f'555{n:07d}', f'{n} Bench Street', 'customer') for i, n in enumerate(ns)]
+        seeding.insert_users(rows)
+        user_ids.extend(row[0] for row in rows)
+
+    next_order_id = seeding.next_id('Orders', 'order_id')
+    now = datetime.now()
+    item_count = 0
+    for start in range(0, orders, batch_size):
+        order_rows = []
+        item_rows = []
+        for order_id in range(next_order_id + start, next_order_id + min(start + batch_size, orders)):
+            order_date = now - timedelta(seconds=rng.randint(0, days * 86400))
+            total = 0.0
+            for item in rng.sample(items, min(len(items), rng.randint(1, max(1, 2 * items_per_order - 1)))):
+                quantity = rng.randint(1, 10)
+                price = float(item['base_price'])
+                item_rows.append((order_id, item['laundry_item_id'], quantity, price, price * quantity))
+                total += price * quantity
+            status = rng.choice(ORDER_STATUSES)
+            due_date = order_date + timedelta(days=rng.randint(1, 5)) if status != 'Pending' else None
+            order_rows.append((order_id, rng.choice(user_ids), order_date, due_date, total, status, ''))
+        seeding.insert_orders(order_rows, item_rows)
+        item_count += len(item_rows)
+
+    # Orders were inserted directly, so recompute the dashboard summary tables
+    stats.rebuild()
+    return {'users': users + 1, 'orders': orders, 'order_items': item_count}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Seed benchmark users and orders.")
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--orders', type=int, default=2000)
+    parser.add_argument('--items-per-order', type=int, default=3, help="Average number of items per order.")
+    parser.add_argument('--days', type=int, default=90, help="Spread order dates over this many past days.")
+    parser.add_argument('--reset', action='store_true', help="Remove existing benchmark data first.")
+    args = parser.parse_args()
+
+    if args.reset:
+        reset()
+    counts = seed(args.users, args.orders, args.items_per_order, args.days)
+    print(f"Seeded {counts['users']} users, {counts['orders']} orders, {counts['order_items']} order items.")
@@ -0,0 +1,47 @@
+import time
+import argparse
+import statistics
+from flask_bcrypt import Bcrypt
+
+# Measures how long one bcrypt hash takes on this machine for increasing cost
+# factors and recommends the highest cost that stays within the target latency.
+# Put the result in .env as BCRYPT_LOG_ROUNDS; existing hashes are upgraded
+# (or downgraded) automatically when their owners next log in.
+
+bcrypt = Bcrypt()
+
+
+def time_cost(rounds, samples):
+    """Returns the median seconds needed to hash a password at the given cost."""
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        bcrypt.generate_password_hash('calibration-password', rounds)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def calibrate(target_ms, samples, min_rounds=4, max_rounds=16):
+    """Returns (recommended_rounds, {rounds: median_ms})."""
+    results = {}
+    recommended = min_rounds
+    for rounds in range(min_rounds, max_rounds + 1):
+        elapsed_ms = time_cost(rounds, samples) * 1000
+        results[rounds] = elapsed_ms
+        print(f"  cost {rounds:2d}: {elapsed_ms:8.1f} ms")
+        if elapsed_ms > target_ms:
+            break # Each extra round doubles the time, no need to go further
+        recommended = rounds
+    return recommended, results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pick a bcrypt cost factor for a target hashing latency.")
+    parser.add_argument('--target-ms', type=float, default=250.0,
+                        help="Maximum time one hash may take (default: 250 ms).")
+    parser.add_argument('--samples', type=int, default=3, help="Measurements per cost factor (default: 3).")
+    args = parser.parse_args()
+
+    print(f"Timing bcrypt on this machine (target {args.target_ms:.0f} ms per hash)...")
+    rounds, _ = calibrate(args.target_ms, max(args.samples, 1))
+    print(f"\nRecommended setting for .env:\nBCRYPT_LOG_ROUNDS={rounds}")
@@ -0,0 +1,311 @@
+import os
+import re
+import ast
+import sys
+import argparse
+from dotenv import load_dotenv
+
+from utils.db import get_db_connection
+
+load_dotenv() # Load .env variables
+
+# Runs EXPLAIN on every SQL statement found in the application code and reports
+# statements that scan a whole table or sort without an index. Exits with status 1
+# if anything is flagged or could not be checked, so it can run as a pre-deploy / CI check.
+# Run it against a database with realistic data: on (nearly) empty tables MySQL
+# may prefer a full scan even when a usable index exists.
+
+DEFAULT_TARGETS = ['app.py', 'utils']
+
+# Small lookup tables where a full scan is expected and harmless: LaundryItems, and the
+# dashboard summary tables (one row per day or status, see utils/stats.py)
+DEFAULT_ALLOWED_FULL_SCANS = {'LaundryItems', 'OrderDailyStats', 'OrderStatusStats', 'OrderTurnaroundStats'}
+
+# Statements that are expected to scan or sort, by file and the function (or module level
+# constant) that holds them, with the reason. They are reported as ALLOW instead of FAIL.
+ALLOWED_STATEMENTS = {
+    ('utils/stats.py', 'DAILY_SQL'): "stats recomputation reads every order (order_stats.py rebuild/check)",
+    ('utils/stats.py', 'STATUS_SQL'): "stats recomputation reads every order (order_stats.py rebuild/check)",
+    ('utils/stats.py', 'TURNAROUND_SQL'): "stats recomputation reads every order (order_stats.py rebuild/check)",
+    ('utils/stats.py', 'rebuild'): "stats recomputation reads every order (order_stats.py rebuild)",
+    ('utils/search.py', 'NAME_CUSTOMERS_SQL'): "sorts only the FULLTEXT matches by relevance, LIMITed",
+    ('utils/search.py', 'INSTRUCTIONS_SQL'): "sorts only the FULLTEXT matches by relevance, LIMITed",
+    ('utils/search.py', 'CUSTOMER_ORDERS_SQL'): "sorts only the orders of at most SEARCH_MAX_CUSTOMERS customers",
+}
+
+# Representative SQL for the parts of templated statements that are built at runtime, by
+# the name of the variable (f-strings) or field (.format()) that holds them. Module level
+# string constants are filled in with their value, and expressions building a list of
+# placeholders (', '.join(['%s'] * n)) become a single %s.
+SAMPLE_FRAGMENTS = {
+    'in_sql': '%s',
+    'placeholders': '%s',
+    'set_fields': 'order_status = %s',
+    'where_sql': '', # Optional "WHERE ..." clauses: checks the unfiltered variant
+    'customers_sql': "SELECT user_id, 0 AS score FROM Users WHERE email LIKE %s ORDER BY email LIMIT %s",
+}
+# Fragments whose shape differs in one file
+FILE_SAMPLE_FRAGMENTS = {
+    'utils/changes.py': {'where_sql': 'c.change_id > %s'},
+    'utils/seeding.py': {'column': 'order_id', 'table': 'Orders'}, # next_id(): MAX() of a primary key
+}
+
+SQL_START = re.compile(r'^\s*(SELECT|UPDATE|DELETE|INSERT)\b', re.IGNORECASE)
+PLACEHOLDER = re.compile(r'%s')
+FORMAT_FIELD = re.compile(r'\{(\w+)\}')
+COLUMN_BEFORE_PLACEHOLDER = re.compile(r'([\w.]+)\s*(?:=|<=|>=|<|>|LIKE|IN\s*\()\s*$', re.IGNORECASE)
+
+
+def iter_python_files(targets):
+    for target in targets:
+        if os.path.isdir(target):
+            for name in sorted(os.listdir(target)):
+                if name.endswith('.py'):
+                    yield os.path.join(target, name)
+        elif target.endswith('.py'):
+            yield target
+
+
+def render_fragment(expr, constants, fragments):
+    """Returns representative SQL for an interpolated expression, or None if it is unknown."""
+    if isinstance(expr, ast.Name) and expr.id in constants:
+        return constants[expr.id]
+    nodes = list(ast.walk(expr))
+    if any(isinstance(node, ast.Constant) and node.value == '%s' for node in nodes):
+        return '%s'
+    for node in nodes:
+        if isinstance(node, ast.Name) and node.id in fragments:
+            return fragments[node.id]
+    return None
+
+
+def render_string(node, constants, fragments):
+    """
+    Renders a string literal or f-string with representative SQL in its interpolations.
+
+    Returns:
+        tuple: (text, unresolved) where unresolved lists the interpolations without a
+            sample; they are left in the text as {expression}.
+    """
+    if isinstance(node, ast.Constant):
+        return node.value, []
+    parts = []
+    unresolved = []
+    for value in node.values:
+        if isinstance(value, ast.Constant):
+            parts.append(value.value)
+            continue
+        text = render_fragment(value.value, constants, fragments)
+        if text is None:
+            text = '{' + ast.unparse(value.value) + '}'
+            unresolved.append(ast.unparse(value.value))
+        parts.append(text)
+    return ''.join(parts), unresolved
+
+
+def fill_format_fields(sql, constants, fragments):
+    """Fills the {field}s of a .format() template. Returns (sql, unresolved field names)."""
+    unresolved = []
+
+    def fill(match):
+        name = match.group(1)
+        if name in fragments:
+            return fragments[name]
+        if name in constants:
+            return constants[name]
+        unresolved.append(name)
+        return match.group(0)
+
+    return FORMAT_FIELD.sub(fill, sql), unresolved
+
+
+def module_constants(tree, fragments):
+    """Module level string constants (NAME = "..." or f"..." built from other constants)."""
+    constants = {}
+    for stmt in tree.body:
+        if (isinstance(stmt, ast.Assign) and len(stmt.targets) == 1 and isinstance(stmt.targets[0], ast.Name)
+                and (isinstance(stmt.value, ast.JoinedStr)
+                     or isinstance(stmt.value, ast.Constant) and isinstance(stmt.value.value, str))):
+            text, unresolved = render_string(stmt.value, constants, fragments)
+            if not unresolved:
+                constants[stmt.targets[0].id] = text
+    return constants
+
+
+def scopes(tree):
+    """Yields (name, node) for the functions, methods and assignments at the top of a module."""
+    for stmt in tree.body:
+        if isinstance(stmt, ast.ClassDef):
+            for item in stmt.body:
+                yield f"{stmt.name}.{getattr(item, 'name', '')}", item
+        elif isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            yield stmt.name, stmt
+        elif isinstance(stmt, ast.Assign) and len(stmt.targets) == 1 and isinstance(stmt.targets[0], ast.Name):
+            yield stmt.targets[0].id, stmt
+        else:
+            yield '', stmt
+
+
+def extract_sql(path):
+    """
+    Finds SQL statements in a Python file.
+
+    Plain string literals are used as-is. Templated statements (f-strings and .format()
+    templates) are filled in with module level string constants and SAMPLE_FRAGMENTS.
+    Interpolations that have no sample are reported, so a new template cannot silently
+    go unchecked.
+
+    Yields:
+        tuple: (line_number, scope, sql, unresolved) where scope is the enclosing
+            function or module level constant and unresolved lists the template parts
+            that could not be filled in.
+    """
+    with open(path, encoding='utf-8') as f:
+        tree = ast.parse(f.read(), filename=path)
+    fragments = {**SAMPLE_FRAGMENTS, **FILE_SAMPLE_FRAGMENTS.get(path.replace(os.sep, '/'), {})}
+    constants = module_constants(tree, fragments)
+
+    # String parts of f-strings are handled with their f-string, not on their own
+    fstring_parts = {id(v) for node in ast.walk(tree) if isinstance(node, ast.JoinedStr)
+                     for v in node.values}
+
+    for scope, top in scopes(tree):
+        for node in ast.walk(top):
+            if id(node) in fstring_parts:
+                continue
+            if not (isinstance(node, ast.JoinedStr)
+                    or isinstance(node, ast.Constant) and isinstance(node.value, str)):
+                continue
+            sql, unresolved = render_string(node, constants, fragments)
+            if not SQL_START.match(sql):
+                continue
+            # Skip messages/snippets that merely start with a keyword (e.g. "SELECT 1 AS ok")
+            if not re.search(r'\b(FROM|SET)\b', sql, re.IGNORECASE):
+                continue
+            # INSERT ... VALUES never scans; only INSERT ... SELECT is worth explaining
+            if sql.lstrip().upper().startswith('INSERT') and 'SELECT' not in sql.upper():
+                continue
+            sql, unresolved_fields = fill_format_fields(sql, constants, fragments)
+            yield node.lineno, scope, ' '.join(sql.split()), unresolved + unresolved_fields
+
+
+def sample_value(sql_before):
+    """Picks a literal for a %s placeholder that matches the type of the compared column."""
+    if re.search(r'LIMIT\s*$|OFFSET\s*$|LIMIT\s+%s\s*,\s*$', sql_before, re.IGNORECASE):
+        return '10'
+    match = COLUMN_BEFORE_PLACEHOLDER.search(sql_before)
+    column = match.group(1).lower() if match else ''
+    if 'date' in column or column.endswith('_at'):
+        return "'2024-01-01 00:00:00'"
+    if column.endswith('id') or column.endswith('quantity'):
+        return '1'
+    return "'x'"
+
+
+def bind_sample_params(sql):
+    """Replaces every %s placeholder with a representative literal so the statement can be EXPLAINed."""
+    out = []
+    pos = 0
+    for match in PLACEHOLDER.finditer(sql):
+        out.append(sql[pos:match.start()])
+        out.append(sample_value(''.join(out)))
+        pos = match.end()
+    out.append(sql[pos:])
+    return ''.join(out)
+
+
+def explain(cursor, sql):
+    cursor.execute(f"EXPLAIN {sql}")
+    return cursor.fetchall()
+
+
+def problems_for(plan, allowed_tables):
+    """Returns human readable problems found in an EXPLAIN result."""
+    problems = []
+    for row in plan:
+        table = row.get('table') or ''
+        extra = row.get('Extra') or ''
+        if table in allowed_tables:
+            continue
+        if row.get('type') == 'ALL':
+            problems.append(f"full table scan on '{table}' (rows~{row.get('rows')})")
+        if 'Using filesort' in extra:
+            problems.append(f"filesort on '{table}'")
+        if 'Using temporary' in extra:
+            problems.append(f"temporary table for '{table}'")
+    return problems
+
+
+def resolve_aliases(sql):
+    """Maps table aliases used in a statement (FROM Orders o) back to table names."""
+    aliases = {}
+    for table, alias in re.findall(r'\b(?:FROM|JOIN|UPDATE)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?', sql, re.IGNORECASE):
+        aliases[table] = table
+        if alias and alias.upper() not in ('WHERE', 'SET', 'JOIN', 'ON', 'ORDER', 'GROUP', 'LIMIT',
+                                           'INNER', 'LEFT', 'RIGHT', 'USING'):
+            aliases[alias] = table
+    return aliases
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EXPLAIN every SQL statement in the app and flag missing indexes.")
+    parser.add_argument('targets', nargs='*', default=DEFAULT_TARGETS,
+                        help="Python files or directories to scan (default: app.py utils)")
+    parser.add_argument('--allow-table', action='append', default=[],
+                        help="Table allowed to be fully scanned (repeatable). LaundryItems and the summary tables are always allowed.")
+    parser.add_argument('--allow-skips', action='store_true',
+                        help="Do not fail on statements that cannot be filled in or EXPLAINed.")
+    args = parser.parse_args()
+
+    allowed = DEFAULT_ALLOWED_FULL_SCANS | set(args.allow_table)
+
+    conn = get_db_connection()
+    if not (conn and conn.is_connected()):
+        print("Failed to connect to the database. Please check your .env settings and DB status.")
+        return 2
+
+    cursor = conn.cursor(dictionary=True)
+    checked = flagged = skipped = 0
+    try:
+        for path in iter_python_files(args.targets):
+            for lineno, scope, sql, unresolved in extract_sql(path):
+                location = f"{path}:{lineno}"
+                if unresolved:
+                    skipped += 1
+                    print(f"SKIP  {location}: no sample SQL for {', '.join(unresolved)} (add it to SAMPLE_FRAGMENTS)")
+                    continue
+                bound = bind_sample_params(sql)
+                try:
+                    plan = explain(cursor, bound)
+                except Exception as e:
+                    skipped += 1
+                    print(f"SKIP  {location}: could not EXPLAIN ({e})")
+                    continue
+                finally:
+                    conn.rollback()
+                checked += 1
+                aliases = resolve_aliases(sql)
+                for row in plan:
+                    row['table'] = aliases.get(row.get('table'), row.get('table'))
+                problems = problems_for(plan, allowed)
+                reason = ALLOWED_STATEMENTS.get((path.replace(os.sep, '/'), scope))
+                if problems and reason:
+                    print(f"ALLOW {location}: {'; '.join(problems)} ({reason})")
+                elif problems:
+                    flagged += 1
+                    print(f"FAIL  {location}: {'; '.join(problems)}")
+                    print(f"      {sql}")
+                else:
+                    print(f"OK    {location}")
+    finally:
+        cursor.close()
+        conn.close()
+
+    print(f"\n{checked} statements checked, {flagged} flagged, {skipped} skipped.")
+    if flagged or (skipped and not args.allow_skips):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,12 @@
 import os
 import getpass # For securely getting password input
-from flask_bcrypt import Bcrypt # Use Bcrypt directly or app's bcrypt instance
 from dotenv import load_dotenv
 
 # Import your database utility function
 # Make sure this path is correct relative to where you run the script
 from utils.db import execute_query, get_db_connection
-
-# Initialize Bcrypt separately for the script if needed
-# Or, if running within Flask context isn't feasible:
-bcrypt = Bcrypt()
+# Same hashing service (and cost factor, BCRYPT_LOG_ROUNDS) as the web app
+from utils.hashing import get_hasher
 
 load_dotenv() # Load .env variables
 
@@ -44,7 +41,7 @@ def create_admin_user():
 
     # Hash the password
     try:
-        hashed_password = bcrypt.generate_password_hash(password).decode('utf-8')
+        hashed_password = get_hasher().hash(password)
         print("Password hashed successfully.")
     except Exception as e:
         print(f"Error hashing password: {e}")
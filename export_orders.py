@@ -0,0 +1,49 @@
+import sys
+import argparse
+from dotenv import load_dotenv
+
+from utils.export import generate_export, EXPORT_FORMATS
+from utils.orders import parse_order_filters
+
+load_dotenv() # Load .env variables
+
+# Streams orders (with their line items) to a file or stdout as CSV or NDJSON.
+# Rows are read from an unbuffered cursor in chunks, so memory use stays flat
+# no matter how many orders are exported.
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export orders with their items as CSV or NDJSON.")
+    parser.add_argument('--format', choices=sorted(EXPORT_FORMATS), default='csv', help="Output format (default: csv).")
+    parser.add_argument('--status', help="Only orders with this status.")
+    parser.add_argument('--date-from', help="Only orders placed on or after this date (YYYY-MM-DD).")
+    parser.add_argument('--date-to', help="Only orders placed on or before this date (YYYY-MM-DD).")
+    parser.add_argument('--output', '-o', help="Output file (default: stdout).")
+    parser.add_argument('--chunk-size', type=int, default=1000, help="Rows fetched per round trip (default: 1000).")
+    args = parser.parse_args()
+
+    filters, errors = parse_order_filters({
+        'status': args.status,
+        'date_from': args.date_from,
+        'date_to': args.date_to,
+    })
+    if errors:
+        for error in errors:
+            print(error, file=sys.stderr)
+        return 2
+
+    out = open(args.output, 'w', encoding='utf-8', newline='') if args.output else sys.stdout
+    try:
+        for chunk in generate_export(filters, args.format, chunk_size=args.chunk_size):
+            out.write(chunk)
+    except Exception as e:
+        print(f"Export failed: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,198 @@
+import os
+import sys
+import time
+import random
+import argparse
+from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor
+from dotenv import load_dotenv
+
+from utils.db import execute_query, TransactionError
+from utils import seeding, stats
+
+load_dotenv() # Load .env variables
+
+# Generates a realistically sized database for capacity testing, non-interactively:
+#   python generate_data.py --users 100000 --orders 1000000
+#
+# Rows are inserted with explicit IDs in batched multi-row INSERTs (one transaction per
+# batch, see utils/seeding.py), so order items never need IDs read back. By default every generated user
+# shares one precomputed password hash; --unique-passwords hashes a password per user
+# on a process pool instead (slow at production cost; lower it with --hash-rounds).
+# The dashboard summary tables are rebuilt at the end.
+
+FIRST_NAMES = ['James', 'Mary', 'John', 'Patricia', 'Robert', 'Jennifer', 'Michael', 'Linda', 'David',
+               'Elizabeth', 'William', 'Barbara', 'Richard', 'Susan', 'Joseph', 'Jessica', 'Thomas',
+               'Sarah', 'Carlos', 'Maria', 'Wei', 'Aisha', 'Omar', 'Priya', 'Kenji', 'Fatima']
+LAST_NAMES = ['Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis', 'Rodriguez',
+              'Martinez', 'Hernandez', 'Lopez', 'Wilson', 'Anderson', 'Thomas', 'Taylor', 'Moore',
+              'Chen', 'Patel', 'Kim', 'Nguyen', 'Khan', 'Okafor', 'Silva']
+STREETS = ['Main St', 'Oak Ave', 'Maple Dr', 'Park Rd', 'Cedar Ln', 'Elm St', 'Lake View', 'Hill Rd']
+INSTRUCTIONS = ['Cold wash only', 'No starch', 'Extra starch', 'Hang dry', 'Fragrance free detergent',
+                'Please fold shirts', 'Deliver after 5pm']
+
+class Progress:
+    """Counts inserted rows per table and prints throughput."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.rows = {}
+
+    def add(self, table, count):
+        self.rows[table] = self.rows.get(table, 0) + count
+
+    def rate(self):
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        return sum(self.rows.values()) / elapsed
+
+    def report(self, label, done, total):
+        print(f"  {label}: {done:,}/{total:,} ({self.rate():,.0f} rows/s overall)")
+
+
+def generate_users(count, first_id, password_hashes, domain, batch_size, rng, progress):
+    """Inserts `count` customers with IDs first_id..; password_hashes(n) returns n hashes."""
+    for start in range(0, count, batch_size):
+        n = min(batch_size, count - start)
+        hashes = password_hashes(n)
+        rows = []
+        for i in range(n):
+            user_id = first_id + start + i
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            rows.append((user_id, f'gen_user{user_id}', hashes[i], first, last,
+                         f'{first}.{last}.{user_id}@{domain}'.lower(), f'555{rng.randrange(10**7):07d}',
+                         f'{rng.randint(1, 9999)} {rng.choice(STREETS)}', 'customer'))
+        seeding.insert_users(rows)
+        progress.add('Users', n)
+        progress.report('users', start + n, count)
+
+
+def _status_for_age(age_days, rng):
+    """Older orders are mostly finished; recent ones are spread over the open statuses."""
+    if age_days > 14:
+        return rng.choices(['Completed', 'Cancelled', 'Ready'], weights=[90, 7, 3])[0]
+    if age_days > 3:
+        return rng.choices(['Completed', 'Ready', 'Processing', 'Cancelled'], weights=[50, 25, 20, 5])[0]
+    return rng.choices(['Pending', 'Received', 'Processing', 'Ready', 'Cancelled'], weights=[35, 25, 25, 10, 5])[0]
+
+
+def generate_orders(count, first_id, user_ids, items, avg_items, days, batch_size, rng, progress):
+    """
+    Inserts `count` orders (IDs first_id..) with their items.
+
+    Distributions: a few customers place most orders, order volume grows towards
+    the present and peaks around midday, cheap everyday items are picked more often
+    than dry cleaning, and the status depends on the order's age.
+    """
+    now = datetime.now()
+    item_weights = [1.0 / max(float(item['base_price']), 0.5) for item in items]
+    user_count = len(user_ids)
+    for start in range(0, count, batch_size):
+        n = min(batch_size, count - start)
+        order_rows = []
+        item_rows = []
+        for order_id in range(first_id + start, first_id + start + n):
+            age_days = int(days * (1 - rng.random() ** 0.5)) # Denser towards the present
+            hour = rng.triangular(7, 21, 12)
+            order_date = (now - timedelta(days=age_days)).replace(hour=int(hour), minute=rng.randrange(60),
+                                                                  second=rng.randrange(60), microsecond=0)
+            if order_date > now:
+                order_date -= timedelta(days=1)
+
+            line_count = min(len(items), 1 + int(rng.expovariate(1.0 / max(avg_items - 1, 0.1))))
+            chosen = {}
+            while len(chosen) < line_count:
+                item = rng.choices(items, weights=item_weights)[0]
+                chosen[item['laundry_item_id']] = item
+            total = 0.0
+            for item_id, item in chosen.items():
+                quantity = min(1 + int(rng.expovariate(1 / 2.5)), 20)
+                price = float(item['base_price'])
+                item_rows.append((order_id, item_id, quantity, price, price * quantity))
+                total += price * quantity
+
+            status = _status_for_age(age_days, rng)
+            due_date = None
+            if status != 'Pending':
+                due_date = order_date.replace(hour=17, minute=0, second=0) + timedelta(days=rng.randint(1, 5))
+            instructions = rng.choice(INSTRUCTIONS) if rng.random() < 0.15 else ''
+            # Skewed towards low user indexes: a fifth of the customers place ~45% of the orders
+            user_id = user_ids[int(user_count * rng.random() ** 2)]
+            order_rows.append((order_id, user_id, order_date, due_date, round(total, 2), status, instructions))
+
+        seeding.insert_orders(order_rows, item_rows)
+        progress.add('Orders', len(order_rows))
+        progress.add('OrderItems', len(item_rows))
+        progress.report('orders', start + n, count)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic users, orders and order items.")
+    parser.add_argument('--users', type=int, default=10000, help="Customers to create (0 = use existing customers).")
+    parser.add_argument('--orders', type=int, default=100000)
+    parser.add_argument('--items-per-order', type=float, default=2.5, help="Average number of items per order.")
+    parser.add_argument('--days', type=int, default=365, help="Spread order dates over this many past days.")
+    parser.add_argument('--batch-size', type=int, default=2000, help="Rows per multi-row INSERT / transaction.")
+    parser.add_argument('--domain', default='example.test', help="Email domain of generated users.")
+    parser.add_argument('--password', default='password123', help="Password of all generated users.")
+    parser.add_argument('--unique-passwords', action='store_true',
+                        help="Hash --password separately (own salt) for every user on a process pool "
+                             "instead of sharing one precomputed hash.")
+    parser.add_argument('--hash-rounds', type=int, default=int(os.getenv('BCRYPT_LOG_ROUNDS', 12)),
+                        help="bcrypt cost for generated hashes (default: BCRYPT_LOG_ROUNDS).")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Hashing processes.")
+    parser.add_argument('--seed', type=int, default=42, help="Random seed for reproducible data.")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    items = execute_query("SELECT laundry_item_id, base_price FROM LaundryItems ORDER BY laundry_item_id")
+    if not items:
+        print("LaundryItems is empty or the database is unreachable - run database_setup.sql first.")
+        return 1
+
+    progress = Progress()
+    executor = None
+    try:
+        if args.users > 0:
+            if args.unique_passwords:
+                executor = ProcessPoolExecutor(max_workers=args.workers)
+                password_hashes = lambda n: list(executor.map(
+                    seeding.hash_password, [args.password] * n, [args.hash_rounds] * n,
+                    chunksize=max(n // (args.workers * 4), 1)))
+            else:
+                password_hashes = seeding.shared_password_hashes(args.password, args.hash_rounds)
+            first_user_id = seeding.next_id('Users', 'user_id')
+            print(f"Creating {args.users:,} users...")
+            generate_users(args.users, first_user_id, password_hashes, args.domain, args.batch_size, rng, progress)
+            user_ids = list(range(first_user_id, first_user_id + args.users))
+        else:
+            rows = execute_query("SELECT user_id FROM Users WHERE role = 'customer' ORDER BY user_id") or []
+            user_ids = [row['user_id'] for row in rows]
+
+        if args.orders > 0:
+            if not user_ids:
+                print("No customers to assign orders to - use --users.")
+                return 1
+            print(f"Creating {args.orders:,} orders...")
+            generate_orders(args.orders, seeding.next_id('Orders', 'order_id'), user_ids, items,
+                            args.items_per_order, args.days, args.batch_size, rng, progress)
+
+        # Orders were inserted directly, so recompute the dashboard summary tables
+        print("Rebuilding order summary tables...")
+        stats.rebuild()
+    except TransactionError as e:
+        print(f"Database error: {e}")
+        return 2
+    finally:
+        if executor:
+            executor.shutdown()
+
+    elapsed = time.perf_counter() - progress.started
+    print(f"\nDone in {elapsed:.1f}s:")
+    for table, count in progress.rows.items():
+        print(f"  {table:12} {count:>12,} rows")
+    print(f"  {'total':12} {sum(progress.rows.values()):>12,} rows ({progress.rate():,.0f} rows/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+import os
+import sys
+import argparse
+from dotenv import load_dotenv
+
+# Import your database utility function
+# Make sure this path is correct relative to where you run the script
+from utils.db import get_db_connection
+
+load_dotenv() # Load .env variables
+
+# Versioned schema migrations live in migrations/ as NNNN_description.sql and are
+# applied in file name order. Applied versions are recorded in SchemaMigrations.
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+
+CREATE_VERSIONS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS SchemaMigrations (
+        version VARCHAR(255) PRIMARY KEY,
+        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+
+def list_migrations():
+    """Returns (version, path) pairs for all migration files, in the order they must be applied."""
+    files = sorted(f for f in os.listdir(MIGRATIONS_DIR) if f.endswith('.sql'))
+    return [(os.path.splitext(f)[0], os.path.join(MIGRATIONS_DIR, f)) for f in files]
+
+
+def split_statements(sql_text):
+    """Splits a migration file into individual statements (comments are dropped)."""
+    lines = [line for line in sql_text.splitlines() if not line.strip().startswith('--')]
+    return [stmt.strip() for stmt in '\n'.join(lines).split(';') if stmt.strip()]
+
+
+def applied_versions(cursor):
+    cursor.execute(CREATE_VERSIONS_TABLE_SQL)
+    cursor.execute("SELECT version FROM SchemaMigrations")
+    return {row[0] for row in cursor.fetchall()}
+
+
+def migrate(dry_run=False):
+    """Applies all pending migrations. Returns True if everything succeeded."""
+    conn = get_db_connection()
+    if not (conn and conn.is_connected()):
+        print("Failed to connect to the database. Please check your .env settings and DB status.")
+        return False
+
+    cursor = conn.cursor()
+    try:
+        done = applied_versions(cursor)
+        pending = [(v, p) for v, p in list_migrations() if v not in done]
+        if not pending:
+            print("Database schema is up to date.")
+            return True
+
+        for version, path in pending:
+            with open(path, encoding='utf-8') as f:
+                statements = split_statements(f.read())
+            print(f"Applying {version} ({len(statements)} statements)...")
+            if dry_run:
+                for stmt in statements:
+                    print(f"  {stmt};")
+                continue
+            # Note: MySQL DDL commits implicitly, so a failing migration may be
+            # partially applied. Fix the cause and drop what was created before re-running.
+            for stmt in statements:
+                cursor.execute(stmt)
+            cursor.execute("INSERT INTO SchemaMigrations (version) VALUES (%s)", (version,))
+            conn.commit()
+            print(f"Applied {version}.")
+        return True
+    except Exception as e:
+        print(f"Migration failed: {e}")
+        conn.rollback()
+        return False
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def show_status():
+    conn = get_db_connection()
+    if not (conn and conn.is_connected()):
+        print("Failed to connect to the database. Please check your .env settings and DB status.")
+        return False
+    cursor = conn.cursor()
+    try:
+        done = applied_versions(cursor)
+        conn.commit()
+        for version, _ in list_migrations():
+            print(f"[{'x' if version in done else ' '}] {version}")
+        return True
+    finally:
+        cursor.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Apply versioned schema migrations from migrations/.")
+    parser.add_argument('--status', action='store_true', help="List migrations and whether they are applied.")
+    parser.add_argument('--dry-run', action='store_true', help="Print pending statements without running them.")
+    args = parser.parse_args()
+
+    ok = show_status() if args.status else migrate(dry_run=args.dry_run)
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,12 @@
+-- 0001: Secondary indexes for the order listing queries
+-- Orders are always listed newest first; order_id is the keyset tie-breaker (admin_dashboard)
+CREATE INDEX idx_orders_date_id ON Orders (order_date, order_id);
+
+-- my_orders: WHERE user_id = ? ORDER BY order_date DESC (also serves the user_id foreign key)
+CREATE INDEX idx_orders_user_date ON Orders (user_id, order_date);
+
+-- admin_dashboard filtered by status, still sorted by date
+CREATE INDEX idx_orders_status_date ON Orders (order_status, order_date, order_id);
+
+-- Loading the line items of one or more orders (also serves the order_id foreign key)
+CREATE INDEX idx_orderitems_order ON OrderItems (order_id, laundry_item_id);
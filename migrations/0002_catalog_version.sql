@@ -0,0 +1,21 @@
+-- 0002: Version stamps for in-process caches
+-- Each worker process caches the LaundryItems catalog (utils/catalog.py) and compares
+-- this version when its TTL expires, so a change is picked up by every process.
+CREATE TABLE IF NOT EXISTS CacheVersions (
+    name VARCHAR(50) PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
+
+INSERT INTO CacheVersions (name, version) VALUES ('catalog', 1)
+ON DUPLICATE KEY UPDATE name=name;
+
+-- Bump the catalog version whenever LaundryItems changes, whoever changes it
+CREATE TRIGGER trg_laundryitems_insert_version AFTER INSERT ON LaundryItems
+FOR EACH ROW UPDATE CacheVersions SET version = version + 1 WHERE name = 'catalog';
+
+CREATE TRIGGER trg_laundryitems_update_version AFTER UPDATE ON LaundryItems
+FOR EACH ROW UPDATE CacheVersions SET version = version + 1 WHERE name = 'catalog';
+
+CREATE TRIGGER trg_laundryitems_delete_version AFTER DELETE ON LaundryItems
+FOR EACH ROW UPDATE CacheVersions SET version = version + 1 WHERE name = 'catalog';
@@ -0,0 +1,29 @@
+-- 0003: Summary tables for dashboard statistics, maintained by the app in the same
+-- transaction as each order write (utils/stats.py). Rebuild/verify with order_stats.py.
+
+-- Orders placed per day; revenue excludes cancelled orders
+CREATE TABLE IF NOT EXISTS OrderDailyStats (
+    stat_date DATE PRIMARY KEY,
+    order_count INT NOT NULL DEFAULT 0,
+    revenue DECIMAL(14, 2) NOT NULL DEFAULT 0.00
+);
+
+-- Current number of orders in each status
+CREATE TABLE IF NOT EXISTS OrderStatusStats (
+    order_status ENUM('Pending', 'Received', 'Processing', 'Ready', 'Completed', 'Cancelled') PRIMARY KEY,
+    order_count INT NOT NULL DEFAULT 0
+);
+
+-- Sum of (due_date - order_date) over orders that have a due date (single row, id = 1)
+CREATE TABLE IF NOT EXISTS OrderTurnaroundStats (
+    id TINYINT PRIMARY KEY,
+    order_count INT NOT NULL DEFAULT 0,
+    total_seconds BIGINT NOT NULL DEFAULT 0
+);
+
+INSERT INTO OrderStatusStats (order_status, order_count) VALUES
+('Pending', 0), ('Received', 0), ('Processing', 0), ('Ready', 0), ('Completed', 0), ('Cancelled', 0)
+ON DUPLICATE KEY UPDATE order_status=order_status;
+
+INSERT INTO OrderTurnaroundStats (id, order_count, total_seconds) VALUES (1, 0, 0)
+ON DUPLICATE KEY UPDATE id=id;
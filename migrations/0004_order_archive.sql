@@ -0,0 +1,31 @@
+-- 0004: Archive tables for finished orders (utils/archive.py, archive_orders.py).
+-- Completed and Cancelled orders older than ARCHIVE_AFTER_DAYS are moved here in batches,
+-- keeping Orders/OrderItems (and their indexes) small enough to stay in the buffer pool.
+-- Separate tables rather than partitions: partitioned InnoDB tables cannot have foreign keys.
+
+CREATE TABLE IF NOT EXISTS OrdersArchive (
+    order_id INT PRIMARY KEY, -- Same ID as in Orders
+    user_id INT NOT NULL,
+    order_date TIMESTAMP NOT NULL,
+    due_date TIMESTAMP NULL,
+    total_amount DECIMAL(10, 2) DEFAULT 0.00,
+    order_status ENUM('Pending', 'Received', 'Processing', 'Ready', 'Completed', 'Cancelled') NOT NULL,
+    special_instructions TEXT,
+    archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    -- my_orders?include_archived=1: WHERE user_id = ? ORDER BY order_date DESC
+    INDEX idx_orders_archive_user_date (user_id, order_date),
+    INDEX idx_orders_archive_date_id (order_date, order_id),
+    FOREIGN KEY (user_id) REFERENCES Users(user_id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS OrderItemsArchive (
+    order_item_id INT PRIMARY KEY, -- Same ID as in OrderItems
+    order_id INT NOT NULL,
+    laundry_item_id INT NOT NULL,
+    quantity INT NOT NULL,
+    price_per_unit DECIMAL(10, 2) NOT NULL,
+    total_price DECIMAL(10, 2) NOT NULL,
+    INDEX idx_orderitems_archive_order (order_id, laundry_item_id),
+    FOREIGN KEY (order_id) REFERENCES OrdersArchive(order_id) ON DELETE CASCADE,
+    FOREIGN KEY (laundry_item_id) REFERENCES LaundryItems(laundry_item_id) ON DELETE RESTRICT
+);
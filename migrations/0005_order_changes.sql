@@ -0,0 +1,14 @@
+-- 0005: Order change log (utils/changes.py), the source of the admin dashboard's live updates.
+-- place_order and the status updates insert one row per touched order in the same transaction
+-- as the order write. Readers ask for "changes after change_id N", a primary key range scan
+-- whose cost depends on the number of new changes, not on the size of Orders.
+-- No foreign key to Orders: archived orders leave Orders but their changes stay until pruned.
+
+CREATE TABLE IF NOT EXISTS OrderChanges (
+    change_id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    order_id INT NOT NULL,
+    change_type ENUM('created', 'updated') NOT NULL,
+    changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    -- prune_changes.py: DELETE ... WHERE changed_at < ?
+    INDEX idx_order_changes_changed_at (changed_at)
+);
@@ -0,0 +1,16 @@
+-- 0006: Indexes for the admin search (utils/search.py, /admin/search).
+-- Every search branch is an index lookup; none of them scans Orders or Users.
+-- The first FULLTEXT index on a table rebuilds it once (InnoDB adds a hidden FTS_DOC_ID
+-- column), so apply this outside peak hours on large tables.
+
+-- Customer names: MATCH (first_name, last_name) AGAINST ('smi*' IN BOOLEAN MODE)
+CREATE FULLTEXT INDEX ft_users_name ON Users (first_name, last_name);
+
+-- Names shorter than the FULLTEXT minimum token length (3): last_name LIKE 'Li%'
+CREATE INDEX idx_users_last_name ON Users (last_name(20));
+
+-- Phone number prefixes: phone LIKE '555%' (emails already have the UNIQUE index)
+CREATE INDEX idx_users_phone ON Users (phone);
+
+-- Words in the order notes: MATCH (special_instructions) AGAINST ('starch*' IN BOOLEAN MODE)
+CREATE FULLTEXT INDEX ft_orders_instructions ON Orders (special_instructions);
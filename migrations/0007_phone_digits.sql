@@ -0,0 +1,16 @@
+-- 0007: Phone search on digits (utils/search.py). Users.phone is stored as entered, e.g.
+-- "555-123-4567" or "(555) 123 4567", while the search strips the same punctuation from the
+-- query; matching "555123" needs the stored numbers without it too. The generated column
+-- is maintained by MySQL on every write, so app.py and the seed scripts need no changes.
+-- Adding a STORED column rebuilds Users once; apply this outside peak hours on large tables.
+
+ALTER TABLE Users ADD COLUMN phone_digits VARCHAR(20) AS (
+    REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(
+        phone, '-', ''), ' ', ''), '(', ''), ')', ''), '.', ''), '+', ''), '#', ''), '\t', '')
+) STORED;
+
+-- Phone number prefixes: phone_digits LIKE '555123%'
+CREATE INDEX idx_users_phone_digits ON Users (phone_digits);
+
+-- Replaced by idx_users_phone_digits
+DROP INDEX idx_users_phone ON Users;
@@ -0,0 +1,19 @@
+-- 0008: Per-customer order versions for the cached my_orders pages (app.py, asgi.py).
+-- Every change to a customer's orders bumps their 'orders:<user_id>' row in CacheVersions,
+-- whoever makes it (any web worker, schedule_orders.py, archive_orders.py, manual SQL).
+-- Each request compares its cached page with this version (a primary key lookup), so no
+-- worker process serves a page that is older than the customer's last order change.
+
+CREATE TRIGGER trg_orders_insert_version AFTER INSERT ON Orders
+FOR EACH ROW INSERT INTO CacheVersions (name, version) VALUES (CONCAT('orders:', NEW.user_id), 1)
+ON DUPLICATE KEY UPDATE version = version + 1;
+
+-- Orders never move between customers, so only NEW.user_id is bumped
+CREATE TRIGGER trg_orders_update_version AFTER UPDATE ON Orders
+FOR EACH ROW INSERT INTO CacheVersions (name, version) VALUES (CONCAT('orders:', NEW.user_id), 1)
+ON DUPLICATE KEY UPDATE version = version + 1;
+
+-- Also fires when orders are archived (moved to OrdersArchive)
+CREATE TRIGGER trg_orders_delete_version AFTER DELETE ON Orders
+FOR EACH ROW INSERT INTO CacheVersions (name, version) VALUES (CONCAT('orders:', OLD.user_id), 1)
+ON DUPLICATE KEY UPDATE version = version + 1;
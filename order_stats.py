@@ -0,0 +1,43 @@
+import sys
+import argparse
+from dotenv import load_dotenv
+
+from utils.db import TransactionError
+from utils import stats
+
+load_dotenv() # Load .env variables
+
+# Maintenance for the dashboard summary tables (see utils/stats.py):
+#   python order_stats.py rebuild   - recompute them from Orders and OrdersArchive (backfill after migrating)
+#   python order_stats.py check     - verify them against Orders and OrdersArchive, exit 1 on any mismatch
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild or verify the order summary tables.")
+    parser.add_argument('command', choices=['rebuild', 'check'])
+    args = parser.parse_args()
+
+    try:
+        if args.command == 'rebuild':
+            print("Rebuilding order summary tables...")
+            stats.rebuild()
+            print("Done.")
+            return 0
+
+        problems = stats.check()
+    except TransactionError as e:
+        print(f"Database error: {e}")
+        return 2
+
+    if problems:
+        print(f"{len(problems)} inconsistencies found:")
+        for problem in problems:
+            print(f"  {problem}")
+        print("Run 'python order_stats.py rebuild' to fix them.")
+        return 1
+    print("Order summary tables are consistent.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,30 @@
+import sys
+import argparse
+from dotenv import load_dotenv
+
+from utils import changes
+
+load_dotenv() # Load .env variables
+
+# Deletes old rows of the order change log (OrderChanges, see utils/changes.py). The log
+# only has to reach back as far as an open admin dashboard, so run it e.g. nightly:
+#   python prune_changes.py --days 7
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Delete old entries of the order change log.")
+    parser.add_argument('--days', type=int, default=changes.CHANGE_LOG_DAYS,
+                        help=f"Keep changes from the last N days (default: {changes.CHANGE_LOG_DAYS}).")
+    parser.add_argument('--batch-size', type=int, default=5000, help="Rows deleted per statement.")
+    args = parser.parse_args()
+
+    deleted = changes.prune_changes(args.days, args.batch_size)
+    if deleted is None:
+        print("Failed to prune the change log. Please check your .env settings and DB status.")
+        return 2
+    print(f"Deleted {deleted:,} changes older than {args.days} days.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+import sys
+import time
+import argparse
+from datetime import datetime, timedelta
+from dotenv import load_dotenv
+
+from utils.db import TransactionError
+from utils import scheduler
+
+load_dotenv() # Load .env variables
+
+# Assigns due dates to open orders from the daily capacity per category (see utils/scheduler.py),
+# the same as the dashboard's Auto-schedule button:
+#   python schedule_orders.py --dry-run                  # print the plan only
+#   python schedule_orders.py --reschedule               # also move orders that have a due date
+#   python schedule_orders.py --capacity "Wash & Fold=500,Dry Cleaning=150,Pressing=250"
+
+
+def print_load(book, days):
+    """Prints the items booked per category for the first `days` days of the plan."""
+    load = book.load()
+    categories = sorted(load, key=str)
+    print(f"  {'day':10} " + ' '.join(f"{str(category):>14}" for category in categories))
+    horizon = max((len(booked) for booked in load.values()), default=0)
+    for offset in range(min(horizon, days)):
+        cells = []
+        for category in categories:
+            booked = load[category][offset] if offset < len(load[category]) else 0
+            cells.append(f"{booked:>7}/{book.capacity.get(category, book.default_capacity):<6}")
+        print(f"  {book.start + timedelta(days=offset):%Y-%m-%d} " + ' '.join(cells))
+    if horizon > days:
+        print(f"  ... {horizon - days} more day(s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Schedule due dates for open orders by daily capacity.")
+    parser.add_argument('--capacity', default=scheduler.SCHEDULE_CAPACITY,
+                        help=f'Items per day by category (default: "{scheduler.SCHEDULE_CAPACITY}").')
+    parser.add_argument('--start', type=lambda s: datetime.strptime(s, '%Y-%m-%d').date(),
+                        help="Earliest due date, YYYY-MM-DD (default: today + SCHEDULE_LEAD_DAYS).")
+    parser.add_argument('--reschedule', action='store_true',
+                        help="Also move open orders that already have a due date.")
+    parser.add_argument('--dry-run', action='store_true', help="Plan and report without writing due dates.")
+    parser.add_argument('--show-days', type=int, default=14, help="Days of booked capacity to print.")
+    args = parser.parse_args()
+
+    try:
+        capacity = scheduler.parse_capacity(args.capacity)
+    except ValueError as e:
+        print(e)
+        return 2
+
+    orders = scheduler.load_open_orders()
+    if orders is None:
+        print("Failed to query the database. Please check your .env settings and DB status.")
+        return 2
+
+    started = time.perf_counter()
+    due_dates, book = scheduler.plan_schedule(orders.values(), capacity, start=args.start,
+                                              reschedule=args.reschedule)
+    planned_ms = (time.perf_counter() - started) * 1000
+    print(f"{len(orders):,} open orders, {len(due_dates):,} scheduled in {planned_ms:.1f} ms.")
+    if not due_dates:
+        return 0
+    print(f"Due dates {min(due_dates.values()):%Y-%m-%d} to {max(due_dates.values()):%Y-%m-%d}:")
+    print_load(book, args.show_days)
+    if args.dry_run:
+        return 0
+
+    try:
+        updated = scheduler.apply_schedule(orders, due_dates)
+    except TransactionError as e:
+        print(f"Writing due dates failed: {e}")
+        print("Batches before the error were saved; run again to finish.")
+        return 1
+    print(f"Changed the due date of {updated:,} orders.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
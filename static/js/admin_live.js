@@ -0,0 +1,49 @@
+/* Live admin dashboard: follows /admin/changes/stream (server-sent events) and patches
+   the orders table in place instead of reloading the whole page. */
+(function () {
+    var notice = document.getElementById('live-orders');
+    if (!notice || !window.EventSource) {
+        return;
+    }
+    var tbody = document.querySelector('table tbody tr[data-order-id]');
+    tbody = tbody ? tbody.parentNode : null;
+    var insertNew = notice.dataset.insertNew === '1' && tbody;
+    var newCount = 0;
+
+    function rowFromHtml(html) {
+        var template = document.createElement('template');
+        template.innerHTML = html.trim();
+        return template.content.firstElementChild;
+    }
+
+    function applyChange(change) {
+        var current = tbody && tbody.querySelector('tr[data-order-id="' + change.order_id + '"]');
+        if (current) {
+            if (!change.row) {
+                current.remove(); // No longer in Orders (archived)
+                return;
+            }
+            var row = rowFromHtml(change.row);
+            // Keep the bulk update selection of the replaced row
+            var checked = current.querySelector('input[name="order_ids"]');
+            if (checked && checked.checked) {
+                row.querySelector('input[name="order_ids"]').checked = true;
+            }
+            current.replaceWith(row);
+        } else if (change.change_type === 'created' && change.row) {
+            if (insertNew) {
+                tbody.insertBefore(rowFromHtml(change.row), tbody.firstChild);
+            } else {
+                newCount += 1;
+                document.getElementById('live-orders-count').textContent = newCount;
+                notice.classList.remove('d-none');
+            }
+        }
+    }
+
+    // The browser reconnects on its own (sending Last-Event-ID) when the stream ends
+    var source = new EventSource(notice.dataset.streamUrl);
+    source.addEventListener('order', function (event) {
+        applyChange(JSON.parse(event.data));
+    });
+})();
@@ -0,0 +1,86 @@
+# utils/api.py
+
+from utils.db import execute_query
+from utils.export import ITEM_FIELDS, plain_value
+
+# JSON representation of orders for the /api/... routes. Orders of one page are read
+# with the keyset query from utils/orders.py; their line items are then loaded with a
+# single IN (...) query for the whole page, however many orders it has.
+
+# Fields a client may request with ?fields=a,b,c (default: all of them)
+CUSTOMER_ORDER_FIELDS = ['order_id', 'order_date', 'due_date', 'order_status', 'total_amount',
+                         'special_instructions', 'items']
+ADMIN_ORDER_FIELDS = CUSTOMER_ORDER_FIELDS + ['user_id', 'first_name', 'last_name', 'email']
+
+ORDER_ITEMS_SQL = """
+    SELECT oi.order_id, oi.order_item_id, oi.laundry_item_id, li.name AS item_name,
+           oi.quantity, oi.price_per_unit, oi.total_price
+    FROM OrderItems oi
+    LEFT JOIN LaundryItems li ON li.laundry_item_id = oi.laundry_item_id
+    WHERE oi.order_id IN ({placeholders})
+"""
+
+
+def parse_fields(value, allowed):
+    """
+    Parses a comma separated ?fields= value.
+
+    Returns:
+        tuple: (list of fields, None) or (None, error message). An empty value selects all allowed fields.
+    """
+    if not value:
+        return list(allowed), None
+    fields = []
+    for field in value.split(','):
+        field = field.strip()
+        if not field or field in fields:
+            continue
+        if field not in allowed:
+            return None, f'Unknown field "{field}". Available fields: {", ".join(allowed)}.'
+        fields.append(field)
+    return (fields or list(allowed)), None
+
+
+def load_order_items(order_ids):
+    """
+    Loads the line items (with item names) of many orders in one query.
+
+    Returns:
+        dict: order_id -> list of item dicts (ITEM_FIELDS), ordered by order_item_id.
+        None: If the query failed.
+    """
+    items = {order_id: [] for order_id in order_ids}
+    if not order_ids:
+        return items
+    sql = ORDER_ITEMS_SQL.format(placeholders=', '.join(['%s'] * len(order_ids)))
+    rows = execute_query(sql, tuple(order_ids))
+    if rows is None:
+        return None
+    # Sorted here: ORDER BY order_item_id is not covered by idx_orderitems_order and would filesort
+    for row in sorted(rows, key=lambda row: row['order_item_id']):
+        items[row['order_id']].append({field: plain_value(row[field]) for field in ITEM_FIELDS})
+    return items
+
+
+def serialize_orders(rows, fields):
+    """
+    Converts order rows into JSON-ready dicts limited to `fields`.
+
+    Line items are only queried when 'items' is among the fields.
+
+    Returns:
+        list: One dict per order, in the order of `rows`.
+        None: If the line items could not be loaded.
+    """
+    items = None
+    if 'items' in fields:
+        items = load_order_items([row['order_id'] for row in rows])
+        if items is None:
+            return None
+    orders = []
+    for row in rows:
+        order = {field: plain_value(row[field]) for field in fields if field != 'items'}
+        if items is not None:
+            order['items'] = items[row['order_id']]
+        orders.append(order)
+    return orders
@@ -0,0 +1,94 @@
+# utils/archive.py
+
+import os
+import time
+from datetime import datetime, timedelta
+
+from utils.db import execute_query, transaction
+
+# Finished orders are moved from Orders/OrderItems to OrdersArchive/OrderItemsArchive
+# (migrations/0004_order_archive.sql) so the tables the app works on stay small.
+# Each batch is one short transaction that copies and deletes the same locked rows,
+# so an interrupted run loses nothing and simply continues where it stopped when
+# started again. Archived orders stay counted in the dashboard summary tables, and the
+# DELETE from Orders bumps the customers' order versions (migrations/0008_order_versions.sql),
+# so the web workers' cached my_orders pages are rendered again.
+
+# Only orders in one of these statuses can be archived; they no longer change
+ARCHIVE_STATUSES = ('Completed', 'Cancelled')
+# Orders placed more than this many days ago are archived
+ARCHIVE_AFTER_DAYS = int(os.getenv('ARCHIVE_AFTER_DAYS', 180))
+
+ORDER_COLUMNS = "order_id, user_id, order_date, due_date, total_amount, order_status, special_instructions"
+ITEM_COLUMNS = "order_item_id, order_id, laundry_item_id, quantity, price_per_unit, total_price"
+
+
+def archive_cutoff(days=None):
+    """Returns the datetime before which finished orders are archived."""
+    return datetime.now() - timedelta(days=ARCHIVE_AFTER_DAYS if days is None else days)
+
+
+def count_archivable(cutoff):
+    """Returns the number of orders that would be archived for this cutoff (None on error)."""
+    row = execute_query(
+        "SELECT COUNT(*) AS n FROM Orders WHERE order_status IN (%s, %s) AND order_date < %s",
+        (*ARCHIVE_STATUSES, cutoff), fetch_one=True)
+    return row['n'] if row else None
+
+
+def archive_batch(status, cutoff, batch_size=1000):
+    """
+    Moves the oldest `batch_size` orders with `status` placed before `cutoff` into the archive.
+
+    The rows are selected through idx_orders_status_date and locked FOR UPDATE, so
+    a concurrent status change either finishes first or waits for the batch.
+
+    Returns:
+        int: Number of orders archived (0 when there is nothing left).
+
+    Raises:
+        TransactionError: If the batch failed (it was rolled back completely).
+    """
+    with transaction() as tx:
+        rows = tx.execute("""
+            SELECT order_id FROM Orders
+            WHERE order_status = %s AND order_date < %s
+            ORDER BY order_date, order_id
+            LIMIT %s
+            FOR UPDATE
+        """, (status, cutoff, batch_size), fetch_all=True)
+        if not rows:
+            return 0
+        order_ids = [row['order_id'] for row in rows]
+        in_sql = ', '.join(['%s'] * len(order_ids))
+        tx.execute(f"INSERT INTO OrdersArchive ({ORDER_COLUMNS}) "
+                   f"SELECT {ORDER_COLUMNS} FROM Orders WHERE order_id IN ({in_sql})", order_ids)
+        tx.execute(f"INSERT INTO OrderItemsArchive ({ITEM_COLUMNS}) "
+                   f"SELECT {ITEM_COLUMNS} FROM OrderItems WHERE order_id IN ({in_sql})", order_ids)
+        tx.execute(f"DELETE FROM OrderItems WHERE order_id IN ({in_sql})", order_ids)
+        tx.execute(f"DELETE FROM Orders WHERE order_id IN ({in_sql})", order_ids)
+    return len(rows)
+
+
+def archive_orders(cutoff, batch_size=1000, pause=0.5, max_batches=None):
+    """
+    Archives all finished orders placed before `cutoff`, one batch at a time.
+
+    Args:
+        cutoff (datetime): Orders placed before this are archived.
+        batch_size (int): Orders per transaction; small batches keep row locks short.
+        pause (float): Seconds to sleep between batches, leaving the database to the app.
+        max_batches (int, optional): Stop after this many batches (run again to continue).
+
+    Yields:
+        tuple: (status, orders archived in the batch) after each batch.
+    """
+    batches = 0
+    for status in ARCHIVE_STATUSES:
+        while max_batches is None or batches < max_batches:
+            moved = archive_batch(status, cutoff, batch_size)
+            batches += 1
+            yield status, moved
+            if moved < batch_size:
+                break
+            time.sleep(pause)
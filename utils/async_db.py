@@ -0,0 +1,123 @@
+# utils/async_db.py
+
+import asyncio
+import os
+import time
+import aiomysql
+from dotenv import load_dotenv
+
+from utils import metrics
+
+load_dotenv()
+
+# Async counterpart of utils/db.py for the ASGI serving mode (asgi.py). While a query
+# waits on MySQL the event loop serves other requests, so one process can hold many
+# slow requests at once instead of one per worker thread. The pool is configured
+# from the same DB_* / DB_POOL_* settings as the synchronous pool.
+
+_pool = None
+_pool_lock = asyncio.Lock()
+
+
+async def get_async_pool():
+    """Returns the process-wide aiomysql pool, creating it from .env settings on first use."""
+    global _pool
+    if _pool is None:
+        async with _pool_lock:
+            if _pool is None:
+                _pool = await aiomysql.create_pool(
+                    host=os.getenv('DB_HOST'),
+                    user=os.getenv('DB_USER'),
+                    password=os.getenv('DB_PASSWORD') or '',
+                    db=os.getenv('DB_NAME'),
+                    port=int(os.getenv('DB_PORT', 3306)),
+                    minsize=0, # Connections are opened on demand
+                    maxsize=int(os.getenv('DB_POOL_SIZE', 5)) + int(os.getenv('DB_POOL_MAX_OVERFLOW', 10)),
+                    pool_recycle=int(float(os.getenv('DB_POOL_RECYCLE', 3600))),
+                    cursorclass=aiomysql.DictCursor,
+                    autocommit=False,
+                )
+    return _pool
+
+
+async def close_async_pool():
+    """Closes all pooled connections (called when the ASGI server shuts down)."""
+    global _pool
+    if _pool is not None:
+        pool, _pool = _pool, None
+        pool.close()
+        await pool.wait_closed()
+
+
+def async_pool_stats():
+    """Returns usage statistics for the async pool (zeros before it is created)."""
+    if _pool is None:
+        return {'size': 0, 'idle': 0, 'max_size': 0}
+    return {'size': _pool.size, 'idle': _pool.freesize, 'max_size': _pool.maxsize}
+
+
+async def async_execute_query(query, params=None, fetch_one=False, is_commit=False):
+    """
+    Executes a given SQL query without blocking the event loop.
+
+    Same arguments and return values as `utils.db.execute_query`.
+
+    Returns:
+        list: A list of dictionaries for SELECT queries (or a single dict if fetch_one=True).
+        int: The last inserted row ID or number of affected rows for commit operations.
+        None: If an error occurs or the connection fails.
+    """
+    try:
+        pool = await get_async_pool()
+        started = time.perf_counter()
+        try:
+            conn = await asyncio.wait_for(pool.acquire(), float(os.getenv('DB_POOL_TIMEOUT', 30)))
+        finally:
+            metrics.record_connect(time.perf_counter() - started)
+    except (asyncio.TimeoutError, OSError, aiomysql.MySQLError) as e:
+        print(f"Database connection could not be established: {e}")
+        return None
+
+    result = None
+    discard_conn = True # Until the statement finished cleanly (also covers a cancelled request)
+    try:
+        async with conn.cursor() as cursor:
+            started = time.perf_counter()
+            await cursor.execute(query, params or ())
+
+            if is_commit:
+                await conn.commit()
+                rows = cursor.rowcount
+                result = cursor.lastrowid or cursor.rowcount
+            elif fetch_one:
+                result = await cursor.fetchone()
+                rows = 1 if result else 0
+            else:
+                result = list(await cursor.fetchall())
+                rows = len(result)
+            # End the (read) transaction so the next checkout sees fresh data
+            await conn.rollback()
+            discard_conn = False
+
+            metrics.record_query(query, time.perf_counter() - started, rows)
+
+    except aiomysql.MySQLError as err:
+        print(f"Database Query Error: {err}")
+        print(f"Query attempted: {query}")
+        print(f"Params used: {params}")
+        result = None
+        try:
+            await conn.rollback()
+            discard_conn = False
+        except aiomysql.MySQLError as rollback_err:
+            print(f"Error during rollback: {rollback_err}")
+
+    except Exception as e:
+        print(f"An unexpected error occurred during DB operation: {e}")
+        result = None
+
+    finally:
+        if discard_conn:
+            conn.close() # Closed connections are dropped by the pool instead of reused
+        pool.release(conn)
+    return result
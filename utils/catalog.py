@@ -0,0 +1,101 @@
+# utils/catalog.py
+
+import asyncio
+import os
+import threading
+import time
+
+from utils.db import execute_query
+
+# The LaundryItems catalog almost never changes, so each process keeps it in memory.
+# When the TTL expires only the version stamp in CacheVersions is read (a primary key
+# lookup); the full catalog is re-read only if the version changed. A price change is
+# therefore visible in every worker process after at most CATALOG_CACHE_TTL seconds.
+CATALOG_CACHE_TTL = float(os.getenv('CATALOG_CACHE_TTL', 60))
+
+ITEMS_SQL = "SELECT laundry_item_id, name, base_price, category FROM LaundryItems ORDER BY name"
+VERSION_SQL = "SELECT version FROM CacheVersions WHERE name = 'catalog'"
+BUMP_VERSION_SQL = "UPDATE CacheVersions SET version = version + 1 WHERE name = 'catalog'"
+
+_lock = threading.Lock()
+_items = None        # tuple of item dicts; treat as read-only
+_version = None      # CacheVersions.version the cached items belong to
+_expires_at = 0.0
+
+
+def _read_version():
+    row = execute_query(VERSION_SQL, fetch_one=True)
+    return row['version'] if row else None
+
+
+def get_laundry_items():
+    """
+    Returns the laundry item catalog from the in-process cache.
+
+    The returned tuple is a consistent snapshot: use the same snapshot both to
+    render prices and to compute order totals. Do not modify the dicts.
+
+    Returns:
+        tuple: Item dicts (laundry_item_id, name, base_price, category) ordered by name.
+        None: If the catalog could not be loaded and nothing is cached.
+    """
+    global _items, _version, _expires_at
+
+    if _items is not None and time.monotonic() < _expires_at:
+        return _items
+
+    # Only one thread per process refreshes; the others wait and reuse its result
+    with _lock:
+        if _items is not None and time.monotonic() < _expires_at:
+            return _items
+
+        version = _read_version()
+        if _items is not None and version is not None and version == _version:
+            _expires_at = time.monotonic() + CATALOG_CACHE_TTL
+            return _items
+
+        rows = execute_query(ITEMS_SQL)
+        if rows is None:
+            # Serve the stale snapshot rather than failing if the refresh fails
+            return _items
+
+        _items = tuple(rows)
+        _version = version
+        _expires_at = time.monotonic() + CATALOG_CACHE_TTL
+        return _items
+
+
+
+async def get_laundry_items_async():
+    """
+    Async variant of `get_laundry_items` for the ASGI serving mode (asgi.py).
+
+    Cache hits return immediately; a refresh (at most once per TTL) runs the
+    synchronous loader in a worker thread so the event loop is never blocked.
+    """
+    if _items is not None and time.monotonic() < _expires_at:
+        return _items
+    return await asyncio.to_thread(get_laundry_items)
+
+
+def catalog_version():
+    """Returns the version stamp of the cached catalog (None if unknown or not loaded yet)."""
+    return _version
+
+
+def invalidate_catalog(broadcast=True):
+    """
+    Drops the cached catalog so the next call reloads it.
+
+    Args:
+        broadcast (bool): Also bump the shared version stamp so other worker
+            processes reload at their next TTL expiry. Changes made directly to
+            LaundryItems bump it automatically (see migrations/0002_catalog_version.sql).
+    """
+    global _items, _version, _expires_at
+    with _lock:
+        _items = None
+        _version = None
+        _expires_at = 0.0
+    if broadcast:
+        execute_query(BUMP_VERSION_SQL, is_commit=True)
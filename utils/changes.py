@@ -0,0 +1,166 @@
+# utils/changes.py
+
+import os
+import json
+import time
+from datetime import datetime, timedelta
+
+from utils.db import execute_query
+
+# Order change log (migrations/0005_order_changes.sql). Every transaction that creates
+# or updates orders also inserts one OrderChanges row per order, so "what changed after
+# change N" is a primary key range scan however many orders exist. The admin dashboard
+# follows the log over server-sent events (/admin/changes/stream) and patches its rows.
+
+# Seconds between polls of an open stream, and between keep-alive comments while idle
+CHANGES_POLL_SECONDS = float(os.getenv('CHANGES_POLL_SECONDS', 2))
+CHANGES_HEARTBEAT_SECONDS = float(os.getenv('CHANGES_HEARTBEAT_SECONDS', 15))
+# A stream is closed after this long; the browser reconnects with its Last-Event-ID
+CHANGES_STREAM_SECONDS = float(os.getenv('CHANGES_STREAM_SECONDS', 300))
+# prune_changes.py deletes changes older than this
+CHANGE_LOG_DAYS = int(os.getenv('CHANGE_LOG_DAYS', 7))
+# Changes read per poll; a client that is further behind catches up over several polls
+CHANGES_BATCH_SIZE = 200
+
+# Change IDs are handed out when a row is inserted but become visible when its
+# transaction commits, so a lower ID can appear after a higher one was read. Skipped
+# IDs are looked for again for this many seconds (most are just rolled back inserts).
+GAP_SECONDS = 10
+MAX_GAP_IDS = 1000
+
+
+def record_changes(tx, order_ids, change_type):
+    """Logs a change of each order; call inside the transaction that changes them."""
+    tx.executemany("INSERT INTO OrderChanges (order_id, change_type) VALUES (%s, %s)",
+                   [(order_id, change_type) for order_id in sorted(order_ids)])
+
+
+LATEST_CHANGE_SQL = "SELECT COALESCE(MAX(change_id), 0) AS change_id FROM OrderChanges"
+
+
+def latest_change_id():
+    """Returns the newest change ID (0 if there is none or the query failed)."""
+    row = execute_query(LATEST_CHANGE_SQL, fetch_one=True)
+    return row['change_id'] if row else 0
+
+
+# The orders are joined in their current state (with the columns of admin_orders_query),
+# so a change of an order that has since been archived comes back with NULL columns
+CHANGES_SQL = """
+    SELECT c.change_id, c.order_id, c.change_type,
+           o.order_date, o.total_amount, o.order_status, o.due_date,
+           u.user_id, u.first_name, u.last_name, u.email
+    FROM OrderChanges c
+    LEFT JOIN Orders o ON o.order_id = c.order_id
+    LEFT JOIN Users u ON u.user_id = o.user_id
+    WHERE {where_sql}
+    ORDER BY c.change_id
+    LIMIT %s
+"""
+
+
+class ChangeCursor:
+    """
+    The position of one stream in the change log.
+
+    Args:
+        last_id (int): The last change the client has seen.
+    """
+
+    def __init__(self, last_id=0):
+        self.last_id = last_id
+        self._gaps = {} # skipped change_id -> monotonic time until which it is looked for
+
+    def query(self, limit=CHANGES_BATCH_SIZE):
+        """Returns (sql, params) reading the changes after last_id and any outstanding gaps."""
+        now = time.monotonic()
+        self._gaps = {change_id: until for change_id, until in self._gaps.items() if until > now}
+        where_sql = "c.change_id > %s"
+        params = [self.last_id]
+        if self._gaps:
+            gap_ids = sorted(self._gaps)
+            where_sql = f"(c.change_id > %s OR c.change_id IN ({', '.join(['%s'] * len(gap_ids))}))"
+            params.extend(gap_ids)
+        params.append(limit)
+        return CHANGES_SQL.format(where_sql=where_sql), tuple(params)
+
+    def advance(self, rows):
+        """
+        Moves the cursor past the rows of one poll.
+
+        Returns:
+            list: One row per changed order (its latest change), in change order.
+                change_type is 'created' if any of the order's changes was its creation.
+        """
+        until = time.monotonic() + GAP_SECONDS
+        latest = {}
+        created = set()
+        for row in rows:
+            change_id = row['change_id']
+            if change_id <= self.last_id:
+                self._gaps.pop(change_id, None)
+            else:
+                if change_id - self.last_id - 1 <= MAX_GAP_IDS - len(self._gaps):
+                    for missing in range(self.last_id + 1, change_id):
+                        self._gaps[missing] = until
+                self.last_id = change_id
+            if row['change_type'] == 'created':
+                created.add(row['order_id'])
+            latest.pop(row['order_id'], None)
+            latest[row['order_id']] = row
+        orders = sorted(latest.values(), key=lambda row: row['change_id'])
+        for row in orders:
+            if row['order_id'] in created:
+                row['change_type'] = 'created'
+        return orders
+
+
+def parse_last_event_id(value):
+    """Parses a Last-Event-ID header or ?after= value; returns None if it is not a change ID."""
+    if value and str(value).isdigit():
+        return int(value)
+    return None
+
+
+def format_events(orders, rendered_rows, last_id):
+    """
+    Formats one poll's changes as server-sent events named "order".
+
+    Each event's data is {"order_id", "change_type", "order_status", "row"}, where row is
+    the rendered dashboard row (null if the order no longer exists in Orders). Only the
+    last event carries an id, the cursor position the browser resumes from.
+    """
+    events = []
+    for i, order in enumerate(orders):
+        data = {'order_id': order['order_id'], 'change_type': order['change_type'],
+                'order_status': order['order_status'], 'row': rendered_rows.get(order['order_id'])}
+        lines = ['event: order', f'data: {json.dumps(data)}']
+        if i == len(orders) - 1:
+            lines.insert(0, f'id: {last_id}')
+        events.append('\n'.join(lines) + '\n\n')
+    return ''.join(events)
+
+
+# Sent first: how long the browser waits before reconnecting (ms)
+STREAM_PREAMBLE = f"retry: {int(CHANGES_POLL_SECONDS * 1000) + 1000}\n\n"
+HEARTBEAT = ": keep-alive\n\n"
+
+
+def prune_changes(days=None, batch_size=5000, pause=0.1):
+    """
+    Deletes changes older than `days` (default CHANGE_LOG_DAYS) in batches.
+
+    Returns:
+        int: Number of deleted changes, or None if a batch failed.
+    """
+    cutoff = datetime.now() - timedelta(days=CHANGE_LOG_DAYS if days is None else days)
+    total = 0
+    while True:
+        deleted = execute_query("DELETE FROM OrderChanges WHERE changed_at < %s LIMIT %s",
+                                (cutoff, batch_size), is_commit=True)
+        if deleted is None:
+            return None
+        total += deleted
+        if deleted < batch_size:
+            return total
+        time.sleep(pause)
@@ -1,24 +1,40 @@
 # utils/db.py
 
 import mysql.connector
+import contextvars
 import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import partial
 from dotenv import load_dotenv
 
+from utils.pool import ConnectionPool, PoolTimeoutError
+from utils import metrics
+
 # Load environment variables from .env file in the project root
 # Ensure your .env file is in the main project directory (e.g., simple-laundry-flask/)
 # Adjust path if .env is elsewhere, e.g., load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', '.env'))
 load_dotenv()
 
-def get_db_connection():
-    """Establishes and returns a connection to the MySQL database."""
+def get_db_connection(host=None, port=None, timeout=None):
+    """
+    Establishes and returns a connection to the MySQL database.
+
+    Connects to DB_HOST/DB_PORT (the primary) unless another endpoint, e.g. a read
+    replica, is given. Credentials and database name are the same for all endpoints.
+    `timeout` (seconds) bounds connecting and every query on the connection.
+    """
     connection = None
+    options = {'connection_timeout': timeout} if timeout else {}
     try:
         connection = mysql.connector.connect(
-            host=os.getenv('DB_HOST'),
+            host=host or os.getenv('DB_HOST'),
             user=os.getenv('DB_USER'),
             password=os.getenv('DB_PASSWORD'),
             database=os.getenv('DB_NAME'),
-            port=os.getenv('DB_PORT', 3306) # Default to 3306 if not specified
+            port=port or os.getenv('DB_PORT', 3306), # Default to 3306 if not specified
+            **options
         )
         # print("Database connection successful") # Uncomment for debugging connection
     except mysql.connector.Error as err:
@@ -27,6 +43,257 @@ def get_db_connection():
         # raise err
     return connection # Returns None if connection failed
 
+# --- Connection Pool ---
+# A single pool per process, created lazily on first use so that importing this
+# module (e.g. from create_admin.py) does not open any connections.
+_pool = None
+_pool_lock = threading.Lock()
+
+def _new_pool(connect):
+    return ConnectionPool(
+        connect,
+        pool_size=int(os.getenv('DB_POOL_SIZE', 5)),
+        max_overflow=int(os.getenv('DB_POOL_MAX_OVERFLOW', 10)),
+        timeout=float(os.getenv('DB_POOL_TIMEOUT', 30)),
+        recycle=float(os.getenv('DB_POOL_RECYCLE', 3600)),
+        pre_ping=os.getenv('DB_POOL_PRE_PING', '1') == '1',
+        ping_after=float(os.getenv('DB_POOL_PING_AFTER', 30)),
+    )
+
+def get_pool():
+    """Returns the process-wide connection pool (primary), creating it from .env settings on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = _new_pool(get_db_connection)
+    return _pool
+
+def pool_stats():
+    """Returns usage statistics (in use, idle, wait times, ...) for the connection pool."""
+    return get_pool().stats()
+
+def _acquire(pool):
+    """Checks out a pooled connection and records the time it took."""
+    started = time.perf_counter()
+    try:
+        return pool.acquire()
+    finally:
+        metrics.record_connect(time.perf_counter() - started)
+
+# --- Read replicas ---
+# With DB_REPLICA_HOSTS set (comma separated host[:port]), plain SELECTs from execute_query
+# and stream_query are spread round-robin over the replicas, each with its own pool.
+# Writes and transactions always go to the primary. A replica that cannot be reached, or
+# lags more than DB_REPLICA_MAX_LAG seconds behind, is skipped for DB_REPLICA_RETRY
+# seconds; if no replica is usable, reads fall back to the primary.
+# Lag is measured by a background thread on its own connection per replica, so routing a
+# read only looks at the last measurement and never waits for SHOW REPLICA STATUS.
+REPLICA_RETRY_SECONDS = float(os.getenv('DB_REPLICA_RETRY', 30))
+REPLICA_MAX_LAG = float(os.getenv('DB_REPLICA_MAX_LAG', 0)) # 0 disables the lag check
+REPLICA_CHECK_INTERVAL = max(float(os.getenv('DB_REPLICA_CHECK_INTERVAL', 5)), 0.5)
+REPLICA_CHECK_TIMEOUT = float(os.getenv('DB_REPLICA_CHECK_TIMEOUT', 2))
+# A replica whose last lag measurement is older than this is not used (e.g. the check hangs)
+REPLICA_LAG_MAX_AGE = 3 * REPLICA_CHECK_INTERVAL + REPLICA_CHECK_TIMEOUT
+
+# Per request (or thread/task) routing state, see begin_request()
+_read_from_primary = contextvars.ContextVar('read_from_primary', default=False)
+_wrote_to_primary = contextvars.ContextVar('wrote_to_primary', default=False)
+# [replica] during a request: all its reads use the replica chosen for the first one
+_request_replica = contextvars.ContextVar('request_replica', default=None)
+
+
+def parse_endpoints(value):
+    """Parses 'host1[:port],host2[:port]' into a list of (host, port) pairs."""
+    endpoints = []
+    for part in (value or '').split(','):
+        part = part.strip()
+        if not part:
+            continue
+        host, _, port = part.partition(':')
+        endpoints.append((host, int(port) if port else int(os.getenv('DB_PORT', 3306))))
+    return endpoints
+
+
+def _replica_lag(conn):
+    """
+    Returns the replication delay of the server behind `conn` in seconds.
+
+    None means replication is not running. A server that is not configured as a
+    replica at all (e.g. a second local instance standing in for one) reports 0.
+    """
+    cursor = conn.cursor(dictionary=True, buffered=True)
+    try:
+        try:
+            cursor.execute("SHOW REPLICA STATUS")
+        except mysql.connector.Error:
+            cursor.execute("SHOW SLAVE STATUS") # MySQL < 8.0.22 and MariaDB
+        row = cursor.fetchone()
+    finally:
+        cursor.close()
+    if not row:
+        return 0
+    return row.get('Seconds_Behind_Source', row.get('Seconds_Behind_Master'))
+
+
+class Replica:
+    """One replica endpoint with its connection pool and health state."""
+
+    def __init__(self, host, port, pool):
+        self.host = host
+        self.port = port
+        self.pool = pool
+        self.down_until = 0.0
+        self.checked_at = 0.0
+        self.lag = None
+        self.monitor_conn = None # Used by the lag monitor thread only
+
+    @property
+    def name(self):
+        return f'{self.host}:{self.port}'
+
+
+class ReplicaRouter:
+    """Chooses a healthy replica for each read, round-robin."""
+
+    def __init__(self, replicas):
+        self.replicas = replicas
+        self._next = 0
+        self._lock = threading.Lock()
+        if REPLICA_MAX_LAG:
+            threading.Thread(target=self._monitor, name='replica-lag-monitor', daemon=True).start()
+
+    def choose(self):
+        """Returns the next healthy replica, or None if none is available."""
+        with self._lock:
+            start = self._next
+            self._next = (self._next + 1) % len(self.replicas)
+        for i in range(len(self.replicas)):
+            replica = self.replicas[(start + i) % len(self.replicas)]
+            if self.is_usable(replica):
+                return replica
+        return None
+
+    def is_usable(self, replica):
+        """False while the replica is marked down or its lag is unknown."""
+        now = time.monotonic()
+        if replica.down_until > now:
+            return False
+        # Lag unknown: not measured yet, or the monitor is stuck
+        return not (REPLICA_MAX_LAG and now - replica.checked_at > REPLICA_LAG_MAX_AGE)
+
+    def _monitor(self):
+        """Measures the lag of every replica each REPLICA_CHECK_INTERVAL seconds (background thread)."""
+        while True:
+            for replica in self.replicas:
+                if replica.down_until <= time.monotonic():
+                    self._check_lag(replica)
+            time.sleep(REPLICA_CHECK_INTERVAL)
+
+    def _check_lag(self, replica):
+        try:
+            if replica.monitor_conn is None:
+                replica.monitor_conn = get_db_connection(replica.host, replica.port, timeout=REPLICA_CHECK_TIMEOUT)
+                if replica.monitor_conn is None:
+                    raise ConnectionError("connection failed")
+            lag = _replica_lag(replica.monitor_conn)
+        except Exception as e: # Anything else would end the monitor thread
+            if replica.monitor_conn is not None:
+                try:
+                    replica.monitor_conn.close()
+                except Exception:
+                    pass
+                replica.monitor_conn = None
+            self.mark_down(replica, e)
+            return
+        replica.lag = lag
+        replica.checked_at = time.monotonic()
+        if lag is None or lag > REPLICA_MAX_LAG:
+            self.mark_down(replica, f"replication lag {lag}s")
+
+    def mark_down(self, replica, reason):
+        replica.down_until = time.monotonic() + REPLICA_RETRY_SECONDS
+        print(f"Read replica {replica.name} unavailable ({reason}), using other endpoints "
+              f"for {REPLICA_RETRY_SECONDS:g}s.")
+
+    def stats(self):
+        now = time.monotonic()
+        return [dict(endpoint=r.name, healthy=r.down_until <= now, lag=r.lag, **r.pool.stats())
+                for r in self.replicas]
+
+
+_router = None
+_router_loaded = False
+
+def get_replica_router():
+    """Returns the router for DB_REPLICA_HOSTS, or None if no replicas are configured."""
+    global _router, _router_loaded
+    if not _router_loaded:
+        with _pool_lock:
+            if not _router_loaded:
+                endpoints = parse_endpoints(os.getenv('DB_REPLICA_HOSTS'))
+                if endpoints:
+                    _router = ReplicaRouter([Replica(host, port, _new_pool(partial(get_db_connection, host, port)))
+                                             for host, port in endpoints])
+                _router_loaded = True
+    return _router
+
+def replica_stats():
+    """Returns health and pool statistics per replica (empty without replicas)."""
+    router = get_replica_router()
+    return router.stats() if router else []
+
+def begin_request(read_from_primary=False):
+    """
+    Resets the routing state at the start of a request.
+
+    Args:
+        read_from_primary (bool): Send this request's reads to the primary too, e.g.
+            right after the same user wrote something (read-your-writes).
+    """
+    _read_from_primary.set(read_from_primary)
+    _wrote_to_primary.set(False)
+    _request_replica.set([None])
+
+def wrote_to_primary():
+    """True if something was committed since begin_request() (used to pin the session's reads)."""
+    return _wrote_to_primary.get()
+
+def _is_read(query):
+    statement = query.lstrip()[:6].upper()
+    return statement == 'SELECT' and 'FOR UPDATE' not in query.upper()
+
+def _checkout(query, is_commit=False):
+    """
+    Returns (pool, connection): a replica for plain reads when one is usable, else the primary.
+
+    Within a request every read goes to the same server, so a later read never sees
+    older data than an earlier one (e.g. my_orders' version stamp and its orders). If
+    the request's replica becomes unusable, its remaining reads go to the primary.
+    """
+    if not is_commit and not _read_from_primary.get() and _is_read(query):
+        router = get_replica_router()
+        if router:
+            pinned = _request_replica.get()
+            if pinned is None or pinned[0] is None:
+                replica = router.choose()
+                if pinned is not None:
+                    pinned[0] = replica
+            else:
+                replica = pinned[0] if router.is_usable(pinned[0]) else None
+            if replica:
+                try:
+                    return replica.pool, _acquire(replica.pool)
+                except ConnectionError as e:
+                    router.mark_down(replica, e)
+                except PoolTimeoutError:
+                    pass # Busy rather than down: use the primary for this read
+            if pinned is not None:
+                # The primary is never behind what this request has read so far
+                _read_from_primary.set(True)
+    pool = get_pool()
+    return pool, _acquire(pool)
+
 def execute_query(query, params=None, fetch_one=False, is_commit=False):
     """
     Executes a given SQL query with optional parameters.
@@ -42,23 +309,29 @@ def execute_query(query, params=None, fetch_one=False, is_commit=False):
         int: The last inserted row ID or number of affected rows for commit operations.
         None: If an error occurs or the connection fails.
     """
+    pool = None
     conn = None
     cursor = None
     result = None
     error_occurred = False
+    discard_conn = False
 
     try:
-        conn = get_db_connection()
-        if conn and conn.is_connected():
+        # Reuses an idle pooled connection when available (a replica's for plain reads)
+        pool, conn = _checkout(query, is_commit)
+        if conn:
             # Using dictionary=True makes fetching results by column name easy
             cursor = conn.cursor(dictionary=True, buffered=True) # Added buffered=True for potential fetch after commit/read issues
 
             # Ensure params is a tuple or None
+            started = time.perf_counter()
             cursor.execute(query, params or ())
 
             if is_commit:
                 # --- Handle INSERT, UPDATE, DELETE ---
                 conn.commit()
+                _wrote_to_primary.set(True)
+                rows = cursor.rowcount
                 if cursor.lastrowid:
                     result = cursor.lastrowid # Return ID of inserted row
                     # print(f"DB Commit Successful - Last Row ID: {result}") # Debug log
@@ -68,11 +341,16 @@ def execute_query(query, params=None, fetch_one=False, is_commit=False):
             elif fetch_one:
                 # --- Handle SELECT single row ---
                 result = cursor.fetchone()
+                rows = 1 if result else 0
                 # print(f"DB Fetch One Result: {result}") # Debug log
             else:
                 # --- Handle SELECT multiple rows ---
                 result = cursor.fetchall()
+                rows = len(result)
                 # print(f"DB Fetch All Result Count: {len(result) if result else 0}") # Debug log
+
+            # Per-request query accounting and slow query log (utils/metrics.py)
+            metrics.record_query(query, time.perf_counter() - started, rows)
         else:
             print("Database connection could not be established.")
             error_occurred = True
@@ -90,24 +368,190 @@ def execute_query(query, params=None, fetch_one=False, is_commit=False):
                 print(f"Error during rollback: {rollback_err}")
         result = None # Ensure result is None on error
 
+    except (PoolTimeoutError, ConnectionError) as e:
+        print(f"Database connection could not be established: {e}")
+        error_occurred = True
+        result = None
+
     except Exception as e: # Catch other potential errors
          print(f"An unexpected error occurred during DB operation: {e}")
          error_occurred = True
+         discard_conn = True
          result = None
 
     finally:
         if cursor:
-            cursor.close()
-        if conn and conn.is_connected():
-            conn.close()
-            # print("Database connection closed.") # Debug log
+            try:
+                cursor.close()
+            except mysql.connector.Error:
+                discard_conn = True
+        if conn:
+            pool.release(conn, discard=discard_conn) # Return to the pool instead of closing
+            # print("Database connection returned to pool.") # Debug log
 
         # Final check - if an error happened, ensure None is returned
         if error_occurred:
             return None
         return result
 
-# Example Usage (Can be run directly for testing: python utils/db.py)
+# --- Streaming reads ---
+def stream_query(query, params=None, chunk_size=1000):
+    """
+    Runs a SELECT and yields its rows one by one without loading the whole result.
+
+    Uses an unbuffered cursor, so MySQL sends rows as they are read and only
+    `chunk_size` rows are held in memory at a time. The pooled connection is
+    busy until the generator is exhausted or closed; if it is closed early the
+    connection is discarded rather than returned with unread rows.
+
+    Args:
+        query (str): The SQL query string (use %s for placeholders).
+        params (tuple, optional): Parameters to substitute into the query.
+        chunk_size (int, optional): Rows fetched from the server per round. Defaults to 1000.
+
+    Yields:
+        dict: One row per result row.
+
+    Raises:
+        mysql.connector.Error, PoolTimeoutError, ConnectionError: Errors are not
+        swallowed here because a stream cannot return None half way through.
+    """
+    pool, conn = _checkout(query)
+    cursor = None
+    finished = False
+    started = time.perf_counter()
+    row_count = 0
+    try:
+        cursor = conn.cursor(dictionary=True, buffered=False)
+        cursor.execute(query, params or ())
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            row_count += len(rows)
+            yield from rows
+        finished = True
+        # Includes the time the consumer spent between chunks
+        metrics.record_query(query, time.perf_counter() - started, row_count)
+    except mysql.connector.Error as err:
+        print(f"Database Stream Error: {err}")
+        print(f"Query attempted: {query}")
+        print(f"Params used: {params}")
+        raise
+    finally:
+        if cursor:
+            try:
+                cursor.close()
+            except mysql.connector.Error:
+                finished = False
+        pool.release(conn, discard=not finished)
+
+# --- Transactions (unit of work) ---
+class TransactionError(Exception):
+    """Raised when a transaction fails; all of its statements have been rolled back."""
+
+
+class Transaction:
+    """
+    A unit of work bound to one pooled connection. Created by `transaction()`.
+
+    Statements run on the same connection and nothing is committed until the
+    `with` block exits without an error.
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.cursor = conn.cursor(dictionary=True, buffered=True)
+
+    def execute(self, query, params=None, fetch_one=False, fetch_all=False):
+        """
+        Executes one statement inside the transaction.
+
+        Returns:
+            dict/list: The first row (fetch_one) or all rows (fetch_all) for SELECT queries.
+            int: The last inserted row ID, or the number of affected rows otherwise.
+        """
+        started = time.perf_counter()
+        self.cursor.execute(query, params or ())
+        if fetch_one:
+            result = self.cursor.fetchone()
+            rows = 1 if result else 0
+        elif fetch_all:
+            result = self.cursor.fetchall()
+            rows = len(result)
+        else:
+            result = self.cursor.lastrowid or self.cursor.rowcount
+            rows = self.cursor.rowcount
+        metrics.record_query(query, time.perf_counter() - started, rows)
+        return result
+
+    def executemany(self, query, seq_params):
+        """
+        Executes a statement for every parameter tuple in `seq_params`.
+
+        For `INSERT ... VALUES` statements mysql.connector sends all rows as a
+        single multi-row INSERT, so N rows cost one round trip.
+
+        Returns:
+            int: The number of affected rows.
+        """
+        seq_params = list(seq_params)
+        if not seq_params:
+            return 0
+        started = time.perf_counter()
+        self.cursor.executemany(query, seq_params)
+        metrics.record_query(query, time.perf_counter() - started, self.cursor.rowcount)
+        return self.cursor.rowcount
+
+
+@contextmanager
+def transaction():
+    """
+    Runs a block of statements in a single transaction on one pooled connection.
+
+    Commits when the block finishes, rolls everything back if any statement
+    (or the block itself) raises. Database failures are re-raised as
+    TransactionError so callers only need to handle one exception type.
+
+    Example:
+        with transaction() as tx:
+            order_id = tx.execute("INSERT INTO Orders (...) VALUES (...)", params)
+            tx.executemany("INSERT INTO OrderItems (...) VALUES (...)", rows)
+    """
+    pool = get_pool()
+    try:
+        conn = _acquire(pool)
+    except (PoolTimeoutError, ConnectionError) as e:
+        print(f"Database connection could not be established: {e}")
+        raise TransactionError(str(e)) from e
+
+    tx = None
+    discard_conn = False
+    try:
+        tx = Transaction(conn)
+        yield tx
+        conn.commit()
+        _wrote_to_primary.set(True)
+    except Exception as e:
+        try:
+            conn.rollback()
+            print("Transaction rolled back due to error.")
+        except mysql.connector.Error as rollback_err:
+            print(f"Error during rollback: {rollback_err}")
+            discard_conn = True
+        if isinstance(e, mysql.connector.Error):
+            print(f"Database Transaction Error: {e}")
+            raise TransactionError(str(e)) from e
+        raise
+    finally:
+        if tx:
+            try:
+                tx.cursor.close()
+            except mysql.connector.Error:
+                discard_conn = True
+        pool.release(conn, discard=discard_conn)
+
+# Example Usage (Can be run directly for testing: python -m utils.db)
 if __name__ == "__main__":
     print("Testing database connection...")
     test_conn = get_db_connection()
@@ -117,6 +561,10 @@ if __name__ == "__main__":
     else:
         print("Connection test failed.")
 
+    print("\nTesting pooled query...")
+    print(f"SELECT 1 -> {execute_query('SELECT 1 AS ok', fetch_one=True)}")
+    print(f"Pool stats: {pool_stats()}")
+
     print("\nTesting SELECT query (fetching all users)...")
     # Make sure the 'Users' table exists if you run this test
     # users = execute_query("SELECT user_id, username, email FROM Users LIMIT 5")
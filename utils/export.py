@@ -0,0 +1,114 @@
+# utils/export.py
+
+import io
+import csv
+import json
+from decimal import Decimal
+
+from utils.db import stream_query
+from utils.orders import order_filter_conditions
+
+# Orders joined with their line items, read in (order_date, order_id) order so the
+# scan follows idx_orders_date_id / idx_orders_status_date without a filesort, and
+# all rows of one order arrive next to each other.
+EXPORT_SQL = """
+    SELECT o.order_id, o.user_id, u.email, o.order_date, o.due_date, o.order_status,
+           o.total_amount, o.special_instructions,
+           oi.order_item_id, oi.laundry_item_id, li.name AS item_name,
+           oi.quantity, oi.price_per_unit, oi.total_price
+    FROM Orders o
+    JOIN Users u ON o.user_id = u.user_id
+    LEFT JOIN OrderItems oi ON oi.order_id = o.order_id
+    LEFT JOIN LaundryItems li ON li.laundry_item_id = oi.laundry_item_id
+    {where_sql}
+    ORDER BY o.order_date, o.order_id
+"""
+
+ORDER_FIELDS = ['order_id', 'user_id', 'email', 'order_date', 'due_date', 'order_status',
+                'total_amount', 'special_instructions']
+ITEM_FIELDS = ['order_item_id', 'laundry_item_id', 'item_name', 'quantity',
+               'price_per_unit', 'total_price']
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+# Number of CSV lines collected before a chunk is handed to the response
+CSV_LINES_PER_CHUNK = 500
+
+
+def plain_value(value):
+    """Converts DB values to JSON/CSV friendly ones (money stays exact as a string)."""
+    if value is None:
+        return None
+    if isinstance(value, Decimal):
+        return str(value)
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+def iter_export_rows(filters, chunk_size=1000):
+    """Yields joined order/item rows matching `filters` (see utils.orders.parse_order_filters)."""
+    conditions, params = order_filter_conditions(filters)
+    where_sql = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    return stream_query(EXPORT_SQL.format(where_sql=where_sql), tuple(params), chunk_size=chunk_size)
+
+
+def group_orders(rows):
+    """
+    Folds consecutive joined rows into one dict per order with an `items` list.
+
+    Only the current order is held in memory, so this works for any number of orders.
+    """
+    current = None
+    for row in rows:
+        if current is None or row['order_id'] != current['order_id']:
+            if current is not None:
+                yield current
+            current = {field: plain_value(row[field]) for field in ORDER_FIELDS}
+            current['items'] = []
+        if row['order_item_id'] is not None:
+            current['items'].append({field: plain_value(row[field]) for field in ITEM_FIELDS})
+    if current is not None:
+        yield current
+
+
+def generate_csv(rows):
+    """Yields CSV text in chunks: a header, then one line per order item (order columns repeated)."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(ORDER_FIELDS + ITEM_FIELDS)
+    lines = 1
+    for row in rows:
+        writer.writerow([plain_value(row[field]) for field in ORDER_FIELDS + ITEM_FIELDS])
+        lines += 1
+        if lines >= CSV_LINES_PER_CHUNK:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            lines = 0
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def generate_ndjson(rows):
+    """Yields one JSON document per order (with its items), one per line."""
+    for order in group_orders(rows):
+        yield json.dumps(order, separators=(',', ':')) + '\n'
+
+
+def generate_export(filters, export_format, chunk_size=1000):
+    """
+    Returns a generator of text chunks for the requested export format.
+
+    Raises:
+        ValueError: If the format is not supported.
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f'Unsupported export format "{export_format}". Use one of: {", ".join(EXPORT_FORMATS)}.')
+    rows = iter_export_rows(filters, chunk_size=chunk_size)
+    if export_format == 'csv':
+        return generate_csv(rows)
+    return generate_ndjson(rows)
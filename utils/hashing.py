@@ -0,0 +1,143 @@
+# utils/hashing.py
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from flask_bcrypt import Bcrypt
+
+
+class HasherOverloadedError(Exception):
+    """Raised when too many hashing jobs are already running or queued."""
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt hashing and checking on a bounded pool of worker threads.
+
+    bcrypt releases the GIL while it works, so a few workers use the CPU
+    cores without blocking the rest of the process. At most
+    `max_workers + max_queue` jobs are accepted at a time; beyond that
+    callers get HasherOverloadedError immediately instead of piling up
+    behind a login burst.
+
+    Args:
+        rounds (int): bcrypt cost factor for new hashes (BCRYPT_LOG_ROUNDS).
+        max_workers (int): Number of hashing threads.
+        max_queue (int): Jobs allowed to wait for a free worker.
+        timeout (float): Seconds a caller waits for its result before giving up.
+    """
+
+    def __init__(self, rounds=12, max_workers=2, max_queue=8, timeout=10.0):
+        self.rounds = int(rounds)
+        self.max_workers = max(int(max_workers), 1)
+        self.max_queue = max(int(max_queue), 0)
+        self.timeout = float(timeout)
+        self._bcrypt = Bcrypt()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                            thread_name_prefix='bcrypt')
+        self._slots = threading.BoundedSemaphore(self.max_workers + self.max_queue)
+        self._lock = threading.Lock()
+        self._rejected = 0
+        self._completed = 0
+
+    # --- Internal helpers ---
+    def _submit(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise HasherOverloadedError("Password hashing is overloaded, try again shortly.")
+        try:
+            future = self._executor.submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(self._job_done)
+        return future
+
+    def _job_done(self, _future):
+        self._slots.release()
+        with self._lock:
+            self._completed += 1
+
+    def _wait(self, future):
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            raise HasherOverloadedError("Password hashing timed out.")
+
+    def _hash(self, password, rounds):
+        return self._bcrypt.generate_password_hash(password, rounds).decode('utf-8')
+
+    def _check(self, pw_hash, password):
+        try:
+            return self._bcrypt.check_password_hash(pw_hash, password)
+        except ValueError:
+            # Not a valid bcrypt hash (e.g. a placeholder seed value)
+            return False
+
+    # --- Public API ---
+    def hash(self, password):
+        """Returns a new bcrypt hash (str) of `password` at the configured cost."""
+        return self._wait(self._submit(self._hash, password, self.rounds))
+
+    def check(self, pw_hash, password):
+        """Returns True if `password` matches `pw_hash`."""
+        return self._wait(self._submit(self._check, pw_hash, password))
+
+    def needs_rehash(self, pw_hash):
+        """Returns True if `pw_hash` was created with a different cost than the configured one."""
+        return hash_cost(pw_hash) not in (None, self.rounds)
+
+    def rehash_in_background(self, password, callback):
+        """
+        Hashes `password` at the configured cost on a worker and calls
+        `callback(new_hash)` from that worker. Skipped (returns False) if the
+        pool is busy; the rehash will simply be retried at the next login.
+        """
+        def job():
+            new_hash = self._hash(password, self.rounds)
+            try:
+                callback(new_hash)
+            except Exception as e:
+                print(f"Password rehash callback failed: {e}")
+
+        try:
+            self._submit(job)
+        except HasherOverloadedError:
+            return False
+        return True
+
+    def stats(self):
+        """Returns counters for monitoring (completed and rejected jobs)."""
+        with self._lock:
+            return {'completed': self._completed, 'rejected': self._rejected,
+                    'rounds': self.rounds, 'max_workers': self.max_workers,
+                    'max_queue': self.max_queue}
+
+
+def hash_cost(pw_hash):
+    """Returns the cost factor encoded in a bcrypt hash ('$2b$12$...'), or None if it is not one."""
+    parts = (pw_hash or '').split('$')
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+# --- Process-wide hasher ---
+_hasher = None
+_hasher_lock = threading.Lock()
+
+def get_hasher():
+    """Returns the process-wide PasswordHasher, configured from .env on first use."""
+    global _hasher
+    if _hasher is None:
+        with _hasher_lock:
+            if _hasher is None:
+                workers = int(os.getenv('HASH_WORKERS', os.cpu_count() or 2))
+                _hasher = PasswordHasher(
+                    rounds=int(os.getenv('BCRYPT_LOG_ROUNDS', 12)),
+                    max_workers=workers,
+                    max_queue=int(os.getenv('HASH_QUEUE_DEPTH', workers * 4)),
+                    timeout=float(os.getenv('HASH_TIMEOUT', 10)),
+                )
+    return _hasher
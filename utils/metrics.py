@@ -0,0 +1,299 @@
+# utils/metrics.py
+
+import contextvars
+import os
+import re
+import time
+import threading
+from collections import Counter
+
+from flask import request
+
+# Queries slower than this are printed with their normalized SQL
+SLOW_QUERY_MS = float(os.getenv('SLOW_QUERY_MS', 200))
+# The same statement running this many times in one request is reported as an N+1 pattern
+N_PLUS_ONE_THRESHOLD = int(os.getenv('N_PLUS_ONE_THRESHOLD', 5))
+
+# Histogram buckets (upper bounds)
+SECONDS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 500)
+
+_STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.)*'")
+_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LIST = re.compile(r'IN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)', re.IGNORECASE)
+_VALUES_LIST = re.compile(r'(VALUES\s*\([^)]*\))(?:\s*,\s*\([^)]*\))+', re.IGNORECASE)
+
+
+def normalize_sql(sql):
+    """
+    Reduces a statement to its shape so that executions with different values group together.
+
+    Placeholders and literals become `?`, IN lists collapse to `IN (...)` and whitespace is squeezed.
+    """
+    sql = ' '.join(sql.split())
+    sql = _STRING_LITERAL.sub('?', sql)
+    sql = sql.replace('%s', '?')
+    sql = _NUMBER_LITERAL.sub('?', sql)
+    sql = _IN_LIST.sub('IN (...)', sql)
+    sql = _VALUES_LIST.sub(r'\1, ...', sql)
+    return sql
+
+
+class Histogram:
+    """A Prometheus style cumulative histogram (not thread-safe; guarded by the registry lock)."""
+
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.sum += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def cumulative(self):
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            yield bound, total
+
+
+class RequestStats:
+    """Database work done while handling one request (held in a context variable)."""
+
+    __slots__ = ('started', 'queries', 'connect_seconds', 'execute_seconds', 'rows', 'statements')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.connect_seconds = 0.0
+        self.execute_seconds = 0.0
+        self.rows = 0
+        self.statements = Counter()
+
+
+# --- Process-wide aggregates ---
+_lock = threading.Lock()
+_route_duration = {}     # route -> Histogram of request seconds
+_route_db_seconds = {}   # route -> Histogram of DB seconds per request
+_route_queries = {}      # route -> Histogram of queries per request
+_statement_seconds = {}  # normalized SQL -> Histogram of execution seconds
+_statement_rows = Counter()
+_counters = Counter()    # slow_queries, n_plus_one, connect_seconds
+_n_plus_one_routes = Counter()
+_extra_collectors = []   # callables returning {metric_name: value} gauges
+
+# The current request's route and RequestStats. Context variables rather than flask.g,
+# so that the Flask app and the Quart app of the async serving mode (asgi.py) both set
+# them, and so that tasks a Quart view starts (asyncio.gather) report to its request.
+_route = contextvars.ContextVar('metrics_route', default=None)
+_stats = contextvars.ContextVar('metrics_stats', default=None)
+
+
+def _observe(table, key, value, buckets):
+    hist = table.get(key)
+    if hist is None:
+        hist = table[key] = Histogram(buckets)
+    hist.observe(value)
+
+
+def _current_route():
+    return _route.get() or 'background'
+
+
+def _request_stats():
+    return _stats.get()
+
+
+# --- Recording (called from utils/db.py) ---
+def record_connect(seconds):
+    """Records time spent checking out (or opening) a database connection."""
+    stats = _request_stats()
+    if stats is not None:
+        stats.connect_seconds += seconds
+    with _lock:
+        _counters['connect_seconds'] += seconds
+
+
+def record_query(sql, seconds, rows=0):
+    """Records one executed statement: its execution time and the rows it returned or changed."""
+    normalized = normalize_sql(sql)
+    stats = _request_stats()
+    if stats is not None:
+        stats.queries += 1
+        stats.execute_seconds += seconds
+        stats.rows += max(rows or 0, 0)
+        stats.statements[normalized] += 1
+
+    with _lock:
+        _observe(_statement_seconds, normalized, seconds, SECONDS_BUCKETS)
+        _statement_rows[normalized] += max(rows or 0, 0)
+        if seconds * 1000 >= SLOW_QUERY_MS:
+            _counters['slow_queries'] += 1
+
+    if seconds * 1000 >= SLOW_QUERY_MS:
+        print(f"Slow query ({seconds * 1000:.1f} ms) [{_current_route()}]: {normalized}")
+
+
+def untrack_request():
+    """
+    Leaves the current request out of the per-route histograms and N+1 detection.
+
+    For long-lived responses (the admin change stream) that poll the same statement
+    for minutes; their statements are still counted in the statement metrics.
+    """
+    _stats.set(None)
+
+
+def register_collector(fn):
+    """Registers a callable returning {metric_name: number} to include as gauges (e.g. pool stats)."""
+    _extra_collectors.append(fn)
+
+
+# --- Flask / Quart integration ---
+def _start_request(url_rule):
+    _route.set(url_rule.rule if url_rule else 'unmatched')
+    _stats.set(RequestStats())
+
+
+def _finish_request():
+    stats = _stats.get()
+    _stats.set(None)
+    if stats is None:
+        return
+    route = _current_route()
+    elapsed = time.perf_counter() - stats.started
+    repeated = [(sql, n) for sql, n in stats.statements.items() if n >= N_PLUS_ONE_THRESHOLD]
+
+    with _lock:
+        _observe(_route_duration, route, elapsed, SECONDS_BUCKETS)
+        _observe(_route_db_seconds, route, stats.connect_seconds + stats.execute_seconds, SECONDS_BUCKETS)
+        _observe(_route_queries, route, stats.queries, COUNT_BUCKETS)
+        if repeated:
+            _counters['n_plus_one'] += len(repeated)
+            _n_plus_one_routes[route] += len(repeated)
+
+    for sql, n in repeated:
+        print(f"Possible N+1 query pattern [{route}]: {n}x {sql}")
+
+
+def init_app(app):
+    """Hooks per-request query accounting into a Flask app."""
+
+    @app.before_request
+    def _start_request_stats():
+        _start_request(request.url_rule)
+
+    @app.teardown_request
+    def _finish_request_stats(_exc=None):
+        _finish_request()
+        _route.set(None) # Worker threads are reused for later requests
+
+
+def init_async_app(app):
+    """
+    Hooks per-request query accounting into a Quart app (asgi.py).
+
+    The hooks are coroutines: Quart runs plain functions in a thread with a copy of
+    the context, where setting the context variables would have no effect. Each
+    request runs in its own task, so the route stays set for a streamed body.
+    """
+    from quart import request as async_request
+
+    @app.before_request
+    async def _start_request_stats():
+        _start_request(async_request.url_rule)
+
+    @app.teardown_request
+    async def _finish_request_stats(_exc=None):
+        _finish_request()
+
+
+def snapshot():
+    """
+    Returns per-route aggregates as plain numbers (used by the benchmark suite).
+
+    Returns:
+        dict: route -> {'requests', 'queries', 'db_seconds', 'seconds'} totals.
+    """
+    with _lock:
+        return {
+            route: {
+                'requests': hist.count,
+                'seconds': hist.sum,
+                'queries': _route_queries[route].sum if route in _route_queries else 0,
+                'db_seconds': _route_db_seconds[route].sum if route in _route_db_seconds else 0.0,
+            }
+            for route, hist in _route_duration.items()
+        }
+
+
+# --- Prometheus text exposition ---
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', ' ')
+
+
+def _format_bound(bound):
+    return repr(float(bound)) if not isinstance(bound, int) else str(bound)
+
+
+def _render_histograms(lines, name, help_text, label, table):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for key, hist in sorted(table.items()):
+        lv = _label(key)
+        for bound, total in hist.cumulative():
+            lines.append(f'{name}_bucket{{{label}="{lv}",le="{_format_bound(bound)}"}} {total}')
+        lines.append(f'{name}_bucket{{{label}="{lv}",le="+Inf"}} {hist.count}')
+        lines.append(f'{name}_sum{{{label}="{lv}"}} {hist.sum}')
+        lines.append(f'{name}_count{{{label}="{lv}"}} {hist.count}')
+
+
+def render_prometheus():
+    """Returns all metrics of this process in the Prometheus text format (version 0.0.4)."""
+    lines = []
+    with _lock:
+        _render_histograms(lines, 'lms_request_duration_seconds', 'Request handling time by route.',
+                           'route', _route_duration)
+        _render_histograms(lines, 'lms_request_db_seconds', 'Database time (connect + execute) per request by route.',
+                           'route', _route_db_seconds)
+        _render_histograms(lines, 'lms_request_db_queries', 'Number of SQL statements per request by route.',
+                           'route', _route_queries)
+        _render_histograms(lines, 'lms_db_statement_duration_seconds', 'Execution time by normalized SQL statement.',
+                           'statement', _statement_seconds)
+
+        lines.append("# HELP lms_db_statement_rows_total Rows returned or affected by normalized SQL statement.")
+        lines.append("# TYPE lms_db_statement_rows_total counter")
+        for sql, rows in sorted(_statement_rows.items()):
+            lines.append(f'lms_db_statement_rows_total{{statement="{_label(sql)}"}} {rows}')
+
+        lines.append("# HELP lms_db_connect_seconds_total Time spent checking out database connections.")
+        lines.append("# TYPE lms_db_connect_seconds_total counter")
+        lines.append(f"lms_db_connect_seconds_total {_counters['connect_seconds']}")
+        lines.append(f"# HELP lms_db_slow_queries_total Statements slower than {SLOW_QUERY_MS:g} ms.")
+        lines.append("# TYPE lms_db_slow_queries_total counter")
+        lines.append(f"lms_db_slow_queries_total {_counters['slow_queries']}")
+        lines.append("# HELP lms_db_n_plus_one_total Statements repeated at least "
+                     f"{N_PLUS_ONE_THRESHOLD} times within one request, by route.")
+        lines.append("# TYPE lms_db_n_plus_one_total counter")
+        for route, n in sorted(_n_plus_one_routes.items()):
+            lines.append(f'lms_db_n_plus_one_total{{route="{_label(route)}"}} {n}')
+
+    for collector in _extra_collectors:
+        try:
+            values = collector()
+        except Exception as e:
+            print(f"Metrics collector failed: {e}")
+            continue
+        for name, value in sorted(values.items()):
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {value}")
+
+    return '\n'.join(lines) + '\n'
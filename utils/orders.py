@@ -0,0 +1,261 @@
+# utils/orders.py
+
+import os
+from datetime import datetime, timedelta
+
+from utils.db import transaction
+from utils.pagination import keyset_condition
+from utils import changes, stats
+
+# Allowed values of Orders.order_status (must match the ENUM in database_setup.sql)
+ORDER_STATUSES = ['Pending', 'Received', 'Processing', 'Ready', 'Completed', 'Cancelled']
+
+# Upper bound for one bulk status update (keeps the IN (...) list and the row locks bounded)
+MAX_BULK_ORDERS = int(os.getenv('MAX_BULK_ORDERS', 1000))
+
+
+def parse_order_filters(args):
+    """
+    Reads order list filters from a request's query string.
+
+    Supported parameters: status, date_from, date_to (YYYY-MM-DD, inclusive)
+    and customer (a numeric user ID or the beginning of an email address).
+
+    Args:
+        args (Mapping): Usually `request.args`.
+
+    Returns:
+        tuple: (filters, errors) - a dict of the valid filters and a list of error messages.
+    """
+    filters = {}
+    errors = []
+
+    status = (args.get('status') or '').strip()
+    if status:
+        if status in ORDER_STATUSES:
+            filters['status'] = status
+        else:
+            errors.append(f'Unknown status "{status}" ignored.')
+
+    for key in ('date_from', 'date_to'):
+        value = (args.get(key) or '').strip()
+        if value:
+            try:
+                filters[key] = datetime.strptime(value, '%Y-%m-%d').date()
+            except ValueError:
+                errors.append(f'Invalid date "{value}" ignored. Use YYYY-MM-DD.')
+
+    customer = (args.get('customer') or '').strip()
+    if customer:
+        filters['customer'] = customer
+
+    return filters, errors
+
+
+def order_filter_conditions(filters):
+    """
+    Translates filters from `parse_order_filters` into SQL conditions.
+
+    Expects the query to alias Orders as `o` and, for the customer filter, Users as `u`.
+    Conditions only use plain comparisons / prefix LIKEs so they can be served by indexes.
+
+    Returns:
+        tuple: (list_of_sql_conditions, list_of_params)
+    """
+    conditions = []
+    params = []
+
+    if 'status' in filters:
+        conditions.append("o.order_status = %s")
+        params.append(filters['status'])
+    if 'date_from' in filters:
+        conditions.append("o.order_date >= %s")
+        params.append(filters['date_from'])
+    if 'date_to' in filters:
+        # Inclusive end date: everything before the start of the following day
+        conditions.append("o.order_date < %s")
+        params.append(filters['date_to'] + timedelta(days=1))
+    if 'customer' in filters:
+        customer = filters['customer']
+        if customer.isdigit():
+            conditions.append("o.user_id = %s")
+            params.append(int(customer))
+        else:
+            conditions.append("u.email LIKE %s")
+            params.append(like_prefix(customer))
+
+    return conditions, params
+
+
+def like_prefix(value):
+    """Returns a LIKE pattern matching values that start with `value` (wildcards escaped)."""
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+
+
+def filters_to_args(filters):
+    """Converts parsed filters back into query string values (e.g. for pagination links)."""
+    args = {}
+    for key, value in filters.items():
+        args[key] = value.strftime('%Y-%m-%d') if hasattr(value, 'strftime') else value
+    return args
+
+
+# A customer's order history (my_orders), newest first; served by idx_orders_user_date
+MY_ORDERS_SQL = """
+    SELECT o.order_id, o.order_date, o.total_amount, o.order_status, o.due_date
+    FROM Orders o
+    WHERE o.user_id = %s
+    ORDER BY o.order_date DESC
+"""
+# The same including archived orders (utils/archive.py), only read when the customer asks for them
+MY_ORDERS_WITH_ARCHIVE_SQL = """
+    SELECT o.order_id, o.order_date, o.total_amount, o.order_status, o.due_date, 0 AS archived
+    FROM Orders o
+    WHERE o.user_id = %s
+    UNION ALL
+    SELECT a.order_id, a.order_date, a.total_amount, a.order_status, a.due_date, 1 AS archived
+    FROM OrdersArchive a
+    WHERE a.user_id = %s
+    ORDER BY order_date DESC
+"""
+
+
+# Version of a customer's orders, bumped by triggers on every change (migrations/0008_order_versions.sql)
+ORDER_VERSION_SQL = "SELECT version FROM CacheVersions WHERE name = %s"
+
+
+def order_version_query(user_id):
+    """Returns (sql, params) for the version of a customer's orders (no row means version 0)."""
+    return ORDER_VERSION_SQL, (f'orders:{user_id}',)
+
+
+def my_orders_query(user_id, include_archived=False):
+    """Returns (sql, params) for a customer's order history."""
+    if include_archived:
+        return MY_ORDERS_WITH_ARCHIVE_SQL, (user_id, user_id)
+    return MY_ORDERS_SQL, (user_id,)
+
+
+def admin_orders_query(filters, cursor_values=None, page_size=50):
+    """
+    Builds the query for one admin dashboard page.
+
+    Filters are pushed down into SQL and pages are read with a keyset cursor on
+    (order_date, order_id), so each page is an index range scan of page_size + 1 rows.
+    The one extra row tells `paginate_rows` whether there is a next page.
+
+    Args:
+        filters (dict): Filters from `parse_order_filters`.
+        cursor_values (tuple, optional): Decoded `after` cursor, None for the first page.
+        page_size (int): Number of orders per page.
+
+    Returns:
+        tuple: (sql, params)
+    """
+    conditions, params = order_filter_conditions(filters)
+    if cursor_values:
+        keyset_sql, keyset_params = keyset_condition(cursor_values)
+        conditions.append(keyset_sql)
+        params.extend(keyset_params)
+
+    where_sql = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    sql = f"""
+        SELECT o.order_id, o.order_date, o.total_amount, o.order_status, o.due_date, o.special_instructions,
+               u.user_id, u.first_name, u.last_name, u.email
+        FROM Orders o
+        JOIN Users u ON o.user_id = u.user_id
+        {where_sql}
+        ORDER BY o.order_date DESC, o.order_id DESC
+        LIMIT %s
+    """
+    params.append(page_size + 1)
+    return sql, tuple(params)
+
+
+def parse_order_ids(values):
+    """
+    Parses order IDs from a list of form values, each either one ID or a comma separated list.
+
+    Returns:
+        tuple: (sorted list of unique IDs, list of values that were not valid IDs)
+    """
+    ids = set()
+    invalid = []
+    for value in values:
+        for part in str(value).split(','):
+            part = part.strip()
+            if not part:
+                continue
+            if part.isdigit() and int(part) > 0:
+                ids.add(int(part))
+            else:
+                invalid.append(part)
+    return sorted(ids), invalid
+
+
+def update_orders_status(order_ids, new_status, due_date=None):
+    """
+    Sets the status (and optionally the due date) of many orders in one transaction.
+
+    The target rows are read and locked with a single SELECT ... FOR UPDATE, then
+    changed with one set-based UPDATE. Orders that already have the requested
+    values are left alone, so no extra per-order existence checks are needed.
+
+    Args:
+        order_ids (list): IDs of the orders to update.
+        new_status (str): One of ORDER_STATUSES.
+        due_date (date, optional): New due date; None keeps the current due dates.
+
+    Returns:
+        dict: {'updated': [...], 'unchanged': [...], 'missing': [...]} lists of order IDs.
+
+    Raises:
+        ValueError: If the status is invalid or too many orders are given.
+        TransactionError: If the database update failed (nothing was changed).
+    """
+    if new_status not in ORDER_STATUSES:
+        raise ValueError(f'Invalid status "{new_status}".')
+    order_ids = sorted(set(order_ids))
+    if len(order_ids) > MAX_BULK_ORDERS:
+        raise ValueError(f'At most {MAX_BULK_ORDERS} orders can be updated at once.')
+
+    result = {'updated': [], 'unchanged': [], 'missing': []}
+    if not order_ids:
+        return result
+
+    placeholders = ', '.join(['%s'] * len(order_ids))
+    with transaction() as tx:
+        rows = tx.execute(
+            f"SELECT order_id, user_id, order_date, total_amount, order_status, due_date FROM Orders "
+            f"WHERE order_id IN ({placeholders}) FOR UPDATE",
+            tuple(order_ids), fetch_all=True)
+        current = {row['order_id']: row for row in rows}
+
+        for order_id in order_ids:
+            row = current.get(order_id)
+            if row is None:
+                result['missing'].append(order_id)
+                continue
+            current_due = row['due_date'].date() if row['due_date'] else None
+            if row['order_status'] == new_status and (due_date is None or current_due == due_date):
+                result['unchanged'].append(order_id)
+            else:
+                result['updated'].append(order_id)
+
+        if result['updated']:
+            set_fields = ["order_status = %s"]
+            params = [new_status]
+            if due_date is not None:
+                set_fields.append("due_date = %s")
+                params.append(due_date)
+            params.extend(result['updated'])
+            tx.execute(
+                f"UPDATE Orders SET {', '.join(set_fields)} "
+                f"WHERE order_id IN ({', '.join(['%s'] * len(result['updated']))})",
+                tuple(params))
+            # Dashboard summary tables change in the same transaction
+            stats.record_status_changes(tx, [current[order_id] for order_id in result['updated']],
+                                        new_status, due_date)
+            # ...and so does the change log the live admin dashboard follows
+            changes.record_changes(tx, result['updated'], 'updated')
+    return result
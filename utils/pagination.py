@@ -0,0 +1,67 @@
+# utils/pagination.py
+
+import base64
+from datetime import datetime
+
+
+def encode_cursor(order_date, order_id):
+    """
+    Encodes the sort key of the last row on a page into an opaque URL-safe cursor.
+
+    Args:
+        order_date (datetime): The order_date of the last row shown.
+        order_id (int): The order_id of the last row shown (tie-breaker).
+
+    Returns:
+        str: The cursor to pass back as the `after` parameter for the next page.
+    """
+    raw = f"{order_date.strftime('%Y-%m-%dT%H:%M:%S.%f')}|{int(order_id)}"
+    return base64.urlsafe_b64encode(raw.encode('ascii')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Decodes a cursor created by `encode_cursor`.
+
+    Returns:
+        tuple: (order_date, order_id), or None if the cursor is missing or invalid.
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode('ascii')).decode('ascii')
+        date_str, id_str = raw.split('|', 1)
+        return datetime.strptime(date_str, '%Y-%m-%dT%H:%M:%S.%f'), int(id_str)
+    except (ValueError, UnicodeError):
+        return None
+
+
+def keyset_condition(cursor_values, date_column='o.order_date', id_column='o.order_id'):
+    """
+    Builds the WHERE condition that selects rows after a cursor for
+    `ORDER BY <date_column> DESC, <id_column> DESC`.
+
+    Written as an OR of simple comparisons rather than a row constructor
+    `(a, b) < (x, y)` so MySQL can use a range scan on an (order_date, order_id) index.
+
+    Returns:
+        tuple: (sql_fragment, params)
+    """
+    order_date, order_id = cursor_values
+    sql = f"({date_column} < %s OR ({date_column} = %s AND {id_column} < %s))"
+    return sql, [order_date, order_date, order_id]
+
+
+def paginate_rows(rows, page_size, date_key='order_date', id_key='order_id'):
+    """
+    Splits a result fetched with `LIMIT page_size + 1` into the page and the next cursor.
+
+    Returns:
+        tuple: (rows_for_this_page, next_cursor_or_None)
+    """
+    if len(rows) <= page_size:
+        return rows, None
+    page = rows[:page_size]
+    last = page[-1]
+    return page, encode_cursor(last[date_key], last[id_key])
@@ -0,0 +1,183 @@
+# utils/pool.py
+
+import threading
+import time
+from collections import deque
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no connection could be checked out before the timeout expired."""
+
+
+class ConnectionPool:
+    """
+    A small thread-safe pool of reusable database connections.
+
+    Keeps up to `pool_size` idle connections around and allows up to
+    `max_overflow` extra connections under load. Overflow connections are
+    closed as soon as they are returned instead of being kept idle.
+
+    Args:
+        connect (callable): Zero-argument function returning a new connection (or None on failure).
+        pool_size (int): Number of connections kept open while idle.
+        max_overflow (int): Extra connections allowed on top of pool_size when busy.
+        timeout (float): Seconds to wait for a free connection before raising PoolTimeoutError.
+        recycle (float): Connections older than this many seconds are replaced on checkout (<= 0 disables).
+        pre_ping (bool): If True, ping idle connections on checkout and replace dead ones.
+        ping_after (float): Only connections idle for longer than this many seconds are pinged;
+            ones returned more recently are handed out without the extra round trip.
+    """
+
+    def __init__(self, connect, pool_size=5, max_overflow=10, timeout=30.0,
+                 recycle=3600.0, pre_ping=True, ping_after=30.0):
+        self._connect = connect
+        self.pool_size = max(int(pool_size), 1)
+        self.max_overflow = max(int(max_overflow), 0)
+        self.timeout = float(timeout)
+        self.recycle = float(recycle)
+        self.pre_ping = pre_ping
+        self.ping_after = float(ping_after)
+
+        self._idle = deque()      # (connection, created_at, idle_since) ready for reuse
+        self._created_at = {}     # id(connection) -> creation time, for checked-out connections
+        self._in_use = 0
+        self._lock = threading.Condition()
+
+        # Statistics
+        self._checkouts = 0
+        self._timeouts = 0
+        self._connects = 0
+        self._recycled = 0
+        self._pings = 0
+        self._rollbacks = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    # --- Internal helpers ---
+    def _is_stale(self, conn, created_at, idle_since):
+        now = time.monotonic()
+        if self.recycle > 0 and now - created_at > self.recycle:
+            return True
+        if self.pre_ping and now - idle_since > self.ping_after:
+            with self._lock:
+                self._pings += 1
+            try:
+                return not conn.is_connected()
+            except Exception:
+                return True
+        return False
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _open(self):
+        conn = self._connect()
+        if conn is None:
+            raise ConnectionError("Database connection could not be established.")
+        with self._lock:
+            self._connects += 1
+        return conn, time.monotonic()
+
+    # --- Public API ---
+    def acquire(self):
+        """Checks out a connection, waiting up to `timeout` seconds for one to become free."""
+        started = time.monotonic()
+        deadline = started + self.timeout
+        with self._lock:
+            while not self._idle and self._in_use >= self.pool_size + self.max_overflow:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeoutError(
+                        f"Timed out after {self.timeout}s waiting for a database connection "
+                        f"({self._in_use} in use, limit {self.pool_size + self.max_overflow})."
+                    )
+                self._lock.wait(remaining)
+            # Reserve a slot now; the connection itself is opened/validated outside the lock
+            self._in_use += 1
+            entry = self._idle.popleft() if self._idle else None
+            waited = time.monotonic() - started
+            self._checkouts += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+
+        try:
+            if entry is not None:
+                conn, created_at, idle_since = entry
+                if self._is_stale(conn, created_at, idle_since):
+                    self._close_quietly(conn)
+                    with self._lock:
+                        self._recycled += 1
+                    entry = None
+            if entry is None:
+                conn, created_at = self._open()
+        except Exception:
+            with self._lock:
+                self._in_use -= 1
+                self._lock.notify()
+            raise
+
+        with self._lock:
+            self._created_at[id(conn)] = created_at
+        return conn
+
+    def release(self, conn, discard=False):
+        """
+        Returns a connection to the pool.
+
+        Any open transaction is rolled back so the next borrower starts clean
+        (and does not read from an old REPEATABLE READ snapshot); connections
+        without one (e.g. after a commit) are returned without a round trip.
+        Broken connections, discarded ones and overflow connections are closed.
+        """
+        if not discard:
+            try:
+                # Connections that cannot tell are rolled back to be safe
+                if getattr(conn, 'in_transaction', True):
+                    conn.rollback()
+                    with self._lock:
+                        self._rollbacks += 1
+            except Exception:
+                discard = True
+
+        with self._lock:
+            created_at = self._created_at.pop(id(conn), time.monotonic())
+            self._in_use -= 1
+            keep = not discard and len(self._idle) < self.pool_size
+            if keep:
+                self._idle.append((conn, created_at, time.monotonic()))
+            self._lock.notify()
+
+        if not keep:
+            self._close_quietly(conn)
+
+    def dispose(self):
+        """Closes all idle connections. Checked-out connections are closed when released."""
+        with self._lock:
+            idle = list(self._idle)
+            self._idle.clear()
+        for conn, _, _ in idle:
+            self._close_quietly(conn)
+
+    def stats(self):
+        """Returns a snapshot of pool usage counters as a dict."""
+        with self._lock:
+            return {
+                'pool_size': self.pool_size,
+                'max_overflow': self.max_overflow,
+                'in_use': self._in_use,
+                'idle': len(self._idle),
+                'checkouts': self._checkouts,
+                'timeouts': self._timeouts,
+                'connects': self._connects,
+                'recycled': self._recycled,
+                'pings': self._pings,
+                'rollbacks': self._rollbacks,
+                'wait_seconds_total': self._wait_total,
+                'wait_seconds_max': self._wait_max,
+                'wait_seconds_avg': (self._wait_total / self._checkouts) if self._checkouts else 0.0,
+            }
@@ -0,0 +1,180 @@
+# utils/ratelimit.py
+
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# Token bucket rate limiting. Each key (an IP address, an email, ...) has a bucket of
+# `capacity` tokens that refills at a steady rate; a request takes one token and is
+# rejected while the bucket is empty. A check is a dict lookup and a few float
+# operations, so rejecting a request is far cheaper than the bcrypt work it prevents.
+
+
+class MemoryBackend:
+    """
+    Buckets for one process, stored as key -> (tokens, updated_at, full_at).
+
+    A bucket that has refilled completely carries no information, so it is dropped
+    by the periodic sweep: the store only holds keys seen within the last refill
+    period. Buckets are kept in least recently used order, so beyond `max_keys`
+    the one untouched for longest is dropped in O(1).
+    """
+
+    def __init__(self, max_keys=100000, sweep_interval=30.0):
+        self.max_keys = max_keys
+        self.sweep_interval = sweep_interval
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+        self._next_sweep = time.monotonic() + sweep_interval
+
+    def take(self, key, capacity, refill_per_second, cost=1):
+        """
+        Takes `cost` tokens from the bucket if it has enough.
+
+        Returns:
+            float: 0.0 if the request is allowed, otherwise seconds until it would be.
+        """
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                tokens = capacity
+            else:
+                tokens = min(capacity, bucket[0] + (now - bucket[1]) * refill_per_second)
+
+            retry_after = 0.0
+            if tokens >= cost:
+                tokens -= cost
+            else:
+                retry_after = (cost - tokens) / refill_per_second
+            self._buckets[key] = (tokens, now, now + (capacity - tokens) / refill_per_second)
+            self._buckets.move_to_end(key)
+
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            if now >= self._next_sweep:
+                self._sweep(now)
+        return retry_after
+
+    def _sweep(self, now):
+        for key in [key for key, bucket in self._buckets.items() if bucket[2] <= now]:
+            del self._buckets[key]
+        self._next_sweep = now + self.sweep_interval
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+# Atomic take for the shared backend. Uses the Redis server clock, so every app
+# process refills buckets on the same timeline, and lets idle buckets expire.
+_TAKE_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1])
+if tokens == nil then
+    tokens = capacity
+else
+    tokens = math.min(capacity, tokens + math.max(0, now - tonumber(bucket[2])) * rate)
+end
+local retry_after = 0
+if tokens >= cost then
+    tokens = tokens - cost
+else
+    retry_after = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil((capacity - tokens) / rate * 1000) + 1000)
+return tostring(retry_after)
+"""
+
+
+class RedisBackend:
+    """
+    Buckets shared by all app processes, stored in Redis hashes that expire once full.
+
+    Args:
+        client: A redis-py client, or any stand-in with the same `register_script`
+            API (e.g. fakeredis for local development).
+        prefix (str): Namespace for the bucket keys.
+    """
+
+    def __init__(self, client, prefix='ratelimit:'):
+        self.prefix = prefix
+        self._take = client.register_script(_TAKE_SCRIPT)
+
+    def take(self, key, capacity, refill_per_second, cost=1):
+        try:
+            return float(self._take(keys=[self.prefix + key], args=[capacity, refill_per_second, cost]))
+        except Exception as e:
+            # Fail open: an unavailable limiter store must not lock every user out
+            print(f"Rate limit backend error: {e}")
+            return 0.0
+
+
+class RateLimiter:
+    """
+    A token bucket limit for one kind of request, e.g. login attempts per IP address.
+
+    Args:
+        name (str): Prefix that keeps the keys of different limits apart.
+        capacity (int): Requests allowed in a burst.
+        per_minute (float): Rate at which the allowance refills.
+        backend (MemoryBackend or RedisBackend, optional): Defaults to `get_backend()`.
+    """
+
+    def __init__(self, name, capacity, per_minute, backend=None):
+        self.name = name
+        self.capacity = max(int(capacity), 1)
+        self.refill_per_second = max(float(per_minute), 0.001) / 60.0
+        self.backend = backend or get_backend()
+        self.allowed = 0
+        self.rejected = 0
+
+    def hit(self, key):
+        """
+        Counts one request for `key`.
+
+        Returns:
+            float: 0.0 if the request may proceed, otherwise the seconds to wait (for Retry-After).
+        """
+        retry_after = self.backend.take(f'{self.name}:{key}', self.capacity, self.refill_per_second)
+        # Plain int updates; an occasional lost increment under contention only affects the counters
+        if retry_after:
+            self.rejected += 1
+        else:
+            self.allowed += 1
+        return retry_after
+
+    def stats(self):
+        return {'allowed': self.allowed, 'rejected': self.rejected}
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    """
+    Returns the process-wide backend selected by RATE_LIMIT_BACKEND ('memory' or 'redis').
+
+    The redis backend connects to RATE_LIMIT_REDIS_URL and needs the `redis` package.
+    """
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                if os.getenv('RATE_LIMIT_BACKEND', 'memory') == 'redis':
+                    try:
+                        import redis
+                    except ImportError as e:
+                        raise ImportError("RATE_LIMIT_BACKEND=redis needs the redis package: pip install redis") from e
+                    client = redis.Redis.from_url(os.getenv('RATE_LIMIT_REDIS_URL', 'redis://localhost:6379/0'))
+                    _backend = RedisBackend(client)
+                else:
+                    _backend = MemoryBackend(max_keys=int(os.getenv('RATE_LIMIT_MAX_KEYS', 100000)))
+    return _backend
@@ -0,0 +1,243 @@
+# utils/scheduler.py
+
+import os
+import heapq
+from collections import defaultdict
+from datetime import date, timedelta
+
+from utils import changes, stats
+from utils.db import execute_query, transaction
+
+# Capacity-aware due dates for open orders (POST /admin/auto_schedule, schedule_orders.py).
+# Each category of work (LaundryItems.category) can handle a fixed number of items per day.
+# Open orders come off a priority queue (orders already in progress first, then oldest
+# first) and their items are booked into the earliest days with capacity left in their
+# categories; an order is due on the last day it uses. Every category keeps a pointer to
+# its first day with capacity left, which only ever moves forward, so planning n orders
+# costs O(n log n) for the queue and O(n + days) for the booking.
+
+# Items per day by category, e.g. "Wash & Fold=400,Dry Cleaning=120,Pressing=200"
+SCHEDULE_CAPACITY = os.getenv('SCHEDULE_CAPACITY', 'Wash & Fold=400,Dry Cleaning=120,Pressing=200')
+# Items per day for categories that are not listed (or items without a category)
+SCHEDULE_DEFAULT_CAPACITY = int(os.getenv('SCHEDULE_DEFAULT_CAPACITY', 100))
+# The earliest due date, in days from today
+SCHEDULE_LEAD_DAYS = int(os.getenv('SCHEDULE_LEAD_DAYS', 1))
+# Orders whose due dates are written per transaction
+SCHEDULE_BATCH_SIZE = 1000
+
+# Statuses that still get a due date, in order of priority
+OPEN_STATUSES = ('Processing', 'Received', 'Pending')
+STATUS_RANK = {status: rank for rank, status in enumerate(OPEN_STATUSES)}
+
+# Line items of every open order (served by idx_orders_status_date and idx_orderitems_order).
+# They are summed per order and category in load_open_orders: a GROUP BY here would need a
+# temporary table.
+OPEN_ORDER_ITEMS_SQL = f"""
+    SELECT o.order_id, o.user_id, o.order_date, o.order_status, o.due_date, o.total_amount,
+           li.category, oi.quantity
+    FROM Orders o
+    JOIN OrderItems oi ON oi.order_id = o.order_id
+    JOIN LaundryItems li ON li.laundry_item_id = oi.laundry_item_id
+    WHERE o.order_status IN ({', '.join(['%s'] * len(OPEN_STATUSES))})
+"""
+
+
+def _as_date(value):
+    """Due dates are stored as TIMESTAMPs; the schedule works with dates."""
+    return value.date() if hasattr(value, 'date') else value
+
+
+def parse_capacity(value):
+    """
+    Parses a "Category=items per day,..." capacity setting.
+
+    Returns:
+        dict: category -> items per day.
+
+    Raises:
+        ValueError: If an entry is malformed or not a positive number.
+    """
+    capacity = {}
+    for entry in (value or '').split(','):
+        if not entry.strip():
+            continue
+        category, sep, amount = entry.rpartition('=')
+        if not sep or not category.strip() or not amount.strip().isdigit() or int(amount) <= 0:
+            raise ValueError(f'Invalid capacity "{entry.strip()}". Use "Category=items per day".')
+        capacity[category.strip()] = int(amount)
+    return capacity
+
+
+class CapacityBook:
+    """
+    Remaining capacity per category and day, from `start` onwards.
+
+    Args:
+        capacity (dict): category -> items per day.
+        default_capacity (int): Items per day for categories not in `capacity`.
+        start (date): The first day work can be booked on.
+    """
+
+    def __init__(self, capacity, default_capacity, start):
+        self.capacity = capacity
+        self.default_capacity = default_capacity
+        self.start = start
+        self._remaining = defaultdict(list) # category -> items left per day (index = days after start)
+        self._first_open = defaultdict(int) # category -> first day with capacity left
+
+    def _day(self, category, offset):
+        remaining = self._remaining[category]
+        daily = self.capacity.get(category, self.default_capacity)
+        while len(remaining) <= offset:
+            remaining.append(daily)
+        return remaining
+
+    def reserve(self, category, day, quantity):
+        """Counts work that already has a due date against that day (which may overbook it)."""
+        offset = (day - self.start).days
+        if offset >= 0:
+            self._day(category, offset)[offset] -= quantity
+
+    def book(self, category, quantity):
+        """
+        Books `quantity` items into the earliest days with capacity left.
+
+        Returns:
+            int: The last day used, in days after start.
+        """
+        remaining = self._remaining[category]
+        offset = self._first_open[category]
+        while True:
+            if offset == len(remaining):
+                remaining.append(self.capacity.get(category, self.default_capacity))
+            left = remaining[offset]
+            if left > quantity:
+                remaining[offset] = left - quantity
+                self._first_open[category] = offset
+                return offset
+            if left > 0: # Fills the day (overbooked days stay negative for load())
+                remaining[offset] = 0
+                quantity -= left
+            offset += 1 # Full days are never looked at again
+            if quantity == 0:
+                self._first_open[category] = offset
+                return offset - 1
+
+    def load(self):
+        """Returns {category: [items booked per day]} for reporting."""
+        return {category: [self.capacity.get(category, self.default_capacity) - left for left in remaining]
+                for category, remaining in self._remaining.items()}
+
+
+def load_open_orders():
+    """
+    Reads every open order with its number of items per category.
+
+    Returns:
+        dict: order_id -> order dict with a 'work' dict (category -> items).
+        None: If the query failed.
+    """
+    rows = execute_query(OPEN_ORDER_ITEMS_SQL, OPEN_STATUSES)
+    if rows is None:
+        return None
+    orders = {}
+    for row in rows:
+        order = orders.get(row['order_id'])
+        if order is None:
+            order = orders[row['order_id']] = {key: row[key] for key in (
+                'order_id', 'user_id', 'order_date', 'order_status', 'due_date', 'total_amount')}
+            order['work'] = {}
+        work = order['work']
+        work[row['category']] = work.get(row['category'], 0) + int(row['quantity'])
+    return orders
+
+
+def plan_schedule(orders, capacity=None, default_capacity=None, start=None, reschedule=False):
+    """
+    Assigns due dates to open orders without overbooking any category's daily capacity.
+
+    Args:
+        orders (iterable): Order dicts as returned by `load_open_orders`.
+        capacity (dict, optional): category -> items per day (default SCHEDULE_CAPACITY).
+        default_capacity (int, optional): For unlisted categories (default SCHEDULE_DEFAULT_CAPACITY).
+        start (date, optional): Earliest due date (default today + SCHEDULE_LEAD_DAYS).
+        reschedule (bool): Also move orders that already have a due date. Otherwise their
+            work stays on their due dates and only uses up capacity there.
+
+    Returns:
+        tuple: ({order_id: due date} for every scheduled order, the CapacityBook).
+    """
+    if capacity is None:
+        capacity = parse_capacity(SCHEDULE_CAPACITY)
+    if start is None:
+        start = date.today() + timedelta(days=SCHEDULE_LEAD_DAYS)
+    book = CapacityBook(capacity, SCHEDULE_DEFAULT_CAPACITY if default_capacity is None else default_capacity,
+                        start)
+
+    queue = []
+    work = {}
+    for order in orders:
+        work[order['order_id']] = order['work']
+        if order['due_date'] and not reschedule:
+            for category, quantity in order['work'].items():
+                book.reserve(category, _as_date(order['due_date']), quantity)
+        else:
+            queue.append((STATUS_RANK.get(order['order_status'], len(OPEN_STATUSES)),
+                          order['order_date'], order['order_id']))
+    heapq.heapify(queue)
+
+    due_dates = {}
+    days = [] # day offset -> date, built once per day rather than once per order
+    while queue:
+        _, _, order_id = heapq.heappop(queue)
+        # Categories are booked independently; the order is due when its slowest one is done
+        last = max([book.book(category, quantity) for category, quantity in work[order_id].items()], default=0)
+        while len(days) <= last:
+            days.append(start + timedelta(days=len(days)))
+        due_dates[order_id] = days[last]
+    return due_dates, book
+
+
+def apply_schedule(orders, due_dates, batch_size=SCHEDULE_BATCH_SIZE):
+    """
+    Writes planned due dates, skipping orders that already have them.
+
+    Each batch re-reads its orders FOR UPDATE and leaves out any whose status or due date
+    changed since the plan was made. Summary tables and the change log are updated in
+    the same transaction, like any other status/due date change.
+
+    Args:
+        orders (dict): order_id -> order dict, as returned by `load_open_orders`.
+        due_dates (dict): order_id -> date, as returned by `plan_schedule`.
+
+    Returns:
+        int: Number of orders whose due date was changed.
+
+    Raises:
+        TransactionError: If a batch failed (earlier batches stay applied).
+    """
+    pending = sorted(order_id for order_id, due in due_dates.items()
+                     if _as_date(orders[order_id]['due_date']) != due)
+    updated = 0
+    for i in range(0, len(pending), batch_size):
+        batch = pending[i:i + batch_size]
+        with transaction() as tx:
+            rows = tx.execute(
+                f"SELECT order_id, user_id, order_date, total_amount, order_status, due_date FROM Orders "
+                f"WHERE order_id IN ({', '.join(['%s'] * len(batch))}) FOR UPDATE",
+                tuple(batch), fetch_all=True)
+            groups = defaultdict(list) # (due date, status) -> rows
+            for row in rows:
+                planned = orders[row['order_id']]
+                if row['order_status'] == planned['order_status'] and row['due_date'] == planned['due_date']:
+                    groups[(due_dates[row['order_id']], row['order_status'])].append(row)
+
+            for (due, status), group in sorted(groups.items()):
+                order_ids = [row['order_id'] for row in group]
+                tx.execute(f"UPDATE Orders SET due_date = %s WHERE order_id IN ({', '.join(['%s'] * len(order_ids))})",
+                           (due, *order_ids))
+                stats.record_status_changes(tx, group, status, due)
+            changed = [row for group in groups.values() for row in group]
+            changes.record_changes(tx, [row['order_id'] for row in changed], 'updated')
+        updated += len(changed)
+    return updated
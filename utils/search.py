@@ -0,0 +1,171 @@
+# utils/search.py
+
+import os
+import re
+
+from utils.db import execute_query
+from utils.orders import like_prefix
+
+# Admin search over orders (/admin/search, indexes from migrations/0006_search_indexes.sql
+# and 0007_phone_digits.sql).
+# The shape of the query decides which indexed lookups run:
+#   digits          -> the order with that ID, and orders of customers whose phone starts with them
+#                      (ignoring punctuation on both sides, e.g. "555-123" finds "(555) 123-4567")
+#   contains "@"    -> orders of customers whose email starts with it
+#   any other text  -> FULLTEXT matches on customer names and on the orders' special instructions
+# Every lookup returns at most SEARCH_MAX_RESULTS scored candidates. They are merged and
+# ranked here, and only the orders of the requested page are loaded for display.
+# Archived orders are not searched.
+
+SEARCH_PAGE_SIZE = int(os.getenv('SEARCH_PAGE_SIZE', 25))
+SEARCH_MAX_RESULTS = int(os.getenv('SEARCH_MAX_RESULTS', 500))
+# Orders of at most this many matching customers are included, best matches first
+SEARCH_MAX_CUSTOMERS = 50
+# InnoDB's default innodb_ft_min_token_size; shorter words are not in a FULLTEXT index
+FULLTEXT_MIN_WORD = 3
+
+# Score tiers: an exact order ID ranks above a phone/email match, which ranks above a name
+# match, which ranks above a match in the notes. FULLTEXT relevance (unbounded) is scaled to
+# [0, 1) to order within a tier, and an order found by several lookups adds up their scores.
+# One search adds at most a name and a notes score (< NAME_SCORE + 2) or an order ID and a
+# contact score, so a sum never reaches the next tier.
+ORDER_ID_SCORE = 1000.0
+CONTACT_SCORE = 100.0
+NAME_SCORE = 10.0
+
+ORDER_BY_ID_SQL = "SELECT order_id, order_date, 0 AS score FROM Orders WHERE order_id = %s"
+
+# Orders of the matching customers; `customers_sql` selects (user_id, score) and is LIMITed
+CUSTOMER_ORDERS_SQL = """
+    SELECT o.order_id, o.order_date, m.score
+    FROM ({customers_sql}) m
+    JOIN Orders o ON o.user_id = m.user_id
+    ORDER BY m.score DESC, o.order_date DESC
+    LIMIT %s
+"""
+PHONE_CUSTOMERS_SQL = """
+    SELECT user_id, 0 AS score FROM Users WHERE phone_digits LIKE %s ORDER BY phone_digits LIMIT %s
+"""
+EMAIL_CUSTOMERS_SQL = "SELECT user_id, 0 AS score FROM Users WHERE email LIKE %s ORDER BY email LIMIT %s"
+LAST_NAME_CUSTOMERS_SQL = "SELECT user_id, 0 AS score FROM Users WHERE last_name LIKE %s LIMIT %s"
+NAME_CUSTOMERS_SQL = """
+    SELECT user_id, MATCH (first_name, last_name) AGAINST (%s IN BOOLEAN MODE) AS score
+    FROM Users
+    WHERE MATCH (first_name, last_name) AGAINST (%s IN BOOLEAN MODE)
+    ORDER BY score DESC
+    LIMIT %s
+"""
+
+INSTRUCTIONS_SQL = """
+    SELECT order_id, order_date, MATCH (special_instructions) AGAINST (%s IN BOOLEAN MODE) AS score
+    FROM Orders
+    WHERE MATCH (special_instructions) AGAINST (%s IN BOOLEAN MODE)
+    ORDER BY score DESC
+    LIMIT %s
+"""
+
+# The orders of one result page, with the columns of admin_orders_query
+SEARCH_PAGE_SQL = """
+    SELECT o.order_id, o.order_date, o.total_amount, o.order_status, o.due_date, o.special_instructions,
+           u.user_id, u.first_name, u.last_name, u.email
+    FROM Orders o
+    JOIN Users u ON o.user_id = u.user_id
+    WHERE o.order_id IN ({placeholders})
+"""
+
+_WORD = re.compile(r'\w+')
+_PHONE_PUNCTUATION = re.compile(r'[\s()+#.-]')
+
+
+def fulltext_query(words):
+    """
+    Builds a boolean mode query matching any of the words, each also as a prefix.
+
+    Words are optional rather than required so that "smith starch" finds Smith's orders
+    with starch instructions: names and notes are separate indexes, and an order found
+    by both lookups ranks first because their scores add up.
+    """
+    return ' '.join(f'{word}*' for word in words)
+
+
+def relevance(score):
+    """Scales a FULLTEXT relevance score (0 or more) to [0, 1), keeping its order."""
+    score = max(float(score or 0), 0.0)
+    return score / (1.0 + score)
+
+
+def _lookups(text):
+    """Returns (base score, sql, params) for every lookup the search text calls for."""
+    lookups = []
+    customers = []
+    digits = _PHONE_PUNCTUATION.sub('', text)
+    if digits.isdigit():
+        if int(digits) < 2 ** 31: # Orders.order_id is an INT
+            lookups.append((ORDER_ID_SCORE, ORDER_BY_ID_SQL, (int(digits),)))
+        if len(digits) >= 3:
+            customers.append((CONTACT_SCORE, PHONE_CUSTOMERS_SQL, (like_prefix(digits),)))
+    elif '@' in text:
+        customers.append((CONTACT_SCORE, EMAIL_CUSTOMERS_SQL, (like_prefix(text),)))
+    else:
+        words = [word for word in _WORD.findall(text) if len(word) >= FULLTEXT_MIN_WORD]
+        if words:
+            query = fulltext_query(words)
+            customers.append((NAME_SCORE, NAME_CUSTOMERS_SQL, (query, query)))
+            lookups.append((0.0, INSTRUCTIONS_SQL, (query, query, SEARCH_MAX_RESULTS)))
+        elif _WORD.search(text):
+            customers.append((NAME_SCORE, LAST_NAME_CUSTOMERS_SQL, (like_prefix(_WORD.search(text).group()),)))
+
+    for score, customers_sql, params in customers:
+        lookups.append((score, CUSTOMER_ORDERS_SQL.format(customers_sql=customers_sql),
+                        params + (SEARCH_MAX_CUSTOMERS, SEARCH_MAX_RESULTS)))
+    return lookups
+
+
+def search_orders(text, page=1, page_size=None):
+    """
+    Searches orders by order ID, customer name, email, phone and special instructions.
+
+    Args:
+        text (str): The search text as typed by the admin.
+        page (int): 1-based result page.
+        page_size (int, optional): Orders per page (default SEARCH_PAGE_SIZE).
+
+    Returns:
+        dict: {'orders': rows of the page (best first), 'total': number of ranked results,
+               'truncated': True if a lookup hit SEARCH_MAX_RESULTS, 'page', 'pages'}.
+        None: If a query failed.
+    """
+    page_size = page_size or SEARCH_PAGE_SIZE
+    result = {'orders': [], 'total': 0, 'truncated': False, 'page': page, 'pages': 0}
+    text = ' '.join((text or '').split())
+    if not text:
+        return result
+
+    candidates = {} # order_id -> (score, order_date)
+    for base_score, sql, params in _lookups(text):
+        rows = execute_query(sql, params)
+        if rows is None:
+            return None
+        if len(rows) >= SEARCH_MAX_RESULTS:
+            result['truncated'] = True
+        for row in rows:
+            score = base_score + relevance(row['score'])
+            if row['order_id'] in candidates:
+                score += candidates[row['order_id']][0]
+            candidates[row['order_id']] = (score, row['order_date'])
+
+    # Best score first, then newest
+    ranked = sorted(candidates, key=lambda order_id: (candidates[order_id][0], candidates[order_id][1], order_id),
+                    reverse=True)
+    result['total'] = len(ranked)
+    result['pages'] = -(-len(ranked) // page_size)
+    page_ids = ranked[(page - 1) * page_size:page * page_size]
+    if not page_ids:
+        return result
+
+    rows = execute_query(SEARCH_PAGE_SQL.format(placeholders=', '.join(['%s'] * len(page_ids))), tuple(page_ids))
+    if rows is None:
+        return None
+    by_id = {row['order_id']: row for row in rows}
+    result['orders'] = [by_id[order_id] for order_id in page_ids if order_id in by_id]
+    return result
@@ -0,0 +1,65 @@
+# utils/seeding.py
+
+import bcrypt
+
+from utils.db import execute_query, transaction
+
+# Bulk inserts of synthetic data, shared by generate_data.py and benchmarks/seed.py.
+# Rows carry explicit IDs (allocated with next_id), so a batch of users, or of orders
+# with their items, is written with multi-row INSERTs in one transaction and no
+# generated IDs have to be read back.
+
+USER_SQL = """
+    INSERT INTO Users (user_id, username, password_hash, first_name, last_name, email, phone, address, role)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+"""
+ORDER_SQL = """
+    INSERT INTO Orders (order_id, user_id, order_date, due_date, total_amount, order_status, special_instructions)
+    VALUES (%s, %s, %s, %s, %s, %s, %s)
+"""
+ITEM_SQL = """
+    INSERT INTO OrderItems (order_id, laundry_item_id, quantity, price_per_unit, total_price)
+    VALUES (%s, %s, %s, %s, %s)
+"""
+
+
+def next_id(table, column):
+    """
+    Returns the first ID after the highest `column` in `table`.
+
+    Raises:
+        RuntimeError: If the highest ID could not be read.
+    """
+    row = execute_query(f"SELECT COALESCE(MAX({column}), 0) AS max_id FROM {table}", fetch_one=True)
+    if row is None:
+        raise RuntimeError(f"Could not read the highest {column} from {table}.")
+    return row['max_id'] + 1
+
+
+def hash_password(password, rounds):
+    """bcrypt hash in the same format the web app stores (picklable, for process pools)."""
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds)).decode('utf-8')
+
+
+def shared_password_hashes(password, rounds):
+    """
+    Hashes `password` once and returns password_hashes(n), which hands out n copies.
+
+    Logins of the generated accounts still pay the real bcrypt cost, but seeding
+    does not pay it once per account.
+    """
+    password_hash = hash_password(password, rounds)
+    return lambda n: [password_hash] * n
+
+
+def insert_users(rows):
+    """Inserts user rows (in USER_SQL column order) in one transaction."""
+    with transaction() as tx:
+        tx.executemany(USER_SQL, rows)
+
+
+def insert_orders(order_rows, item_rows):
+    """Inserts order rows (ORDER_SQL column order) and their items (ITEM_SQL) in one transaction."""
+    with transaction() as tx:
+        tx.executemany(ORDER_SQL, order_rows)
+        tx.executemany(ITEM_SQL, item_rows)
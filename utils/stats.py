@@ -0,0 +1,214 @@
+# utils/stats.py
+
+from collections import Counter, defaultdict
+from datetime import datetime, time
+from decimal import Decimal
+
+from utils.db import execute_query, transaction
+
+# Dashboard statistics are kept in small summary tables (migrations/0003_order_stats.sql)
+# that are adjusted inside the same transaction as every order write. Reading them costs
+# the same no matter how many orders exist. rebuild() recomputes them from scratch and
+# check() compares them against a full recomputation.
+#
+# Every writer locks in the same order, so concurrent order writes queue up instead of
+# deadlocking: first the orders themselves, then OrderStatusStats, then OrderDailyStats,
+# then OrderTurnaroundStats, and within a table the rows in sorted key order.
+
+# --- Incremental maintenance (call inside a utils.db.transaction) ---
+def record_order_created(tx, order_id):
+    """Adds a newly inserted order (status Pending, no due date) to the summary tables."""
+    tx.execute("""
+        INSERT INTO OrderStatusStats (order_status, order_count)
+        SELECT order_status, 1 FROM Orders WHERE order_id = %s
+        ON DUPLICATE KEY UPDATE order_count = order_count + 1
+    """, (order_id,))
+    tx.execute("""
+        INSERT INTO OrderDailyStats (stat_date, order_count, revenue)
+        SELECT DATE(order_date), 1, total_amount FROM Orders WHERE order_id = %s
+        ON DUPLICATE KEY UPDATE order_count = order_count + 1, revenue = revenue + VALUES(revenue)
+    """, (order_id,))
+
+
+def _turnaround_seconds(order_date, due_date):
+    if not order_date or not due_date:
+        return None
+    if not isinstance(due_date, datetime):
+        due_date = datetime.combine(due_date, time())
+    return int((due_date - order_date).total_seconds())
+
+
+def record_status_changes(tx, before_rows, new_status, new_due_date=None):
+    """
+    Applies the effect of changing orders to `new_status` (and optionally `new_due_date`).
+
+    Args:
+        tx: The transaction that performs the order UPDATE.
+        before_rows (list): The orders as they were before the update (locked FOR UPDATE),
+            each with order_date, total_amount, order_status and due_date.
+        new_status (str): The status the orders are set to.
+        new_due_date (date, optional): The new due date, or None if due dates are kept.
+    """
+    status_delta = Counter()
+    revenue_delta = defaultdict(Decimal)
+    turnaround_count = 0
+    turnaround_seconds = 0
+
+    for row in before_rows:
+        old_status = row['order_status']
+        if old_status != new_status:
+            status_delta[old_status] -= 1
+            status_delta[new_status] += 1
+            # Revenue only counts orders that are not cancelled
+            if new_status == 'Cancelled' or old_status == 'Cancelled':
+                sign = -1 if new_status == 'Cancelled' else 1
+                revenue_delta[row['order_date'].date()] += sign * Decimal(row['total_amount'] or 0)
+
+        if new_due_date is not None:
+            old = _turnaround_seconds(row['order_date'], row['due_date'])
+            new = _turnaround_seconds(row['order_date'], new_due_date)
+            if old is not None:
+                turnaround_count -= 1
+                turnaround_seconds -= old
+            turnaround_count += 1
+            turnaround_seconds += new
+
+    # Tables in the module's lock order, keys sorted, so concurrent writers lock rows in the same order
+    status_rows = [(status, delta) for status, delta in sorted(status_delta.items()) if delta]
+    if status_rows:
+        tx.executemany("""
+            INSERT INTO OrderStatusStats (order_status, order_count) VALUES (%s, %s)
+            ON DUPLICATE KEY UPDATE order_count = order_count + VALUES(order_count)
+        """, status_rows)
+    for stat_date, delta in sorted(revenue_delta.items()):
+        if delta:
+            tx.execute("UPDATE OrderDailyStats SET revenue = revenue + %s WHERE stat_date = %s",
+                       (delta, stat_date))
+    if turnaround_count or turnaround_seconds:
+        tx.execute("""
+            UPDATE OrderTurnaroundStats
+            SET order_count = order_count + %s, total_seconds = total_seconds + %s
+            WHERE id = 1
+        """, (turnaround_count, turnaround_seconds))
+
+
+# --- Reading ---
+# The three summary reads, shared with the async dashboard (asgi.py)
+DASHBOARD_DAILY_SQL = """
+    SELECT stat_date, order_count, revenue FROM OrderDailyStats
+    WHERE stat_date >= CURDATE() - INTERVAL %s DAY
+    ORDER BY stat_date DESC
+"""
+DASHBOARD_STATUS_SQL = "SELECT order_status, order_count FROM OrderStatusStats"
+DASHBOARD_TURNAROUND_SQL = "SELECT order_count, total_seconds FROM OrderTurnaroundStats WHERE id = 1"
+
+
+def get_dashboard_stats(days=14):
+    """
+    Returns the dashboard statistics from the summary tables.
+
+    Returns:
+        dict: {'daily': [{stat_date, order_count, revenue}, ...] newest first,
+               'by_status': {status: count}, 'avg_turnaround_hours': float or None}
+        None: If the summary tables could not be read.
+    """
+    daily = execute_query(DASHBOARD_DAILY_SQL, (days,))
+    by_status = execute_query(DASHBOARD_STATUS_SQL)
+    turnaround = execute_query(DASHBOARD_TURNAROUND_SQL, fetch_one=True)
+    return summarize_dashboard(daily, by_status, turnaround)
+
+
+def summarize_dashboard(daily, by_status, turnaround):
+    """Combines the results of the three dashboard reads into the dict returned by get_dashboard_stats."""
+    if daily is None or by_status is None:
+        return None
+
+    avg_hours = None
+    if turnaround and turnaround['order_count']:
+        avg_hours = turnaround['total_seconds'] / turnaround['order_count'] / 3600.0
+    return {
+        'daily': daily,
+        'by_status': {row['order_status']: row['order_count'] for row in by_status},
+        'avg_turnaround_hours': avg_hours,
+    }
+
+
+# --- Rebuild and verification ---
+# Archived orders (utils/archive.py) stay part of the statistics
+ALL_ORDERS_SQL = """(
+    SELECT order_date, due_date, total_amount, order_status FROM Orders
+    UNION ALL
+    SELECT order_date, due_date, total_amount, order_status FROM OrdersArchive
+) AS all_orders"""
+DAILY_SQL = f"""
+    SELECT DATE(order_date) AS stat_date, COUNT(*) AS order_count,
+           COALESCE(SUM(CASE WHEN order_status <> 'Cancelled' THEN total_amount ELSE 0 END), 0) AS revenue
+    FROM {ALL_ORDERS_SQL} GROUP BY DATE(order_date)
+"""
+STATUS_SQL = f"SELECT order_status, COUNT(*) AS order_count FROM {ALL_ORDERS_SQL} GROUP BY order_status"
+TURNAROUND_SQL = f"""
+    SELECT COUNT(*) AS order_count,
+           COALESCE(SUM(TIMESTAMPDIFF(SECOND, order_date, due_date)), 0) AS total_seconds
+    FROM {ALL_ORDERS_SQL} WHERE due_date IS NOT NULL
+"""
+
+
+def rebuild():
+    """
+    Recomputes all summary tables from Orders and OrdersArchive in one transaction.
+
+    All orders are share-locked first, so order writes wait until the rebuild commits
+    and no change is lost; the summary tables follow in the module's lock order.
+    """
+    with transaction() as tx:
+        tx.execute("SELECT COUNT(*) AS n FROM Orders LOCK IN SHARE MODE", fetch_one=True)
+        tx.execute("SELECT COUNT(*) AS n FROM OrdersArchive LOCK IN SHARE MODE", fetch_one=True)
+        tx.execute("UPDATE OrderStatusStats SET order_count = 0")
+        tx.execute(f"""
+            INSERT INTO OrderStatusStats (order_status, order_count) {STATUS_SQL}
+            ON DUPLICATE KEY UPDATE order_count = VALUES(order_count)
+        """)
+        tx.execute("DELETE FROM OrderDailyStats")
+        tx.execute(f"INSERT INTO OrderDailyStats (stat_date, order_count, revenue) {DAILY_SQL}")
+        tx.execute(f"""
+            INSERT INTO OrderTurnaroundStats (id, order_count, total_seconds)
+            SELECT 1, t.order_count, t.total_seconds FROM ({TURNAROUND_SQL}) t
+            ON DUPLICATE KEY UPDATE order_count = VALUES(order_count), total_seconds = VALUES(total_seconds)
+        """)
+
+
+def check():
+    """
+    Compares the summary tables with a full recomputation from Orders and OrdersArchive.
+
+    Returns:
+        list: Human readable mismatches (empty if everything is consistent).
+    """
+    problems = []
+    with transaction() as tx:
+        # One transaction = one consistent snapshot for both sides of the comparison
+        expected_daily = {r['stat_date']: r for r in tx.execute(DAILY_SQL, fetch_all=True)}
+        actual_daily = {r['stat_date']: r for r in tx.execute(
+            "SELECT stat_date, order_count, revenue FROM OrderDailyStats", fetch_all=True)}
+        for stat_date in sorted(set(expected_daily) | set(actual_daily)):
+            exp = expected_daily.get(stat_date, {'order_count': 0, 'revenue': 0})
+            act = actual_daily.get(stat_date, {'order_count': 0, 'revenue': 0})
+            if exp['order_count'] != act['order_count'] or Decimal(exp['revenue']) != Decimal(act['revenue']):
+                problems.append(f"{stat_date}: expected {exp['order_count']} orders / {exp['revenue']} revenue, "
+                                f"summary has {act['order_count']} / {act['revenue']}")
+
+        expected_status = {r['order_status']: r['order_count'] for r in tx.execute(STATUS_SQL, fetch_all=True)}
+        actual_status = {r['order_status']: r['order_count'] for r in tx.execute(
+            "SELECT order_status, order_count FROM OrderStatusStats", fetch_all=True)}
+        for status in sorted(set(expected_status) | set(actual_status)):
+            if expected_status.get(status, 0) != actual_status.get(status, 0):
+                problems.append(f"status {status}: expected {expected_status.get(status, 0)}, "
+                                f"summary has {actual_status.get(status, 0)}")
+
+        exp = tx.execute(TURNAROUND_SQL, fetch_one=True)
+        act = tx.execute("SELECT order_count, total_seconds FROM OrderTurnaroundStats WHERE id = 1",
+                         fetch_one=True) or {'order_count': 0, 'total_seconds': 0}
+        if (exp['order_count'], int(exp['total_seconds'])) != (act['order_count'], int(act['total_seconds'])):
+            problems.append(f"turnaround: expected {exp['order_count']} orders / {exp['total_seconds']}s, "
+                            f"summary has {act['order_count']} / {act['total_seconds']}s")
+    return problems